@@ -0,0 +1,49 @@
+"""Repositories and services shared by every request, built once in the app's lifespan."""
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.events import build_broker
+from app.core.rate_limit import MemoryRateLimitStore, RateLimiter, RateLimitStore
+from app.core.settings import get_settings
+from app.repositories.client_repository import ClientRepository
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.rate_limit_repository import RateLimitRepository
+from app.repositories.user_repository import UserRepository
+from app.repositories.version_repository import VersionRepository
+from app.services.auth_service import AuthService
+from app.services.client_service import ClientService
+from app.services.dashboard_service import DashboardService
+from app.services.project_service import ProjectService
+
+settings = get_settings()
+
+
+class Container:
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self.user_repository = UserRepository(db)
+        self.client_repository = ClientRepository(db)
+        self.project_repository = ProjectRepository(db)
+        self.version_repository = VersionRepository(db)
+
+        store: RateLimitStore = (
+            RateLimitRepository(db)
+            if settings.rate_limit_backend == "mongo"
+            else MemoryRateLimitStore(settings.rate_limit_max_keys)
+        )
+        self.rate_limiter = RateLimiter(store, enabled=settings.rate_limit_enabled)
+
+        self.events = build_broker()
+
+        self.auth_service = AuthService(
+            self.user_repository,
+            self.rate_limiter,
+            self.client_repository,
+            self.project_repository,
+            self.version_repository,
+        )
+        self.client_service = ClientService(
+            self.client_repository, self.project_repository, self.events, self.version_repository
+        )
+        self.project_service = ProjectService(
+            self.project_repository, self.client_repository, self.events, self.version_repository
+        )
+        self.dashboard_service = DashboardService(self.project_repository)
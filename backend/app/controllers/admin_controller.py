@@ -0,0 +1,16 @@
+from fastapi import Depends, Query
+
+from app.core.dependencies import get_admin_user
+from app.core.serialization import JSONResponse
+from app.core.settings import get_settings
+from app.db.slow_queries import slow_queries
+from app.schema.auth import UserResponse
+
+settings = get_settings()
+
+
+async def list_slow_queries(
+    limit: int = Query(default=50, ge=1, le=settings.slow_query_log_size),
+    current_user: UserResponse = Depends(get_admin_user),
+) -> JSONResponse:
+    return JSONResponse({"threshold_ms": settings.slow_query_threshold_ms, "items": slow_queries.recent(limit)})
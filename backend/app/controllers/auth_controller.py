@@ -1,20 +1,32 @@
-from fastapi import Depends, Response
+from fastapi import Depends, Request, Response
 
-from app.core.dependencies import get_current_user
-from app.schema.auth import AuthResponse, LoginRequest, RegisterRequest, UserResponse
+from app.core.dependencies import get_auth_service, get_current_user
+from app.schema.auth import AuthResponse, LoginRequest, RegisterRequest, UserResponse, UserUpdate
 from app.services.auth_service import AuthService
 
 
-async def register_user(payload: RegisterRequest, service: AuthService = Depends()) -> UserResponse:
+def client_ip(request: Request) -> str:
+    # The socket peer; run uvicorn with --proxy-headers behind a trusted proxy so this is the real client.
+    return request.client.host if request.client else "unknown"
+
+
+async def register_user(
+    request: Request,
+    payload: RegisterRequest,
+    service: AuthService = Depends(get_auth_service),
+) -> UserResponse:
+    await service.throttle("register", client_ip(request), payload.email)
     user = await service.register(payload)
     return UserResponse(id=user.id, email=user.email, full_name=user.full_name)
 
 
 async def login_user(
+    request: Request,
     payload: LoginRequest,
     response: Response,
-    service: AuthService = Depends(),
+    service: AuthService = Depends(get_auth_service),
 ) -> AuthResponse:
+    await service.throttle("login", client_ip(request), payload.email)
     user = await service.authenticate(payload)
     user_response, token = await service.login_response(response, user)
     return AuthResponse(user=user_response, access_token=token)
@@ -27,3 +39,22 @@ async def logout_user(response: Response) -> dict[str, str]:
 
 async def current_user(user: UserResponse = Depends(get_current_user)) -> UserResponse:
     return user
+
+
+async def update_current_user(
+    payload: UserUpdate,
+    user: UserResponse = Depends(get_current_user),
+    service: AuthService = Depends(get_auth_service),
+) -> UserResponse:
+    updated = await service.update(user.id, payload)
+    return UserResponse(id=updated.id, email=updated.email, full_name=updated.full_name)
+
+
+async def delete_current_user(
+    user: UserResponse = Depends(get_current_user),
+    service: AuthService = Depends(get_auth_service),
+) -> Response:
+    await service.delete(user.id)
+    response = Response(status_code=204)
+    AuthService.logout_response(response)
+    return response
@@ -1,92 +1,123 @@
-from fastapi import Depends, Query
+from fastapi import Depends, File, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
 
-from app.core.dependencies import get_current_user
+from app.core import conditional
+from app.core.dependencies import get_client_service, get_current_user
+from app.core.export import EXPORT_FORMATS
+from app.core.serialization import JSONResponse, as_dict, page, select
+from app.core.settings import get_settings
 from app.schema.auth import UserResponse
+from app.schema.bulk import BulkRequest, BulkResponse
 from app.schema.client import ClientCreate, ClientResponse, ClientUpdate
 from app.services.client_service import ClientService
 
+settings = get_settings()
+
+CLIENT_FIELDS = tuple(ClientResponse.model_fields)
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return, e.g. id,name,email"
+
+IMPORT_DESCRIPTION = "CSV with a header row (name,email,phone,company,notes) or NDJSON, one client per line"
+
 
 async def create_client(
     payload: ClientCreate,
     current_user: UserResponse = Depends(get_current_user),
-    service: ClientService = Depends(),
-) -> ClientResponse:
+    service: ClientService = Depends(get_client_service),
+) -> JSONResponse:
     client = await service.create(current_user.id, payload)
-    return ClientResponse(
-        id=client.id,
-        name=client.name,
-        email=client.email,
-        phone=client.phone,
-        company=client.company,
-        notes=client.notes,
-        created_at=client.created_at.isoformat(),
-        updated_at=client.updated_at.isoformat(),
-    )
+    return JSONResponse(as_dict(client, CLIENT_FIELDS), status_code=201)
+
+
+async def bulk_clients(
+    payload: BulkRequest,
+    current_user: UserResponse = Depends(get_current_user),
+    service: ClientService = Depends(get_client_service),
+) -> BulkResponse:
+    return BulkResponse(results=await service.bulk(current_user.id, payload))
 
 
 async def list_clients(
-    search: str | None = Query(default=None, description="Search by name, email, or company"),
+    request: Request,
+    search: str | None = Query(default=None, max_length=100, description="Search by name, email, or company"),
+    limit: int = Query(default=settings.default_page_size, ge=1, le=settings.max_page_size),
+    cursor: str | None = Query(default=None, description="Opaque cursor from a previous page"),
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
+    current_user: UserResponse = Depends(get_current_user),
+    service: ClientService = Depends(get_client_service),
+) -> Response:
+    selected = service.fields(fields)
+    version = await service.version(current_user.id)
+    etag = conditional.list_etag("clients", current_user.id, version, request.url.query)
+    if conditional.is_fresh(request, etag):
+        return conditional.not_modified(etag)
+    clients, next_cursor = await service.list(current_user.id, search, limit=limit, cursor=cursor, fields=selected)
+    response = page(clients, select(CLIENT_FIELDS, selected), next_cursor)
+    response.headers.update(conditional.validators(etag))
+    return response
+
+
+async def export_clients(
+    export_format: str = Query(default="ndjson", alias="format", pattern="^(ndjson|csv)$"),
     current_user: UserResponse = Depends(get_current_user),
-    service: ClientService = Depends(),
-) -> list[ClientResponse]:
-    clients = await service.list(current_user.id, search)
-    return [
-        ClientResponse(
-            id=c.id,
-            name=c.name,
-            email=c.email,
-            phone=c.phone,
-            company=c.company,
-            notes=c.notes,
-            created_at=c.created_at.isoformat(),
-            updated_at=c.updated_at.isoformat(),
-        )
-        for c in clients
-    ]
+    service: ClientService = Depends(get_client_service),
+) -> StreamingResponse:
+    return StreamingResponse(
+        service.export(current_user.id, export_format),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="clients.{export_format}"'},
+    )
+
+
+async def import_clients(
+    file: UploadFile = File(description=IMPORT_DESCRIPTION),
+    import_format: str | None = Query(default=None, alias="format", pattern="^(ndjson|csv)$"),
+    batch_size: int = Query(default=settings.import_batch_size, ge=1, le=settings.import_max_batch_size),
+    current_user: UserResponse = Depends(get_current_user),
+    service: ClientService = Depends(get_client_service),
+) -> StreamingResponse:
+    events = await service.import_file(
+        current_user.id, file.file, import_format, file.filename, batch_size
+    )
+    return StreamingResponse(events, media_type=EXPORT_FORMATS["ndjson"])
 
 
 async def get_client(
+    request: Request,
     client_id: str,
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
     current_user: UserResponse = Depends(get_current_user),
-    service: ClientService = Depends(),
-) -> ClientResponse:
-    client = await service.get(client_id, current_user.id)
-    return ClientResponse(
-        id=client.id,
-        name=client.name,
-        email=client.email,
-        phone=client.phone,
-        company=client.company,
-        notes=client.notes,
-        created_at=client.created_at.isoformat(),
-        updated_at=client.updated_at.isoformat(),
-    )
+    service: ClientService = Depends(get_client_service),
+) -> Response:
+    selected = service.fields(fields)
+    if conditional.is_conditional(request):
+        # Cheap updated_at probe first, so a revalidation hit never loads the document.
+        updated_at = await service.revision(client_id, current_user.id)
+        etag = conditional.document_etag(client_id, updated_at, request.url.query)
+        if conditional.is_fresh(request, etag, updated_at):
+            return conditional.not_modified(etag, updated_at)
+    client = await service.get(client_id, current_user.id, selected)
+    response = JSONResponse(as_dict(client, select(CLIENT_FIELDS, selected)))
+    etag = conditional.document_etag(client_id, client.updated_at, request.url.query)
+    response.headers.update(conditional.validators(etag, client.updated_at))
+    return response
 
 
 async def update_client(
     client_id: str,
     payload: ClientUpdate,
     current_user: UserResponse = Depends(get_current_user),
-    service: ClientService = Depends(),
-) -> ClientResponse:
+    service: ClientService = Depends(get_client_service),
+) -> JSONResponse:
     client = await service.update(client_id, current_user.id, payload)
-    return ClientResponse(
-        id=client.id,
-        name=client.name,
-        email=client.email,
-        phone=client.phone,
-        company=client.company,
-        notes=client.notes,
-        created_at=client.created_at.isoformat(),
-        updated_at=client.updated_at.isoformat(),
-    )
+    return JSONResponse(as_dict(client, CLIENT_FIELDS))
 
 
 async def delete_client(
     client_id: str,
     current_user: UserResponse = Depends(get_current_user),
-    service: ClientService = Depends(),
-) -> dict[str, str]:
+    service: ClientService = Depends(get_client_service),
+) -> Response:
     await service.delete(client_id, current_user.id)
-    return {"detail": "Client deleted"}
+    return Response(status_code=204)
 
@@ -0,0 +1,13 @@
+from fastapi import Depends
+
+from app.core.dependencies import get_current_user, get_dashboard_service
+from app.core.serialization import JSONResponse
+from app.schema.auth import UserResponse
+from app.services.dashboard_service import DashboardService
+
+
+async def get_dashboard(
+    current_user: UserResponse = Depends(get_current_user),
+    service: DashboardService = Depends(get_dashboard_service),
+) -> JSONResponse:
+    return JSONResponse(await service.summary(current_user.id))
@@ -0,0 +1,18 @@
+from fastapi import Depends
+from fastapi.responses import StreamingResponse
+
+from app.core.dependencies import get_current_user, get_event_broker
+from app.core.events import EventBroker
+from app.schema.auth import UserResponse
+
+
+async def stream_events(
+    current_user: UserResponse = Depends(get_current_user),
+    broker: EventBroker = Depends(get_event_broker),
+) -> StreamingResponse:
+    return StreamingResponse(
+        broker.stream(current_user.id),
+        media_type="text/event-stream",
+        # No caching, and no buffering in nginx-style proxies, which would hold events back.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
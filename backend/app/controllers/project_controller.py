@@ -1,116 +1,183 @@
-from fastapi import Depends, Query
+from fastapi import Depends, File, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
 
-from app.core.dependencies import get_current_user
+from app.core import conditional
+from app.core.dependencies import get_current_user, get_project_service
+from app.core.export import EXPORT_FORMATS
+from app.core.serialization import JSONResponse, as_dict, page, select
+from app.core.settings import get_settings
 from app.schema.auth import UserResponse
-from app.schema.project import ProjectCreate, ProjectResponse, ProjectStatusUpdate, ProjectUpdate
+from app.schema.bulk import BulkRequest, BulkResponse
+from app.schema.project import (
+    BoardMoveRequest,
+    ProjectCreate,
+    ProjectResponse,
+    ProjectStatusUpdate,
+    ProjectUpdate,
+)
 from app.services.project_service import ProjectService
 
+settings = get_settings()
+
+PROJECT_FIELDS = tuple(ProjectResponse.model_fields)
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return, e.g. id,title,status"
+
+IMPORT_DESCRIPTION = (
+    "CSV with a header row or NDJSON, one project per line; "
+    "name the client with client_id, client_email, client_name or client"
+)
+STATUS_PATTERN = "^(idea|talks|in-progress|review|completed)$"
+
 
 async def create_project(
     payload: ProjectCreate,
     current_user: UserResponse = Depends(get_current_user),
-    service: ProjectService = Depends(),
-) -> ProjectResponse:
+    service: ProjectService = Depends(get_project_service),
+) -> JSONResponse:
     project = await service.create(current_user.id, payload)
-    return ProjectResponse(
-        id=project.id,
-        client_id=project.client_id,
-        title=project.title,
-        description=project.description,
-        status=project.status,
-        hourly_rate=project.hourly_rate,
-        deadline=project.deadline.isoformat() if project.deadline else None,
-        created_at=project.created_at.isoformat(),
-        updated_at=project.updated_at.isoformat(),
-    )
+    return JSONResponse(as_dict(project, PROJECT_FIELDS), status_code=201)
+
+
+async def bulk_projects(
+    payload: BulkRequest,
+    current_user: UserResponse = Depends(get_current_user),
+    service: ProjectService = Depends(get_project_service),
+) -> BulkResponse:
+    return BulkResponse(results=await service.bulk(current_user.id, payload))
 
 
 async def list_projects(
+    request: Request,
     client_id: str | None = Query(default=None, description="Filter by client ID"),
+    limit: int = Query(default=settings.default_page_size, ge=1, le=settings.max_page_size),
+    cursor: str | None = Query(default=None, description="Opaque cursor from a previous page"),
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
     current_user: UserResponse = Depends(get_current_user),
-    service: ProjectService = Depends(),
-) -> list[ProjectResponse]:
-    projects = await service.list(current_user.id, client_id)
-    return [
-        ProjectResponse(
-            id=p.id,
-            client_id=p.client_id,
-            title=p.title,
-            description=p.description,
-            status=p.status,
-            hourly_rate=p.hourly_rate,
-            deadline=p.deadline.isoformat() if p.deadline else None,
-            created_at=p.created_at.isoformat(),
-            updated_at=p.updated_at.isoformat(),
-        )
-        for p in projects
-    ]
+    service: ProjectService = Depends(get_project_service),
+) -> Response:
+    selected = service.fields(fields)
+    version = await service.version(current_user.id)
+    etag = conditional.list_etag("projects", current_user.id, version, request.url.query)
+    if conditional.is_fresh(request, etag):
+        return conditional.not_modified(etag)
+    projects, next_cursor = await service.list(
+        current_user.id, client_id, limit=limit, cursor=cursor, fields=selected
+    )
+    response = page(projects, select(PROJECT_FIELDS, selected), next_cursor)
+    response.headers.update(conditional.validators(etag))
+    return response
+
+
+async def get_board(
+    request: Request,
+    limit: int = Query(default=settings.default_page_size, ge=1, le=settings.max_page_size, description="Per column"),
+    column: str | None = Query(default=None, alias="status", pattern=STATUS_PATTERN, description="Only this column"),
+    cursor: str | None = Query(default=None, description="Cursor from a column's next_cursor; requires status"),
+    current_user: UserResponse = Depends(get_current_user),
+    service: ProjectService = Depends(get_project_service),
+) -> Response:
+    version = await service.board_version(current_user.id)
+    etag = conditional.list_etag("board", current_user.id, version, request.url.query)
+    if conditional.is_fresh(request, etag):
+        return conditional.not_modified(etag)
+    columns, clients = await service.board(current_user.id, limit=limit, column=column, cursor=cursor)
+    body = {"columns": []}
+    for name, count, projects, next_cursor in columns:
+        items = []
+        for project in projects:
+            item = as_dict(project, PROJECT_FIELDS)
+            client = clients.get(project.client_id)
+            item["client_name"] = client.get("name") if client else None
+            item["client_company"] = client.get("company") if client else None
+            items.append(item)
+        body["columns"].append({"status": name, "count": count, "items": items, "next_cursor": next_cursor})
+    response = JSONResponse(body)
+    response.headers.update(conditional.validators(etag))
+    return response
+
+
+async def export_projects(
+    export_format: str = Query(default="ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    client_id: str | None = Query(default=None, description="Filter by client ID"),
+    current_user: UserResponse = Depends(get_current_user),
+    service: ProjectService = Depends(get_project_service),
+) -> StreamingResponse:
+    return StreamingResponse(
+        service.export(current_user.id, export_format, client_id),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="projects.{export_format}"'},
+    )
+
+
+async def import_projects(
+    file: UploadFile = File(description=IMPORT_DESCRIPTION),
+    import_format: str | None = Query(default=None, alias="format", pattern="^(ndjson|csv)$"),
+    batch_size: int = Query(default=settings.import_batch_size, ge=1, le=settings.import_max_batch_size),
+    current_user: UserResponse = Depends(get_current_user),
+    service: ProjectService = Depends(get_project_service),
+) -> StreamingResponse:
+    events = await service.import_file(
+        current_user.id, file.file, import_format, file.filename, batch_size
+    )
+    return StreamingResponse(events, media_type=EXPORT_FORMATS["ndjson"])
 
 
 async def get_project(
+    request: Request,
     project_id: str,
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
     current_user: UserResponse = Depends(get_current_user),
-    service: ProjectService = Depends(),
-) -> ProjectResponse:
-    project = await service.get(project_id, current_user.id)
-    return ProjectResponse(
-        id=project.id,
-        client_id=project.client_id,
-        title=project.title,
-        description=project.description,
-        status=project.status,
-        hourly_rate=project.hourly_rate,
-        deadline=project.deadline.isoformat() if project.deadline else None,
-        created_at=project.created_at.isoformat(),
-        updated_at=project.updated_at.isoformat(),
-    )
+    service: ProjectService = Depends(get_project_service),
+) -> Response:
+    selected = service.fields(fields)
+    if conditional.is_conditional(request):
+        # Cheap updated_at probe first, so a revalidation hit never loads the document.
+        updated_at = await service.revision(project_id, current_user.id)
+        etag = conditional.document_etag(project_id, updated_at, request.url.query)
+        if conditional.is_fresh(request, etag, updated_at):
+            return conditional.not_modified(etag, updated_at)
+    project = await service.get(project_id, current_user.id, selected)
+    response = JSONResponse(as_dict(project, select(PROJECT_FIELDS, selected)))
+    etag = conditional.document_etag(project_id, project.updated_at, request.url.query)
+    response.headers.update(conditional.validators(etag, project.updated_at))
+    return response
 
 
 async def update_project(
     project_id: str,
     payload: ProjectUpdate,
     current_user: UserResponse = Depends(get_current_user),
-    service: ProjectService = Depends(),
-) -> ProjectResponse:
+    service: ProjectService = Depends(get_project_service),
+) -> JSONResponse:
     project = await service.update(project_id, current_user.id, payload)
-    return ProjectResponse(
-        id=project.id,
-        client_id=project.client_id,
-        title=project.title,
-        description=project.description,
-        status=project.status,
-        hourly_rate=project.hourly_rate,
-        deadline=project.deadline.isoformat() if project.deadline else None,
-        created_at=project.created_at.isoformat(),
-        updated_at=project.updated_at.isoformat(),
-    )
+    return JSONResponse(as_dict(project, PROJECT_FIELDS))
 
 
 async def update_project_status(
     project_id: str,
     payload: ProjectStatusUpdate,
     current_user: UserResponse = Depends(get_current_user),
-    service: ProjectService = Depends(),
-) -> ProjectResponse:
+    service: ProjectService = Depends(get_project_service),
+) -> JSONResponse:
     project = await service.update_status(project_id, current_user.id, payload)
-    return ProjectResponse(
-        id=project.id,
-        client_id=project.client_id,
-        title=project.title,
-        description=project.description,
-        status=project.status,
-        hourly_rate=project.hourly_rate,
-        deadline=project.deadline.isoformat() if project.deadline else None,
-        created_at=project.created_at.isoformat(),
-        updated_at=project.updated_at.isoformat(),
-    )
+    return JSONResponse(as_dict(project, PROJECT_FIELDS))
+
+
+async def move_projects(
+    payload: BoardMoveRequest,
+    current_user: UserResponse = Depends(get_current_user),
+    service: ProjectService = Depends(get_project_service),
+) -> JSONResponse:
+    projects = await service.move(current_user.id, payload)
+    return JSONResponse([as_dict(p, PROJECT_FIELDS) for p in projects])
 
 
 async def delete_project(
     project_id: str,
     current_user: UserResponse = Depends(get_current_user),
-    service: ProjectService = Depends(),
-) -> dict[str, str]:
+    service: ProjectService = Depends(get_project_service),
+) -> Response:
     await service.delete(project_id, current_user.id)
-    return {"detail": "Project deleted"}
+    return Response(status_code=204)
 
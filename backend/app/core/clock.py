@@ -0,0 +1,26 @@
+from datetime import datetime, timezone
+from typing import Any
+
+
+def utcnow() -> datetime:
+    """Naive UTC now truncated to milliseconds, the precision Mongo stores, so values round-trip exactly."""
+    now = datetime.utcnow()
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+
+def as_stored(value: datetime) -> datetime:
+    """Normalize a client-supplied timestamp to the naive-UTC, millisecond form stored in Mongo."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
+def timestamps(data: dict[str, Any]) -> tuple[datetime, datetime]:
+    """``created_at``/``updated_at`` from a document; the clock is read only if one is missing."""
+    created_at = data.get("created_at")
+    updated_at = data.get("updated_at")
+    if created_at is None or updated_at is None:
+        now = utcnow()
+        created_at = created_at or now
+        updated_at = updated_at or now
+    return created_at, updated_at
@@ -0,0 +1,223 @@
+"""Response compression with zstd, brotli (both need the ``compression`` extra) or gzip."""
+import zlib
+from functools import lru_cache
+from typing import Callable, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.settings import get_settings
+
+try:
+    import brotli
+except ImportError:  # optional: pip install ".[compression]"
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install ".[compression]"
+    zstandard = None
+
+settings = get_settings()
+
+COMPRESSIBLE_TYPES = frozenset(
+    {"application/json", "application/x-ndjson", "application/javascript", "application/xml", "image/svg+xml"}
+)
+
+# (largest body in bytes, level) per encoding; streams, whose length is unknown, use the last step.
+# From ``python -m benchmarks.compression`` on list pages, the board and an export: up to ~75 kB
+# every encoding finishes in about a millisecond even at these levels, which is far less than the
+# transfer time saved on a slow link. Past 1 MB, higher levels cost tens of milliseconds on the
+# event loop, and zstd 1 already compresses as well as zstd 3.
+LEVELS: dict[str, tuple[tuple[float, int], ...]] = {
+    "zstd": ((64 * 1024, 6), (float("inf"), 1)),
+    "br": ((1024 * 1024, 5), (float("inf"), 2)),
+    "gzip": ((1024 * 1024, 6), (float("inf"), 1)),
+}
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class _Gzip:
+    def __init__(self, level: int, size: int | None = None) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _Brotli:
+    def __init__(self, level: int, size: int | None = None) -> None:
+        self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _Zstd:
+    def __init__(self, level: int, size: int | None = None) -> None:
+        # A known size lets zstd shrink its tables; a 2 kB body at level 6 takes 0.02 ms instead of 0.2 ms.
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj(size=-1 if size is None else size)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+ENCODERS: dict[str, Callable[[int, int | None], Compressor]] = {"gzip": _Gzip}
+if brotli is not None:
+    ENCODERS["br"] = _Brotli
+if zstandard is not None:
+    ENCODERS["zstd"] = _Zstd
+
+# Server preference when the client weighs several encodings equally.
+PREFERENCE = tuple(encoding for encoding in ("zstd", "br", "gzip") if encoding in ENCODERS)
+
+
+@lru_cache(maxsize=64)
+def negotiate(accept_encoding: str) -> str | None:
+    """The client's highest-weighted encoding we support, or None for identity."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        key, _, value = params.strip().partition("=")
+        if key.strip().lower() == "q":
+            try:
+                weight = float(value)
+            except ValueError:
+                continue
+        weights[name.strip().lower()] = weight
+    wildcard = weights.get("*", 0.0)
+    chosen, chosen_weight = None, 0.0
+    for encoding in PREFERENCE:
+        weight = weights.get(encoding, wildcard)
+        if weight > chosen_weight:
+            chosen, chosen_weight = encoding, weight
+    return chosen
+
+
+def level_for(encoding: str, length: int | None) -> int:
+    steps = LEVELS[encoding]
+    if length is None:
+        return steps[-1][1]
+    return next(level for limit, level in steps if length <= limit)
+
+
+def compress(encoding: str, body: bytes, level: int | None = None) -> bytes:
+    compressor = ENCODERS[encoding](level_for(encoding, len(body)) if level is None else level, len(body))
+    return compressor.compress(body) + compressor.finish()
+
+
+def compressible(content_type: str) -> bool:
+    media_type = content_type.partition(";")[0].strip().lower()
+    if media_type == "text/event-stream":
+        return False
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES or media_type.endswith("+json")
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = settings.compression_minimum_size) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _Responder(send, encoding, self.minimum_size))
+
+
+class _Responder:
+    """Holds back the response start until the first body chunk shows whether to compress."""
+
+    def __init__(self, send: Send, encoding: str, minimum_size: int) -> None:
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start: Message | None = None
+        self.compressor: Compressor | None = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            status_code = message["status"]
+            self.passthrough = (
+                status_code < 200
+                or status_code in (204, 304)
+                or "content-encoding" in headers
+                or not compressible(headers.get("content-type", ""))
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start = message
+            return
+        if self.passthrough or message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+        if self.compressor is None:
+            assert self.start is not None
+            if not more_body:
+                # The whole body in one message, as for every JSON response.
+                self.passthrough = True
+                if len(body) < self.minimum_size:
+                    await self.send(self.start)
+                    await self.send(message)
+                    return
+                body = compress(self.encoding, body)
+                self._encode_headers(len(body))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            self.compressor = ENCODERS[self.encoding](level_for(self.encoding, None), None)
+            self._encode_headers(None)
+            await self.send(self.start)
+
+        chunk = self.compressor.compress(body) + (self.compressor.flush() if more_body else self.compressor.finish())
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def _encode_headers(self, length: int | None) -> None:
+        assert self.start is not None
+        headers = MutableHeaders(scope=self.start)
+        headers["Content-Encoding"] = self.encoding
+        if length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(length)
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            # The encoded bytes differ from the identity ones, so a strong validator would be wrong.
+            headers["ETag"] = f"W/{etag}"
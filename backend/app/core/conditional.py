@@ -0,0 +1,60 @@
+"""Conditional GET: weak ETags from per-user write counters (lists) or ``updated_at`` (documents)."""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def list_etag(collection: str, user_id: str, version: str, query: str) -> str:
+    # The user is hashed in so a browser shared between accounts never revalidates another user's list.
+    digest = hashlib.blake2s(f"{user_id}?{query}".encode(), digest_size=6).hexdigest()
+    return f'W/"{collection}-{version}-{digest}"'
+
+
+def document_etag(object_id: str, updated_at: datetime, query: str) -> str:
+    millis = int(updated_at.replace(tzinfo=timezone.utc).timestamp() * 1000)
+    digest = hashlib.blake2s(query.encode(), digest_size=6).hexdigest()
+    return f'W/"{object_id}-{millis}-{digest}"'
+
+
+def validators(etag: str, last_modified: datetime | None = None) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+    return headers
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_fresh(request: Request, etag: str, last_modified: datetime | None = None) -> bool:
+    """True if the client's cached copy is current; ``If-None-Match`` takes precedence over ``If-Modified-Since``."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return _opaque(etag) in {_opaque(tag) for tag in if_none_match.split(",")}
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+
+
+def not_modified(etag: str, last_modified: datetime | None = None) -> Response:
+    return Response(status_code=304, headers=validators(etag, last_modified))
+
+
+def _opaque(tag: str) -> str:
+    """Weak comparison (RFC 9110 8.8.3.2): ignore the ``W/`` prefix."""
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
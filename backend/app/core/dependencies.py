@@ -1,17 +1,62 @@
-from fastapi import Cookie, Depends, HTTPException, status
+import hmac
 
+from fastapi import Cookie, Depends, Header, HTTPException, Request, status
+
+from app.container import Container
+from app.core.events import EventBroker
+from app.core.principal_cache import principal_cache
 from app.core.security import decode_access_token
+from app.core.settings import get_settings
 from app.repositories.user_repository import UserRepository
 from app.schema.auth import UserResponse
+from app.services.auth_service import AuthService
+from app.services.client_service import ClientService
+from app.services.dashboard_service import DashboardService
+from app.services.project_service import ProjectService
+
+settings = get_settings()
+
+
+def _container(request: Request) -> Container:
+    return request.app.state.container
+
+
+# Async so FastAPI awaits these inline instead of handing each one to the threadpool.
+async def get_user_repository(request: Request) -> UserRepository:
+    return _container(request).user_repository
+
+
+async def get_auth_service(request: Request) -> AuthService:
+    return _container(request).auth_service
+
+
+async def get_client_service(request: Request) -> ClientService:
+    return _container(request).client_service
+
+
+async def get_project_service(request: Request) -> ProjectService:
+    return _container(request).project_service
+
+
+async def get_dashboard_service(request: Request) -> DashboardService:
+    return _container(request).dashboard_service
+
+
+async def get_event_broker(request: Request) -> EventBroker:
+    return _container(request).events
 
 
 async def get_current_user(
     access_token: str | None = Cookie(default=None),
-    repository: UserRepository = Depends(),
+    repository: UserRepository = Depends(get_user_repository),
 ) -> UserResponse:
     if not access_token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
+    cached = principal_cache.get_by_token(access_token)
+    if cached:
+        return cached
+
     try:
         payload = decode_access_token(access_token)
     except ValueError as exc:
@@ -21,8 +66,30 @@ async def get_current_user(
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    user = await repository.get_by_id(user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    principal = principal_cache.get_by_user(user_id)
+    if not principal:
+        user = await repository.get_by_id(user_id)
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        principal = UserResponse(id=user.id, email=user.email, full_name=user.full_name)
 
-    return UserResponse(id=user.id, email=user.email, full_name=user.full_name)
+    principal_cache.put(access_token, principal, payload.get("exp"))
+    return principal
+
+
+async def get_admin_user(current_user: UserResponse = Depends(get_current_user)) -> UserResponse:
+    if current_user.email.lower() not in {email.lower() for email in settings.admin_emails}:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
+
+
+async def require_metrics_access(
+    authorization: str | None = Header(default=None),
+    access_token: str | None = Cookie(default=None),
+    repository: UserRepository = Depends(get_user_repository),
+) -> None:
+    """``METRICS_TOKEN`` as a bearer token, for scrapers; otherwise an admin session."""
+    token = settings.metrics_token
+    if token and authorization and hmac.compare_digest(authorization.encode(), f"Bearer {token}".encode()):
+        return
+    await get_admin_user(await get_current_user(access_token, repository))
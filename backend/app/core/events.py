@@ -0,0 +1,150 @@
+"""Live change events, fanned out to each user's ``GET /api/events`` streams through bounded queues."""
+import asyncio
+import time
+from typing import Any, AsyncIterator, NamedTuple
+
+from app.core.serialization import as_dict, dumps
+from app.core.settings import get_settings
+from app.models.client import Client
+from app.models.project import Project
+from app.schema.client import ClientResponse
+from app.schema.project import ProjectResponse
+
+settings = get_settings()
+
+EVENT_FIELDS: dict[str, tuple[str, ...]] = {
+    Client.collection_name: tuple(ClientResponse.model_fields),
+    Project.collection_name: tuple(ProjectResponse.model_fields),
+}
+READY = b"retry: 3000\nevent: ready\ndata: {}\n\n"
+HEARTBEAT = b": ping\n\n"
+
+
+class Change(NamedTuple):
+    collection: str
+    op: str  # "created", "updated", "deleted", or "reset": refetch the whole collection
+    id: str | None = None
+    data: dict[str, Any] | None = None
+
+    def frame(self) -> bytes:
+        return b"event: change\ndata: " + dumps(self._asdict()) + b"\n\n"
+
+
+def changed(op: str, obj: Client | Project) -> Change:
+    collection = obj.collection_name
+    return Change(collection, op, obj.id, as_dict(obj, EVENT_FIELDS[collection]))
+
+
+def deletion(collection: str, object_id: str) -> Change:
+    return Change(collection, "deleted", object_id)
+
+
+def reset(collection: str) -> Change:
+    return Change(collection, "reset")
+
+
+class Subscription:
+    __slots__ = ("user_id", "frames", "wakeup", "overflowed", "closed")
+
+    def __init__(self, user_id: str) -> None:
+        self.user_id = user_id
+        self.frames: list[bytes] = []
+        self.wakeup = asyncio.Event()
+        self.overflowed = False
+        self.closed = False
+
+
+class EventBroker:
+    def __init__(self, queue_size: int, heartbeat_seconds: float, max_connection_seconds: float) -> None:
+        self.queue_size = queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_connection_seconds = max_connection_seconds
+        # Set while a change stream feeds ``publish``, so services' own ``notify`` calls are skipped.
+        self.external = False
+        self._subscriptions: dict[str, set[Subscription]] = {}
+        self.published = 0
+        self.overflows = 0
+
+    @property
+    def subscribers(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def watching(self, user_id: str) -> bool:
+        return user_id in self._subscriptions
+
+    def notify(self, user_id: str, *changes: Change) -> None:
+        """Publish changes a service just made, unless a change stream is already delivering them."""
+        if not self.external:
+            for change in changes:
+                self.publish(user_id, change)
+
+    def publish(self, user_id: str, change: Change) -> None:
+        subscriptions = self._subscriptions.get(user_id)
+        if not subscriptions:
+            return
+        frame = change.frame()
+        self.published += 1
+        for subscription in subscriptions:
+            if subscription.overflowed:
+                continue
+            if len(subscription.frames) >= self.queue_size:
+                subscription.frames.clear()
+                subscription.overflowed = True
+                self.overflows += 1
+            else:
+                subscription.frames.append(frame)
+            subscription.wakeup.set()
+
+    def reset_all(self, *collections: str) -> None:
+        """Tell every stream to refetch, e.g. after the change stream lost its place."""
+        for user_id in list(self._subscriptions):
+            for collection in collections:
+                self.publish(user_id, reset(collection))
+
+    def close(self) -> None:
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.closed = True
+                subscription.wakeup.set()
+
+    async def stream(self, user_id: str) -> AsyncIterator[bytes]:
+        """SSE frames for one connection; the subscription is released when the client goes away."""
+        subscription = Subscription(user_id)
+        self._subscriptions.setdefault(user_id, set()).add(subscription)
+        deadline = time.monotonic() + self.max_connection_seconds
+        try:
+            yield READY
+            while not subscription.closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                try:
+                    await asyncio.wait_for(subscription.wakeup.wait(), min(self.heartbeat_seconds, remaining))
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT
+                    continue
+                subscription.wakeup.clear()
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    yield b"".join(reset(collection).frame() for collection in EVENT_FIELDS)
+                    continue
+                frames, subscription.frames = subscription.frames, []
+                if frames:
+                    yield b"".join(frames)
+        finally:
+            subscriptions = self._subscriptions.get(user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[user_id]
+
+    def stats(self) -> dict[str, int]:
+        return {"subscribers": self.subscribers, "published": self.published, "overflows": self.overflows}
+
+
+def build_broker() -> EventBroker:
+    return EventBroker(
+        settings.events_queue_size,
+        settings.events_heartbeat_seconds,
+        settings.events_max_connection_seconds,
+    )
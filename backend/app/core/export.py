@@ -0,0 +1,66 @@
+import csv
+import io
+from datetime import datetime
+from typing import Any, AsyncIterator, Sequence
+
+from app.core.serialization import dumps
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def document_row(doc: dict[str, Any], fields: Sequence[str]) -> dict[str, Any]:
+    row: dict[str, Any] = {}
+    for field in fields:
+        value = doc.get("_id") if field == "id" else doc.get(field)
+        if field == "id" and value is not None:
+            value = str(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        row[field] = value
+    return row
+
+
+async def encode_documents(
+    docs: AsyncIterator[dict[str, Any]],
+    fields: Sequence[str],
+    export_format: str,
+    chunk_size: int,
+) -> AsyncIterator[bytes]:
+    """Encode documents as NDJSON or CSV in chunks of about ``chunk_size`` bytes; a CSV header is sent at once."""
+    if export_format == "csv":
+        async for chunk in _encode_csv(docs, fields, chunk_size):
+            yield chunk
+        return
+    buffer = bytearray()
+    async for doc in docs:
+        buffer += dumps(document_row(doc, fields))
+        buffer += b"\n"
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+async def _encode_csv(
+    docs: AsyncIterator[dict[str, Any]], fields: Sequence[str], chunk_size: int
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(fields), extrasaction="ignore")
+    writer.writeheader()
+    yield buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+    async for doc in docs:
+        writer.writerow(document_row(doc, fields))
+        # Characters, not bytes, but close enough for picking chunk boundaries.
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    tail = buffer.getvalue()
+    if tail:
+        yield tail.encode()
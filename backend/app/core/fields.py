@@ -0,0 +1,19 @@
+from typing import Collection, Iterable
+
+
+def parse_fields(raw: str | None, allowed: Collection[str]) -> tuple[str, ...] | None:
+    """Parse a comma-separated ``fields=`` value; None means the caller asked for every field."""
+    if raw is None:
+        return None
+    requested = tuple(dict.fromkeys(field.strip() for field in raw.split(",") if field.strip()))
+    if not requested:
+        return None
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return requested
+
+
+def projection(fields: Iterable[str], always: Iterable[str] = ()) -> dict[str, int]:
+    """Inclusion projection for ``fields`` plus ``always`` (e.g. keyset sort keys); ``_id`` is implicit."""
+    return {field: 1 for field in (*always, *fields) if field != "id"}
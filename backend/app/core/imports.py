@@ -0,0 +1,82 @@
+"""Streaming import parsing: rows are read from the spooled upload one batch at a time."""
+import csv
+import io
+import json
+from itertools import islice
+from typing import Any, AsyncIterator, BinaryIO, Iterator, NamedTuple
+
+from starlette.concurrency import run_in_threadpool
+
+IMPORT_FORMATS = ("ndjson", "csv")
+
+
+class ImportRow(NamedTuple):
+    line: int
+    data: dict[str, Any] | None
+    error: str | None = None
+
+
+def detect_format(requested: str | None, filename: str | None) -> str:
+    if requested:
+        return requested
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    if extension in ("ndjson", "jsonl"):
+        return "ndjson"
+    if extension == "csv":
+        return "csv"
+    raise ValueError("Cannot tell the file format from its name; pass format=csv or format=ndjson")
+
+
+def _clean(row: dict[str | None, Any]) -> dict[str, Any]:
+    # Blank CSV cells mean "not given", so optional fields fall back to their schema defaults.
+    return {
+        key.strip(): (value.strip() or None) if isinstance(value, str) else value
+        for key, value in row.items()
+        if key is not None and key.strip()
+    }
+
+
+def _csv_rows(text: io.TextIOWrapper) -> Iterator[ImportRow]:
+    reader = csv.DictReader(text)
+    for row in reader:
+        yield ImportRow(reader.line_num, _clean(row))
+
+
+def _ndjson_rows(text: io.TextIOWrapper) -> Iterator[ImportRow]:
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as exc:
+            yield ImportRow(line_number, None, f"Invalid JSON: {exc}")
+            continue
+        if not isinstance(data, dict):
+            yield ImportRow(line_number, None, "Expected a JSON object")
+            continue
+        yield ImportRow(line_number, data)
+
+
+def iter_rows(binary: BinaryIO, import_format: str) -> Iterator[ImportRow]:
+    """Rows of an uploaded file; a file-level problem (bad encoding, broken CSV) ends it with an error row."""
+    text = io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+    rows = _csv_rows(text) if import_format == "csv" else _ndjson_rows(text)
+    last_line = 0
+    try:
+        for row in rows:
+            last_line = row.line
+            yield row
+    except (UnicodeDecodeError, csv.Error) as exc:
+        yield ImportRow(last_line + 1, None, f"Could not read file: {exc}")
+    finally:
+        # Leave the upload open; the framework closes it after the response.
+        text.detach()
+
+
+async def read_batches(binary: BinaryIO, import_format: str, batch_size: int) -> AsyncIterator[list[ImportRow]]:
+    rows = iter_rows(binary, import_format)
+    while True:
+        batch = await run_in_threadpool(lambda: list(islice(rows, batch_size)))
+        if not batch:
+            return
+        yield batch
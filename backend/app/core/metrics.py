@@ -0,0 +1,174 @@
+"""Request metrics per route template, rendered in the Prometheus text format."""
+import time
+from bisect import bisect_left
+from typing import Iterable, Iterator
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Seconds. Dense below 100 ms where most API calls land, coarse above for exports and bulk writes.
+LATENCY_BUCKETS: tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Iterator[tuple[str, int]]:
+        total = 0
+        for bound, count in zip((*map(repr, self.bounds), "+Inf"), self.counts):
+            total += count
+            yield bound, total
+
+
+class RouteSeries:
+    __slots__ = ("latency", "statuses")
+
+    def __init__(self) -> None:
+        self.latency = Histogram()
+        self.statuses: dict[int, int] = {}
+
+
+class HttpMetrics:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.series: dict[str, dict[str, RouteSeries]] = {}
+
+    def record(self, route: str, method: str, status_code: int, seconds: float) -> None:
+        by_method = self.series.get(route)
+        if by_method is None:
+            by_method = self.series[route] = {}
+        series = by_method.get(method)
+        if series is None:
+            series = by_method[method] = RouteSeries()
+        series.latency.observe(seconds)
+        series.statuses[status_code] = series.statuses.get(status_code, 0) + 1
+
+    def exposition(self) -> Iterator[str]:
+        yield from gauge("http_requests_in_flight", "Requests currently being served.", [({}, self.in_flight)])
+        labelled = [
+            ({"route": route, "method": method}, series)
+            for route, by_method in sorted(self.series.items())
+            for method, series in sorted(by_method.items())
+        ]
+        yield from histogram(
+            "http_request_duration_seconds",
+            "Request latency by route template.",
+            [(labels, series.latency) for labels, series in labelled],
+        )
+        yield from counter(
+            "http_responses_total",
+            "Responses by route template and status code.",
+            [
+                ({**labels, "status": str(code)}, count)
+                for labels, series in labelled
+                for code, count in sorted(series.statuses.items())
+            ],
+        )
+
+
+http_metrics = HttpMetrics()
+
+
+class StatusRecorder:
+    """Wraps ``send`` to remember the response status; one slotted object per request, no closure cells."""
+
+    __slots__ = ("send", "status_code")
+
+    def __init__(self, send: Send) -> None:
+        self.send = send
+        self.status_code = 500
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.status_code = message["status"]
+        await self.send(message)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, metrics: HttpMetrics = http_metrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        recorder = StatusRecorder(send)
+        metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, recorder)
+        finally:
+            metrics.in_flight -= 1
+            metrics.record(self._template(scope), scope["method"], recorder.status_code, time.perf_counter() - started)
+
+    @staticmethod
+    def _template(scope: Scope) -> str:
+        # Set by the router once it has matched; unmatched paths share one series.
+        route = scope.get("route")
+        if route is None:
+            return UNMATCHED_ROUTE
+        template = route.path_format
+        # Depending on the FastAPI version, a route from an included router may carry only its own
+        # path, without the include prefixes. The template has as many segments as the part of the
+        # request path it matched, so whatever precedes them is the prefix. (A ``{name:path}``
+        # parameter would break this; no route uses one.)
+        path: str = scope["path"]
+        root_path: str = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path) :]
+        return path.rsplit("/", template.count("/"))[0] + template
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _header(name: str, help_text: str, kind: str) -> Iterator[str]:
+    yield f"# HELP {name} {help_text}"
+    yield f"# TYPE {name} {kind}"
+
+
+def gauge(name: str, help_text: str, samples: Iterable[tuple[dict[str, str], float]]) -> Iterator[str]:
+    yield from _header(name, help_text, "gauge")
+    for labels, value in samples:
+        yield f"{name}{_labels(labels)} {value}"
+
+
+def counter(name: str, help_text: str, samples: Iterable[tuple[dict[str, str], float]]) -> Iterator[str]:
+    yield from _header(name, help_text, "counter")
+    for labels, value in samples:
+        yield f"{name}{_labels(labels)} {value}"
+
+
+def histogram(name: str, help_text: str, samples: Iterable[tuple[dict[str, str], Histogram]]) -> Iterator[str]:
+    yield from _header(name, help_text, "histogram")
+    for labels, values in samples:
+        for bound, total in values.cumulative():
+            yield f"{name}_bucket{_labels({**labels, 'le': bound})} {total}"
+        yield f"{name}_sum{_labels(labels)} {values.sum}"
+        yield f"{name}_count{_labels(labels)} {values.count}"
+
+
+def render(sections: Iterable[Iterable[str]]) -> str:
+    return "\n".join(line for section in sections for line in section) + "\n"
+
@@ -0,0 +1,109 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+def _pack(data: dict[str, Any]) -> str:
+    raw = json.dumps(data, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _unpack(cursor: str) -> dict[str, Any]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    if not isinstance(data, dict):
+        raise ValueError("Invalid cursor")
+    return data
+
+
+def encode_cursor(created_at: datetime, object_id: ObjectId, score: float | None = None) -> str:
+    data: dict[str, Any] = {"c": created_at.isoformat(), "i": str(object_id)}
+    if score is not None:
+        data["s"] = score
+    return _pack(data)
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, ObjectId, float | None]:
+    try:
+        data = _unpack(cursor)
+        score = data.get("s")
+        if score is not None and not isinstance(score, (int, float)):
+            raise ValueError("Invalid cursor score")
+        return datetime.fromisoformat(data["c"]), ObjectId(data["i"]), score
+    except (ValueError, KeyError, TypeError, AttributeError, InvalidId) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def keyset_filter(cursor: str | None, score_field: str | None = None) -> dict[str, Any]:
+    """Filter selecting documents strictly after ``cursor`` in keyset order.
+
+    The order is (created_at, _id) descending, optionally preceded by ``score_field`` descending.
+    """
+    if not cursor:
+        return {}
+    created_at, object_id, score = decode_cursor(cursor)
+    branches: list[dict[str, Any]] = [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "_id": {"$lt": object_id}},
+    ]
+    if score_field:
+        if score is None:
+            raise ValueError("Invalid cursor")
+        branches = [{score_field: {"$lt": score}}] + [{score_field: score, **branch} for branch in branches]
+    return {"$or": branches}
+
+
+KEYSET_SORT = [("created_at", -1), ("_id", -1)]
+
+
+async def fetch_page(
+    cursor: Any,
+    limit: int,
+    score_field: str | None = None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Read one page from a cursor sorted in keyset order and limited to ``limit + 1`` documents."""
+    docs = await cursor.to_list(length=limit + 1)
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    last = docs[-1]
+    score = last[score_field] if score_field else None
+    return docs, encode_cursor(last["created_at"], last["_id"], score)
+
+
+RANK_SORT = [("position", 1), ("_id", 1)]
+
+
+def encode_rank_cursor(position: str | None, object_id: ObjectId) -> str:
+    return _pack({"p": position, "i": str(object_id)})
+
+
+def rank_filter(cursor: str | None) -> dict[str, Any]:
+    """Filter selecting documents strictly after ``cursor`` in (position, _id) ascending order.
+
+    Missing positions sort first, matching Mongo's ordering of null before strings.
+    """
+    if not cursor:
+        return {}
+    try:
+        data = _unpack(cursor)
+        position, object_id = data["p"], ObjectId(data["i"])
+        if position is not None and not isinstance(position, str):
+            raise ValueError("Invalid cursor position")
+    except (ValueError, KeyError, TypeError, AttributeError, InvalidId) as exc:
+        raise ValueError("Invalid cursor") from exc
+    later = {"position": {"$gt": position}} if position is not None else {"position": {"$type": "string"}}
+    return {"$or": [later, {"position": position, "_id": {"$gt": object_id}}]}
+
+
+async def fetch_rank_page(cursor: Any, limit: int) -> tuple[list[dict[str, Any]], str | None]:
+    """Read one page from a cursor sorted by ``RANK_SORT`` and limited to ``limit + 1`` documents."""
+    docs = await cursor.to_list(length=limit + 1)
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    return docs, encode_rank_cursor(docs[-1].get("position"), docs[-1]["_id"])
@@ -0,0 +1,99 @@
+import hmac
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from app.core.settings import get_settings
+from app.schema.auth import UserResponse
+
+settings = get_settings()
+
+
+class _Entry(NamedTuple):
+    principal: UserResponse
+    expires_at: float
+    token: str | None = None
+
+
+class PrincipalCache:
+    """In-process LRU of authenticated principals, keyed by token signature and by user id.
+
+    Token entries never outlive the token's ``exp`` claim. ``UserRepository`` calls
+    ``invalidate_user`` on every user write, but only in its own worker; keep the TTL short.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._by_token: OrderedDict[str, _Entry] = OrderedDict()
+        self._by_user: OrderedDict[str, _Entry] = OrderedDict()
+        self.token_hits = 0
+        self.user_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def signature(token: str) -> str:
+        return token.rsplit(".", 1)[-1]
+
+    def get_by_token(self, token: str) -> UserResponse | None:
+        key = self.signature(token)
+        entry = self._lookup(self._by_token, key)
+        if entry is None or entry.token is None or not hmac.compare_digest(entry.token, token):
+            return None
+        self.token_hits += 1
+        return entry.principal
+
+    def get_by_user(self, user_id: str) -> UserResponse | None:
+        entry = self._lookup(self._by_user, user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.user_hits += 1
+        return entry.principal
+
+    def put(self, token: str, principal: UserResponse, token_exp: float | None) -> None:
+        now = time.monotonic()
+        self._store(self._by_user, principal.id, _Entry(principal, now + self.ttl_seconds))
+        ttl = self.ttl_seconds
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl > 0:
+            self._store(self._by_token, self.signature(token), _Entry(principal, now + ttl, token))
+
+    def invalidate_user(self, user_id: str) -> None:
+        self._by_user.pop(user_id, None)
+        stale = [key for key, entry in self._by_token.items() if entry.principal.id == user_id]
+        for key in stale:
+            del self._by_token[key]
+
+    def clear(self) -> None:
+        self._by_token.clear()
+        self._by_user.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "token_hits": self.token_hits,
+            "user_hits": self.user_hits,
+            "misses": self.misses,
+            "token_entries": len(self._by_token),
+            "user_entries": len(self._by_user),
+        }
+
+    def _lookup(self, store: OrderedDict[str, _Entry], key: str) -> _Entry | None:
+        entry = store.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del store[key]
+            return None
+        store.move_to_end(key)
+        return entry
+
+    def _store(self, store: OrderedDict[str, _Entry], key: str, entry: _Entry) -> None:
+        store[key] = entry
+        store.move_to_end(key)
+        while len(store) > self.max_size:
+            store.popitem(last=False)
+
+
+principal_cache = PrincipalCache(settings.principal_cache_size, settings.principal_cache_ttl_seconds)
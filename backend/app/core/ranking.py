@@ -0,0 +1,63 @@
+"""
+Fractional rank keys for ordering cards within a board column.
+
+Keys are base-36 digit strings read as fractions (``"h"`` is 17/36), compared
+lexicographically, and never end in ``"0"``. ``rank_between`` always finds a key
+strictly between two neighbours, so moving a card only rewrites that card.
+"""
+import calendar
+from datetime import datetime
+
+from bson import ObjectId
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+_BASE = len(DIGITS)
+_TIME_WIDTH = 9
+_TIME_CEILING = _BASE**_TIME_WIDTH - 1
+
+
+def _midpoint(low: str, high: str | None) -> str:
+    if high is not None:
+        shared = 0
+        while shared < len(high) and (low[shared] if shared < len(low) else "0") == high[shared]:
+            shared += 1
+        if shared:
+            return high[:shared] + _midpoint(low[shared:], high[shared:])
+    low_digit = DIGITS.index(low[0]) if low else 0
+    high_digit = DIGITS.index(high[0]) if high is not None else _BASE
+    if high_digit - low_digit > 1:
+        return DIGITS[(low_digit + high_digit + 1) // 2]
+    if high is not None and len(high) > 1:
+        return high[:1]
+    return DIGITS[low_digit] + _midpoint(low[1:], None)
+
+
+def rank_between(before: str | None, after: str | None) -> str:
+    """
+    Key that sorts after ``before`` and before ``after``; either side may be open. Raises
+    ValueError if ``before`` does not sort below ``after``, since no key fits between them.
+    """
+    low = before or ""
+    if after is not None and low >= after:
+        raise ValueError(f"No rank between {before!r} and {after!r}")
+    return _midpoint(low, after)
+
+
+def initial_rank(created_at: datetime, tiebreak: ObjectId | None = None) -> str:
+    """
+    Default key for a new card: newer timestamps give smaller keys, so new cards sort first.
+    ``tiebreak`` (the card's ``_id``) keeps keys unique among cards created in the same
+    millisecond, such as every card of a bulk create or import batch.
+    """
+    millis = calendar.timegm(created_at.utctimetuple()) * 1000 + created_at.microsecond // 1000
+    value = _TIME_CEILING - millis
+    digits = []
+    for _ in range(_TIME_WIDTH):
+        value, remainder = divmod(value, _BASE)
+        digits.append(DIGITS[remainder])
+    key = "".join(reversed(digits))
+    if tiebreak is None:
+        return key.rstrip("0") or "1"
+    # The time part keeps its full width so every suffix starts at the same digit. The ObjectId's
+    # leading timestamp repeats the time, so only its random and counter bytes are appended.
+    return key + (str(tiebreak)[8:].rstrip("0") or "1")
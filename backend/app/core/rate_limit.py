@@ -0,0 +1,80 @@
+"""Token-bucket rate limiting, with buckets kept per worker or shared in Mongo."""
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Protocol
+
+
+class Limit(NamedTuple):
+    burst: int
+    per_minute: float
+
+    @property
+    def per_second(self) -> float:
+        return self.per_minute / 60
+
+
+class RateLimitStore(Protocol):
+    async def take(self, key: str, limit: Limit) -> float:
+        """Take a token from ``key``'s bucket; return 0.0, or the seconds until a token is available."""
+        ...
+
+
+class MemoryRateLimitStore:
+    """Per-worker buckets. Beyond ``max_keys`` the least recently hit bucket is dropped, which refills it."""
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def take(self, key: str, limit: Limit) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = float(limit.burst)
+        else:
+            tokens, updated = bucket
+            tokens = min(float(limit.burst), tokens + (now - updated) * limit.per_second)
+            self._buckets.move_to_end(key)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / limit.per_second
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class RateLimiter:
+    def __init__(self, store: RateLimitStore, enabled: bool = True) -> None:
+        self.store = store
+        self.enabled = enabled
+        self.allowed = 0
+        self.rejected = 0
+
+    async def hit(self, *checks: tuple[str, Limit]) -> float:
+        """
+        Charge each ``(key, limit)`` in order and return 0.0 if all allowed the hit. Stops at the
+        first rejection and returns its wait, so a flood from one IP cannot drain the buckets of
+        the emails it names.
+        """
+        if not self.enabled:
+            return 0.0
+        for key, limit in checks:
+            wait = await self.store.take(key, limit)
+            if wait:
+                self.rejected += 1
+                return wait
+        self.allowed += 1
+        return 0.0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "buckets": len(self.store) if isinstance(self.store, MemoryRateLimitStore) else 0,
+        }
@@ -0,0 +1,67 @@
+import re
+import unicodedata
+from typing import Any, Iterable
+
+MAX_PREFIX_LENGTH = 15
+MAX_QUERY_TERMS = 8
+# Shorter queries match too many clients to score them all, so they are served newest first.
+MIN_RANKED_LENGTH = 3
+
+SEARCH_FIELDS = ("search_prefixes", "search_terms", "search_name_terms")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(value: str | None) -> list[str]:
+    if not value:
+        return []
+    normalized = unicodedata.normalize("NFKD", value)
+    ascii_only = "".join(ch for ch in normalized if not unicodedata.combining(ch))
+    return _TOKEN_RE.findall(ascii_only.lower())
+
+
+def prefixes(tokens: Iterable[str]) -> list[str]:
+    result: set[str] = set()
+    for token in tokens:
+        for length in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1):
+            result.add(token[:length])
+    return sorted(result)
+
+
+def search_document(name: str | None, *others: str | None) -> dict[str, Any]:
+    """Derived fields stored on a document so searches can use the (user_id, search_prefixes) index."""
+    name_terms = tokenize(name)
+    terms = set(name_terms)
+    for value in others:
+        terms.update(tokenize(value))
+    return {
+        "search_prefixes": prefixes(terms),
+        "search_terms": sorted(terms),
+        "search_name_terms": sorted(set(name_terms)),
+    }
+
+
+def parse_query(query: str) -> tuple[list[str], list[str]]:
+    """Split a user query into (prefix keys for matching, full terms for ranking)."""
+    terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    keys = list(dict.fromkeys(term[:MAX_PREFIX_LENGTH] for term in terms))
+    return keys, terms
+
+
+def is_ranked(keys: list[str]) -> bool:
+    return max(len(key) for key in keys) >= MIN_RANKED_LENGTH
+
+
+def score_expression(terms: list[str]) -> dict[str, Any]:
+    """Exact term hits count once, exact hits on the name count twice more; prefix-only hits score zero."""
+    return {
+        "$add": [
+            {"$size": {"$setIntersection": [{"$ifNull": ["$search_terms", []]}, terms]}},
+            {
+                "$multiply": [
+                    2,
+                    {"$size": {"$setIntersection": [{"$ifNull": ["$search_name_terms", []]}, terms]}},
+                ]
+            },
+        ]
+    }
@@ -0,0 +1,39 @@
+"""orjson responses; controllers return them directly, skipping ``response_model`` validation."""
+from typing import Any, Iterable, Sequence
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import Response
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class JSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def select(fields: Sequence[str], selected: Iterable[str] | None = None) -> tuple[str, ...]:
+    """Narrow ``fields`` to a sparse-fieldset ``selected``, always keeping ``id``."""
+    if selected is None:
+        return tuple(fields)
+    wanted = set(selected)
+    return tuple(field for field in fields if field == "id" or field in wanted)
+
+
+def as_dict(obj: Any, fields: Sequence[str]) -> dict[str, Any]:
+    return {field: getattr(obj, field) for field in fields}
+
+
+def page(items: Iterable[Any], fields: Sequence[str], next_cursor: str | None) -> JSONResponse:
+    return JSONResponse({"items": [as_dict(item, fields) for item in items], "next_cursor": next_cursor})
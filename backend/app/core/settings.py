@@ -7,9 +7,52 @@ class Settings(BaseSettings):
     environment: str = "development"
     mongo_uri: str = "mongodb://localhost:27017"
     mongo_db: str = "clienthub"
+    # Connection tuning; None keeps the driver default (or whatever MONGO_URI sets).
+    mongo_server_selection_timeout_ms: int = 5000
+    mongo_max_pool_size: int | None = None
+    mongo_min_pool_size: int | None = None
+    mongo_max_idle_time_ms: int | None = None
+    mongo_wait_queue_timeout_ms: int | None = None
+    mongo_compressors: list[str] | None = None  # e.g. ["zstd","zlib"]; zstd and snappy need the `compression` extra
+    mongo_zlib_compression_level: int | None = None
+    mongo_write_concern: str | None = None  # "majority" or a node count
+    mongo_journal: bool | None = None
+    mongo_read_concern: str | None = None  # "local", "majority", ...
+    mongo_read_preference: str | None = None  # "primary", "secondaryPreferred", ...
+    slow_query_threshold_ms: float = 100.0
+    slow_query_log_size: int = 200
+    slow_query_explain_interval_seconds: float = 300.0  # per query shape; 0 disables explain capture
+    admin_emails: list[str] = []
+    metrics_token: str | None = None  # lets scrapers read /api/metrics with "Authorization: Bearer <token>"
+    ensure_indexes_on_startup: bool = True
     jwt_secret_key: str = "dev-secret-key-change-in-production"
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 16
+    principal_cache_size: int = 10_000
+    principal_cache_ttl_seconds: float = 60.0
+    # Login and registration throttling, per action; each attempt spends a token from its IP's and its email's bucket.
+    rate_limit_enabled: bool = True
+    rate_limit_backend: str = "memory"  # "memory" (per worker) or "mongo" (shared by every worker)
+    rate_limit_max_keys: int = 100_000  # memory backend only
+    auth_rate_limit_ip_burst: int = 20
+    auth_rate_limit_ip_per_minute: float = 10.0
+    auth_rate_limit_email_burst: int = 5
+    auth_rate_limit_email_per_minute: float = 1.0
+    default_page_size: int = 50
+    max_page_size: int = 200
+    export_batch_size: int = 500  # documents per cursor batch
+    export_chunk_size: int = 64 * 1024  # bytes per streamed chunk
+    import_batch_size: int = 1000
+    import_max_batch_size: int = 5000
+    compression_minimum_size: int = 1024  # bytes; smaller responses are sent as they are
+    events_queue_size: int = 256  # frames buffered per connection before it is told to refetch instead
+    events_heartbeat_seconds: float = 20.0
+    events_max_connection_seconds: float = 900.0  # the browser reconnects, re-checking the session cookie
+    events_change_streams: bool = True  # watch Mongo on replica sets; otherwise only this worker's writes
+    orphan_sweep_interval_seconds: float = 3600.0  # standalone servers only; 0 disables the sweeper
     cors_origins: list[str] = ["http://localhost:5173", "http://localhost:8000", "http://localhost:3000"]
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
@@ -0,0 +1,134 @@
+"""Change stream feed: on replica sets, publishes every client and project write to the owner's event streams."""
+import asyncio
+import logging
+from typing import Any, Mapping
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.core.events import EVENT_FIELDS, EventBroker, changed, deletion
+from app.core.settings import get_settings
+from app.db.mongo import supports_transactions
+from app.models.client import Client
+from app.models.project import Project
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+MODELS: dict[str, Any] = {Client.collection_name: Client, Project.collection_name: Project}
+OPERATIONS = {"insert": "created", "update": "updated", "replace": "updated", "delete": "deleted"}
+NAMESPACE_NOT_FOUND = 26
+CHANGE_STREAM_HISTORY_LOST = 286
+RETRY_SECONDS = 5.0
+
+# Only what an event carries leaves the server; search terms and the rest of the pre-image stay behind.
+PIPELINE: list[dict[str, Any]] = [
+    {"$match": {"ns.coll": {"$in": list(MODELS)}, "operationType": {"$in": list(OPERATIONS)}}},
+    {
+        "$project": {
+            "operationType": 1,
+            "ns": 1,
+            "documentKey": 1,
+            "fullDocument.user_id": 1,
+            **{
+                f"fullDocument.{'_id' if field == 'id' else field}": 1
+                for fields in EVENT_FIELDS.values()
+                for field in fields
+            },
+            "fullDocumentBeforeChange.user_id": 1,
+        }
+    },
+]
+
+
+class ChangeStreamFeed:
+    def __init__(self, db: AsyncIOMotorDatabase, broker: EventBroker) -> None:
+        self.db = db
+        self.broker = broker
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> bool:
+        """Start watching if the deployment supports it; returns whether the feed is running."""
+        if not settings.events_change_streams:
+            return False
+        try:
+            if not await supports_transactions():
+                return False
+        except PyMongoError as exc:
+            logger.warning("Live events fall back to per-worker delivery; could not probe the deployment: %s", exc)
+            return False
+        try:
+            started_at = None
+            for name in MODELS:
+                started_at = (await self._record_pre_images(name)).get("operationTime")
+        except OperationFailure as exc:
+            logger.warning("Live events fall back to per-worker delivery; change streams unavailable: %s", exc)
+            return False
+        self.broker.external = True
+        self._task = asyncio.create_task(self._run(started_at))
+        return True
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.broker.external = False
+
+    async def _record_pre_images(self, name: str) -> Mapping[str, Any]:
+        command = {"collMod": name, "changeStreamPreAndPostImages": {"enabled": True}}
+        try:
+            return await self.db.command(command)
+        except OperationFailure as exc:
+            if exc.code != NAMESPACE_NOT_FOUND:
+                raise
+            await self.db.create_collection(name, changeStreamPreAndPostImages={"enabled": True})
+            return await self.db.command(command)
+
+    async def _run(self, started_at: Any) -> None:
+        # Start from the collMod's operation time so writes made while the stream opens are not missed.
+        resume_after: Mapping[str, Any] | None = None
+        while True:
+            try:
+                async with self.db.watch(
+                    PIPELINE,
+                    full_document="updateLookup",
+                    full_document_before_change="whenAvailable",
+                    resume_after=resume_after,
+                    start_at_operation_time=None if resume_after else started_at,
+                ) as stream:
+                    async for change in stream:
+                        self._dispatch(change)
+                        resume_after = stream.resume_token
+            except OperationFailure as exc:
+                if exc.code != CHANGE_STREAM_HISTORY_LOST:
+                    logger.error("Change stream failed, retrying in %.0fs: %s", RETRY_SECONDS, exc)
+                    await asyncio.sleep(RETRY_SECONDS)
+                    continue
+                logger.warning("Change stream fell off the oplog; telling subscribers to refetch")
+                resume_after = started_at = None
+                self.broker.reset_all(*MODELS)
+            except PyMongoError as exc:
+                logger.error("Change stream failed, retrying in %.0fs: %s", RETRY_SECONDS, exc)
+                await asyncio.sleep(RETRY_SECONDS)
+
+    def _dispatch(self, change: Mapping[str, Any]) -> None:
+        collection = change["ns"]["coll"]
+        op = OPERATIONS[change["operationType"]]
+        document = change.get("fullDocument")
+        user_id = (document or change.get("fullDocumentBeforeChange") or {}).get("user_id")
+        if user_id is None:
+            # A delete whose pre-image predates collMod, or a document that is gone by lookup time.
+            if op == "deleted":
+                self.broker.reset_all(collection)
+            return
+        if not self.broker.watching(user_id):
+            return
+        if op == "deleted":
+            self.broker.publish(user_id, deletion(collection, str(change["documentKey"]["_id"])))
+        elif document is not None:
+            self.broker.publish(user_id, changed(op, MODELS[collection].from_document(document)))
@@ -0,0 +1,122 @@
+"""Query plan checks: ``python -m app.db.explain`` exits non-zero if a query scans or sorts in memory."""
+import asyncio
+import sys
+from datetime import timedelta
+from typing import Any, Callable, Iterator, NamedTuple
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from app.core.clock import utcnow
+from app.core.pagination import KEYSET_SORT, RANK_SORT
+from app.core.settings import get_settings
+from app.models.client import Client
+from app.models.project import Project
+
+PLACEHOLDER_USER = "explain-check"
+
+settings = get_settings()
+
+
+class Explained(NamedTuple):
+    collection: str
+    pipeline: list[dict[str, Any]]
+    # Ranked search sorts on a computed score, which no index can supply.
+    sorts_in_memory: bool = False
+
+
+def _page(collection: str, query: dict[str, Any], sort: list[tuple[str, int]]) -> Explained:
+    match = {"user_id": PLACEHOLDER_USER, **query}
+    limit = settings.default_page_size + 1
+    return Explained(collection, [{"$match": match}, {"$sort": dict(sort)}, {"$limit": limit}])
+
+
+def _search() -> Explained:
+    from app.repositories.client_repository import ClientRepository
+
+    pipeline = ClientRepository.search_pipeline(PLACEHOLDER_USER, ["acme"], ["acme"], limit=settings.default_page_size)
+    return Explained(Client.collection_name, pipeline, sorts_in_memory=True)
+
+
+def _dashboard() -> Explained:
+    from app.repositories.project_repository import ProjectRepository
+
+    now = utcnow()
+    pipeline = ProjectRepository.dashboard_pipeline(
+        PLACEHOLDER_USER, now=now, due_before=now + timedelta(days=7), top_clients=20, upcoming=10
+    )
+    # The $facet branches sort their own small, already-limited groups; only the outer plan is checked.
+    return Explained(Project.collection_name, pipeline)
+
+
+EXPLAINED_QUERIES: dict[str, Callable[[], Explained]] = {
+    "ClientRepository.list_by_user": lambda: _page(Client.collection_name, {}, KEYSET_SORT),
+    "ClientRepository.list_by_user(search=<short prefix>)": lambda: _page(
+        Client.collection_name, {"search_prefixes": {"$all": ["ac"]}}, KEYSET_SORT
+    ),
+    "ClientRepository.list_by_user(search=...)": _search,
+    "ProjectRepository.list_by_user": lambda: _page(Project.collection_name, {}, KEYSET_SORT),
+    "ProjectRepository.list_by_user(client_id=...)": lambda: _page(
+        Project.collection_name, {"client_id": "000000000000000000000000"}, KEYSET_SORT
+    ),
+    "ProjectRepository.board_column": lambda: _page(Project.collection_name, {"status": "idea"}, RANK_SORT),
+    "ProjectRepository.dashboard": _dashboard,
+}
+
+
+async def explain_aggregate(collection: AsyncIOMotorCollection, pipeline: list[dict[str, Any]]) -> dict[str, Any]:
+    return await collection.database.command(
+        {"explain": {"aggregate": collection.name, "pipeline": pipeline, "cursor": {}}, "verbosity": "queryPlanner"}
+    )
+
+
+def winning_stages(explain: Any) -> Iterator[str]:
+    """Stage names of every winning plan in an explain document (rejected plans are skipped)."""
+    if isinstance(explain, dict):
+        for key, value in explain.items():
+            if key == "rejectedPlans":
+                continue
+            if key == "stage" and isinstance(value, str):
+                yield value
+            else:
+                yield from winning_stages(value)
+    elif isinstance(explain, list):
+        for item in explain:
+            yield from winning_stages(item)
+
+
+def in_memory_sort(explain: dict[str, Any]) -> bool:
+    """A blocking ``SORT`` in the query plan, or a ``$sort`` the pipeline could not push down to it."""
+    return "SORT" in winning_stages(explain) or any("$sort" in stage for stage in explain.get("stages", []))
+
+
+async def plan(db: Any, explained: Explained) -> tuple[list[str], list[str]]:
+    """Winning stages of one query and its problems: ``COLLSCAN`` and unexpected in-memory ``SORT``."""
+    explain = await explain_aggregate(db[explained.collection], explained.pipeline)
+    stages = list(winning_stages(explain))
+    problems = []
+    if "COLLSCAN" in stages:
+        problems.append("COLLSCAN")
+    if not explained.sorts_in_memory and in_memory_sort(explain):
+        problems.append("in-memory SORT")
+    return stages, problems
+
+
+async def check(db: Any) -> dict[str, tuple[list[str], list[str]]]:
+    return {name: await plan(db, build()) for name, build in EXPLAINED_QUERIES.items()}
+
+
+async def _main() -> int:
+    from app.db.mongo import get_client, get_database
+
+    try:
+        report = await check(get_database())
+    finally:
+        get_client().close()
+    for name, (stages, problems) in report.items():
+        status = f"FAIL ({', '.join(problems)})" if problems else "ok"
+        print(f"{status:<5} {name}: {' > '.join(stages) or '(no plan)'}")
+    return 1 if any(problems for _, problems in report.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main()))
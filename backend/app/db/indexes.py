@@ -0,0 +1,164 @@
+"""
+Declared index registry.
+
+Each model lists its indexes in an ``indexes`` class attribute; ``ensure_indexes``
+applies them at startup and ``index_report`` diffs them against the live database.
+
+Run ``python -m app.db.indexes [--apply]`` to print the report from the command line.
+"""
+import asyncio
+import logging
+import sys
+from typing import Any, NamedTuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+
+from app.models.client import Client
+from app.models.project import Project
+from app.models.rate_limit import RateLimitBucket
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+INDEXED_MODELS: list[Any] = [Client, Project, User, RateLimitBucket]
+
+IndexKey = tuple[tuple[str, int], ...]
+
+
+class QueryShape(NamedTuple):
+    collection: str
+    description: str
+    equality: frozenset[str]
+    sort: IndexKey = ()
+
+
+KEYSET_SORT_KEY: IndexKey = (("created_at", -1), ("_id", -1))
+
+QUERY_SHAPES: list[QueryShape] = [
+    QueryShape(Client.collection_name, "ClientRepository.list_by_user", frozenset({"user_id"}), KEYSET_SORT_KEY),
+    QueryShape(
+        Client.collection_name,
+        "ClientRepository.list_by_user(search=...)",
+        frozenset({"user_id", "search_prefixes"}),
+    ),
+    QueryShape(
+        Client.collection_name,
+        "ClientRepository.list_by_user(search=<short prefix>)",
+        frozenset({"user_id", "search_prefixes"}),
+        KEYSET_SORT_KEY,
+    ),
+    QueryShape(Project.collection_name, "ProjectRepository.list_by_user", frozenset({"user_id"}), KEYSET_SORT_KEY),
+    QueryShape(
+        Project.collection_name,
+        "ProjectRepository.list_by_user(client_id=...)",
+        frozenset({"user_id", "client_id"}),
+        KEYSET_SORT_KEY,
+    ),
+    QueryShape(
+        Project.collection_name,
+        "ProjectRepository.board_column",
+        frozenset({"user_id", "status"}),
+        (("position", 1), ("_id", 1)),
+    ),
+    QueryShape(
+        Project.collection_name,
+        "ProjectRepository.adjacent_position",
+        frozenset({"user_id", "status"}),
+        (("position", 1), ("_id", 1)),
+    ),
+    QueryShape(Project.collection_name, "ProjectRepository.dashboard", frozenset({"user_id"})),
+    QueryShape(User.collection_name, "UserRepository.get_by_email", frozenset({"email"})),
+]
+
+
+def _key(spec: Any) -> IndexKey:
+    items = spec.items() if hasattr(spec, "items") else spec
+    return tuple((field, int(direction)) for field, direction in items)
+
+
+def _declared(model: Any) -> dict[IndexKey, dict[str, Any]]:
+    declared: dict[IndexKey, dict[str, Any]] = {}
+    for index in model.indexes:
+        document = index.document
+        declared[_key(document["key"])] = {"name": document["name"], "unique": bool(document.get("unique"))}
+    return declared
+
+
+async def _live(db: AsyncIOMotorDatabase, collection: str) -> dict[IndexKey, dict[str, Any]]:
+    live: dict[IndexKey, dict[str, Any]] = {}
+    async for index in db[collection].list_indexes():
+        live[_key(index["key"])] = {"name": index["name"], "unique": bool(index.get("unique"))}
+    return live
+
+
+def covers(index: IndexKey, shape: QueryShape) -> bool:
+    """Whether ``index`` serves ``shape`` with an equality prefix followed by the sort keys."""
+    prefix_len = len(shape.equality)
+    if len(index) < prefix_len + len(shape.sort):
+        return False
+    if {field for field, _ in index[:prefix_len]} != shape.equality:
+        return False
+    tail = index[prefix_len : prefix_len + len(shape.sort)]
+    reversed_sort = tuple((field, -direction) for field, direction in shape.sort)
+    return tail in (shape.sort, reversed_sort)
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> None:
+    """Create every declared index; existing identical indexes are left untouched."""
+    for model in INDEXED_MODELS:
+        indexes: list[IndexModel] = model.indexes
+        if not indexes:
+            continue
+        try:
+            await db[model.collection_name].create_indexes(indexes)
+        except OperationFailure as exc:
+            logger.error("Could not create indexes on %s: %s", model.collection_name, exc)
+
+
+async def index_report(db: AsyncIOMotorDatabase) -> dict[str, Any]:
+    report: dict[str, Any] = {}
+    for model in INDEXED_MODELS:
+        collection = model.collection_name
+        declared = _declared(model)
+        live = await _live(db, collection)
+        live.pop((("_id", 1),), None)
+        report[collection] = {
+            "missing": [spec["name"] for key, spec in declared.items() if key not in live],
+            "undeclared": [spec["name"] for key, spec in live.items() if key not in declared],
+            "mismatched": [
+                spec["name"]
+                for key, spec in declared.items()
+                if key in live and live[key]["unique"] != spec["unique"]
+            ],
+            "uncovered_queries": [
+                shape.description
+                for shape in QUERY_SHAPES
+                if shape.collection == collection and not any(covers(key, shape) for key in live)
+            ],
+        }
+    return report
+
+
+def report_has_drift(report: dict[str, Any]) -> bool:
+    return any(any(entries.values()) for entries in report.values())
+
+
+async def _main(apply: bool) -> int:
+    from app.db.mongo import get_client, get_database
+
+    db = get_database()
+    if apply:
+        await ensure_indexes(db)
+    report = await index_report(db)
+    for collection, entries in report.items():
+        print(f"{collection}:")
+        for label, names in entries.items():
+            print(f"  {label}: {', '.join(names) if names else '-'}")
+    get_client().close()
+    return 1 if report_has_drift(report) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(apply="--apply" in sys.argv[1:])))
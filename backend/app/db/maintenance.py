@@ -0,0 +1,66 @@
+"""
+One-off maintenance commands.
+
+Usage:
+    python -m app.db.maintenance backfill-client-search [--batch-size N]
+    python -m app.db.maintenance backfill-project-positions [--batch-size N]
+    python -m app.db.maintenance purge-orphans [--batch-size N] [--pause SECONDS] [--dry-run]
+"""
+import argparse
+import asyncio
+import sys
+
+
+async def backfill_client_search(args: argparse.Namespace) -> int:
+    from app.repositories.client_repository import ClientRepository
+
+    updated = await ClientRepository().backfill_search_fields(args.batch_size)
+    print(f"Backfilled search fields on {updated} client(s)")
+    return 0
+
+
+async def backfill_project_positions(args: argparse.Namespace) -> int:
+    from app.repositories.project_repository import ProjectRepository
+
+    updated = await ProjectRepository().backfill_positions(args.batch_size)
+    print(f"Backfilled board positions on {updated} project(s)")
+    return 0
+
+
+async def purge_orphans(args: argparse.Namespace) -> int:
+    from app.db.mongo import get_database
+    from app.db.orphans import purge_orphans as purge
+
+    purged = await purge(get_database(), args.batch_size, args.pause, args.dry_run)
+    total = sum(purged.values())
+    if args.dry_run:
+        print(f"Found {total} orphaned project(s) across {len(purged)} user(s)")
+        return 0
+    print(f"Purged {total} orphaned project(s) across {len(purged)} user(s)")
+    return 0
+
+
+COMMANDS = {
+    "backfill-client-search": backfill_client_search,
+    "backfill-project-positions": backfill_project_positions,
+    "purge-orphans": purge_orphans,
+}
+
+
+async def _main(argv: list[str]) -> int:
+    from app.db.mongo import get_client
+
+    parser = argparse.ArgumentParser(prog="python -m app.db.maintenance")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=0.05, help="seconds to sleep between purge batches")
+    parser.add_argument("--dry-run", action="store_true", help="report orphans without deleting them")
+    args = parser.parse_args(argv)
+    try:
+        return await COMMANDS[args.command](args)
+    finally:
+        get_client().close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
@@ -1,19 +1,47 @@
+import asyncio
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from typing import Any, AsyncIterator
 
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorClientSession, AsyncIOMotorDatabase
 
-from app.core.settings import get_settings
+from app.core.settings import Settings, get_settings
+from app.db.indexes import ensure_indexes
+from app.db.monitoring import command_metrics
+from app.db.pool import pool_stats
+from app.db.slow_queries import slow_queries
 
 _settings = get_settings()
 _client: AsyncIOMotorClient | None = None
+_supports_transactions: bool | None = None
+
+
+def client_options(settings: Settings) -> dict[str, Any]:
+    """Keyword options for the client; unset settings are left out so the URI's own options still apply."""
+    write_concern = settings.mongo_write_concern
+    options = {
+        "maxPoolSize": settings.mongo_max_pool_size,
+        "minPoolSize": settings.mongo_min_pool_size,
+        "maxIdleTimeMS": settings.mongo_max_idle_time_ms,
+        "waitQueueTimeoutMS": settings.mongo_wait_queue_timeout_ms,
+        "compressors": ",".join(settings.mongo_compressors) if settings.mongo_compressors else None,
+        "zlibCompressionLevel": settings.mongo_zlib_compression_level,
+        "w": int(write_concern) if write_concern is not None and write_concern.isdigit() else write_concern,
+        "journal": settings.mongo_journal,
+        "readConcernLevel": settings.mongo_read_concern,
+        "readPreference": settings.mongo_read_preference,
+    }
+    return {
+        "serverSelectionTimeoutMS": settings.mongo_server_selection_timeout_ms,
+        "event_listeners": [pool_stats, command_metrics, slow_queries],
+        **{key: value for key, value in options.items() if value is not None},
+    }
 
 
 def get_client() -> AsyncIOMotorClient:
     global _client
     if _client is None:
         try:
-            _client = AsyncIOMotorClient(_settings.mongo_uri, serverSelectionTimeoutMS=5000)
+            _client = AsyncIOMotorClient(_settings.mongo_uri, **client_options(_settings))
         except Exception as e:
             raise ConnectionError(
                 f"Failed to connect to MongoDB at {_settings.mongo_uri}. "
@@ -26,8 +54,35 @@ def get_database() -> AsyncIOMotorDatabase:
     return get_client()[_settings.mongo_db]
 
 
+async def supports_transactions() -> bool:
+    """Multi-document transactions need a replica set or a sharded cluster; a standalone server rejects them."""
+    global _supports_transactions
+    if _supports_transactions is None:
+        hello = await get_client().admin.command("hello")
+        _supports_transactions = "setName" in hello or hello.get("msg") == "isdbgrid"
+    return _supports_transactions
+
+
+@asynccontextmanager
+async def transaction() -> AsyncIterator[AsyncIOMotorClientSession | None]:
+    """
+    Yield a session inside a transaction that commits on exit and aborts on error, or ``None``
+    on deployments without transaction support, where callers must keep their writes idempotent.
+    """
+    if not await supports_transactions():
+        yield None
+        return
+    async with await get_client().start_session() as session:
+        async with session.start_transaction():
+            yield session
+
+
 @asynccontextmanager
 async def lifespan(app):  # type: ignore[reportGeneralTypeIssues]
     client = get_client()
+    slow_queries.attach(client, asyncio.get_running_loop())
+    if _settings.ensure_indexes_on_startup:
+        await ensure_indexes(get_database())
     yield
+    slow_queries.detach()
     client.close()
@@ -0,0 +1,99 @@
+"""Driver command metrics per collection and command."""
+import threading
+from typing import Any
+
+from pymongo import monitoring
+
+from app.core.metrics import Histogram, counter, histogram
+
+# Seconds; shifted one step lower than the HTTP buckets since most commands finish in a few ms.
+COMMAND_BUCKETS: tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class CommandSeries:
+    __slots__ = ("latency", "documents", "failures")
+
+    def __init__(self) -> None:
+        self.latency = Histogram(COMMAND_BUCKETS)
+        self.documents = 0
+        self.failures = 0
+
+
+def command_target(command_name: str, command: Any) -> str:
+    """The collection a command runs against, or ``""`` for database/admin commands."""
+    target = command.get("collection") if command_name == "getMore" else command.get(command_name)
+    return target if isinstance(target, str) else ""
+
+
+def document_count(reply: Any) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", ())))
+    n = reply.get("n")
+    return n if isinstance(n, int) else 0
+
+
+class CommandMetrics(monitoring.CommandListener):
+    # Listeners run on the driver's threads, so updates are serialized by a lock.
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[int, Any], tuple[str, str]] = {}
+        self.series: dict[tuple[str, str], CommandSeries] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        target = command_target(event.command_name, event.command)
+        with self._lock:
+            self._pending[(event.request_id, event.connection_id)] = (target, event.command_name)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        documents = document_count(event.reply)
+        with self._lock:
+            series = self._finish(event)
+            if series is not None:
+                series.latency.observe(event.duration_micros / 1_000_000)
+                series.documents += documents
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        with self._lock:
+            series = self._finish(event)
+            if series is not None:
+                series.latency.observe(event.duration_micros / 1_000_000)
+                series.failures += 1
+
+    def _finish(self, event: Any) -> CommandSeries | None:
+        key = self._pending.pop((event.request_id, event.connection_id), None)
+        if key is None:
+            return None
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = CommandSeries()
+        return series
+
+    def exposition(self) -> list[str]:
+        # Rendered under the lock (and not lazily) so a scrape sees one consistent set of series.
+        with self._lock:
+            labelled = [
+                ({"collection": collection, "command": command}, series)
+                for (collection, command), series in sorted(self.series.items())
+            ]
+            return [
+                *histogram(
+                    "mongodb_command_duration_seconds",
+                    "Driver command latency by collection and command.",
+                    [(labels, series.latency) for labels, series in labelled],
+                ),
+                *counter(
+                    "mongodb_command_documents_total",
+                    "Documents returned or affected by collection and command.",
+                    [(labels, series.documents) for labels, series in labelled],
+                ),
+                *counter(
+                    "mongodb_command_failures_total",
+                    "Failed commands by collection and command.",
+                    [(labels, series.failures) for labels, series in labelled],
+                ),
+            ]
+
+
+command_metrics = CommandMetrics()
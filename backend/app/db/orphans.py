@@ -0,0 +1,81 @@
+"""Orphaned project sweeper, for servers where client deletes cannot cascade in a transaction."""
+import asyncio
+import logging
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import PyMongoError
+
+from app.core.events import EventBroker, reset
+from app.core.settings import get_settings
+from app.db.mongo import supports_transactions
+from app.models.project import Project
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.version_repository import VersionRepository
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+BATCH_SIZE = 500
+PAUSE_SECONDS = 0.05
+
+
+async def purge_orphans(
+    db: AsyncIOMotorDatabase,
+    batch_size: int = BATCH_SIZE,
+    pause: float = PAUSE_SECONDS,
+    dry_run: bool = False,
+) -> dict[str, int]:
+    """Delete orphaned projects and bump their owners' list versions; returns the count per user."""
+    purged = await ProjectRepository(db).purge_orphans(batch_size, pause, dry_run)
+    if not dry_run:
+        versions = VersionRepository(db)
+        for user_id in purged:
+            await versions.bump(user_id, Project.collection_name)
+    return purged
+
+
+class OrphanSweeper:
+    def __init__(self, db: AsyncIOMotorDatabase, broker: EventBroker) -> None:
+        self.db = db
+        self.broker = broker
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> bool:
+        """Start sweeping if the deployment can leave orphans; returns whether the sweeper is running."""
+        if settings.orphan_sweep_interval_seconds <= 0:
+            return False
+        try:
+            if await supports_transactions():
+                return False
+        except PyMongoError as exc:
+            logger.warning("Orphan sweeper not started; could not probe the deployment: %s", exc)
+            return False
+        self._task = asyncio.create_task(self._run())
+        return True
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.orphan_sweep_interval_seconds)
+            await self.sweep()
+
+    async def sweep(self) -> dict[str, int]:
+        try:
+            purged = await purge_orphans(self.db)
+        except PyMongoError as exc:
+            logger.error("Orphan sweep failed, retrying next interval: %s", exc)
+            return {}
+        for user_id in purged:
+            self.broker.notify(user_id, reset(Project.collection_name))
+        if purged:
+            logger.info("Purged %d orphaned project(s) across %d user(s)", sum(purged.values()), len(purged))
+        return purged
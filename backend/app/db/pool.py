@@ -0,0 +1,104 @@
+"""Connection pool statistics; a checkout waits when it queues behind ``maxPoolSize``."""
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from pymongo import monitoring
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    # pymongo calls listeners from whichever thread touches the pool, so all state sits behind a lock.
+
+    def __init__(self, window_seconds: float = 60.0) -> None:
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._max_size: dict[Any, int] = {}
+        self._open: dict[Any, int] = {}
+        self._checked_out: dict[Any, int] = {}
+        self._waiting: dict[Any, int] = {}
+        self._recent_waits: deque[float] = deque()
+        self.checkouts = 0
+        self.waits = 0
+        self.failures = 0
+        self.checkout_seconds = 0.0
+        self.max_checkout_seconds = 0.0
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        with self._lock:
+            self._max_size[event.address] = event.options.get("maxPoolSize", 100)
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        pass
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        with self._lock:
+            for state in (self._max_size, self._open, self._checked_out, self._waiting):
+                state.pop(event.address, None)
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        with self._lock:
+            self._open[event.address] = self._open.get(event.address, 0) + 1
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        with self._lock:
+            self._open[event.address] = max(self._open.get(event.address, 0) - 1, 0)
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        with self._lock:
+            address = event.address
+            max_size = self._max_size.get(address, 0)
+            if max_size and self._checked_out.get(address, 0) >= max_size:
+                self.waits += 1
+                self._recent_waits.append(time.monotonic())
+            self._waiting[address] = self._waiting.get(address, 0) + 1
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        with self._lock:
+            self.failures += 1
+            self._dequeue(event.address, event.duration)
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self._checked_out[event.address] = self._checked_out.get(event.address, 0) + 1
+            self._dequeue(event.address, event.duration)
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        with self._lock:
+            self._checked_out[event.address] = max(self._checked_out.get(event.address, 0) - 1, 0)
+
+    def _dequeue(self, address: Any, duration: float | None) -> None:
+        self._waiting[address] = max(self._waiting.get(address, 0) - 1, 0)
+        if duration is not None:
+            self.checkout_seconds += duration
+            self.max_checkout_seconds = max(self.max_checkout_seconds, duration)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Totals across every server this process has a pool for."""
+        with self._lock:
+            cutoff = time.monotonic() - self.window_seconds
+            while self._recent_waits and self._recent_waits[0] < cutoff:
+                self._recent_waits.popleft()
+            return {
+                "servers": len(self._max_size),
+                "max_pool_size": max(self._max_size.values(), default=0),
+                "open": sum(self._open.values()),
+                "checked_out": sum(self._checked_out.values()),
+                "wait_queue": sum(self._waiting.values()),
+                "checkouts": self.checkouts,
+                "checkout_failures": self.failures,
+                "waits": self.waits,
+                "waits_per_second": round(len(self._recent_waits) / self.window_seconds, 3),
+                "mean_checkout_ms": round(self.checkout_seconds / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_checkout_ms": round(self.max_checkout_seconds * 1000, 3),
+            }
+
+
+pool_stats = PoolStats()
@@ -0,0 +1,206 @@
+"""Slow query log: redacted shapes of slow commands, kept per worker and explained now and then."""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Mapping
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+from app.core.clock import utcnow
+from app.core.serialization import dumps
+from app.core.settings import get_settings
+from app.db.explain import winning_stages
+from app.db.monitoring import command_target, document_count
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Parts of each explainable command that describe the query; everything else is driver plumbing.
+SHAPE_FIELDS: dict[str, tuple[str, ...]] = {
+    "find": ("filter", "sort", "projection", "hint", "limit"),
+    "aggregate": ("pipeline", "hint"),
+    "count": ("query", "hint"),
+    "distinct": ("key", "query"),
+    "findAndModify": ("query", "sort"),
+    "update": ("updates",),
+    "delete": ("deletes",),
+}
+# Values under these keys are structure (field names, directions, page sizes), not user data.
+KEPT_VERBATIM = frozenset(
+    {"sort", "projection", "hint", "limit", "key", "$sort", "$project", "$limit", "$skip", "$unset"}
+)
+# Session and transaction fields the driver adds; explain rejects some of them.
+DRIVER_FIELDS = frozenset({"lsid", "txnNumber", "autocommit", "startTransaction", "readConcern", "writeConcern"})
+REDACTED = "?"
+
+
+def redact(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {key: item if key in KEPT_VERBATIM else redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if all(not isinstance(item, (Mapping, list, tuple)) for item in value):
+            return [REDACTED] if value else []
+        return [redact(item) for item in value]
+    return REDACTED
+
+
+def query_shape(command_name: str, command: Mapping[str, Any]) -> dict[str, Any]:
+    return {
+        field: command[field] if field in KEPT_VERBATIM else redact(command[field])
+        for field in SHAPE_FIELDS[command_name]
+        if field in command
+    }
+
+
+def plan_summary(explain: Mapping[str, Any]) -> dict[str, Any]:
+    stages = list(dict.fromkeys(winning_stages(explain.get("queryPlanner", explain))))
+    pipeline = explain.get("stages") or []
+    stats = _find(explain, "executionStats") or {}
+    return {
+        "stages": stages,
+        "collscan": "COLLSCAN" in stages,
+        "in_memory_sort": "SORT" in stages or any("$sort" in stage for stage in pipeline),
+        "docs_examined": stats.get("totalDocsExamined"),
+        "keys_examined": stats.get("totalKeysExamined"),
+        "returned": stats.get("nReturned"),
+        "execution_ms": stats.get("executionTimeMillis"),
+    }
+
+
+def _find(value: Any, key: str) -> Any:
+    """First value stored under ``key`` anywhere in a nested explain document."""
+    if isinstance(value, Mapping):
+        if key in value:
+            return value[key]
+        value = list(value.values())
+    if isinstance(value, list):
+        for item in value:
+            found = _find(item, key)
+            if found is not None:
+                return found
+    return None
+
+
+class SlowQueryRecorder(monitoring.CommandListener):
+    # Driver callbacks arrive on its threads; explains are scheduled onto the app's event loop.
+
+    def __init__(self, threshold_ms: float, size: int, explain_interval_seconds: float) -> None:
+        self.threshold_micros = threshold_ms * 1000
+        self.explain_interval_seconds = explain_interval_seconds
+        self.entries: deque[dict[str, Any]] = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[int, Any], tuple[str, Mapping[str, Any]]] = {}
+        self._explained_at: dict[str, float] = {}
+        self._client: AsyncIOMotorClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def attach(self, client: AsyncIOMotorClient, loop: asyncio.AbstractEventLoop) -> None:
+        """Enable explain capture; call from the app's event loop at startup."""
+        self._client = client
+        self._loop = loop
+
+    def detach(self) -> None:
+        self._client = None
+        self._loop = None
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name in SHAPE_FIELDS:
+            with self._lock:
+                self._pending[(event.request_id, event.connection_id)] = (event.database_name, event.command)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        started = self._pop(event)
+        if started is not None and event.duration_micros >= self.threshold_micros:
+            self._record(event, *started, document_count(event.reply), None)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        started = self._pop(event)
+        if started is not None and event.duration_micros >= self.threshold_micros:
+            self._record(event, *started, 0, str(event.failure.get("errmsg", "")))
+
+    def recent(self, limit: int | None = None) -> list[dict[str, Any]]:
+        with self._lock:
+            entries = list(reversed(self.entries))
+        return entries[:limit] if limit else entries
+
+    def _pop(self, event: Any) -> tuple[str, Mapping[str, Any]] | None:
+        with self._lock:
+            return self._pending.pop((event.request_id, event.connection_id), None)
+
+    def _record(
+        self,
+        event: Any,
+        database: str,
+        command: Mapping[str, Any],
+        documents: int,
+        error: str | None,
+    ) -> None:
+        shape = query_shape(event.command_name, command)
+        entry = {
+            "at": utcnow(),
+            "database": database,
+            "collection": command_target(event.command_name, command),
+            "command": event.command_name,
+            "shape": shape,
+            "duration_ms": round(event.duration_micros / 1000, 3),
+            "documents": documents,
+            "error": error,
+            "plan": None,
+        }
+        key = dumps([entry["collection"], entry["command"], shape]).decode()
+        with self._lock:
+            self.entries.append(entry)
+            explain = self._should_explain(key)
+        logger.warning(
+            "Slow %s on %s: %.1f ms, %d document(s), shape %s",
+            entry["command"],
+            entry["collection"],
+            entry["duration_ms"],
+            documents,
+            key,
+        )
+        if explain and self._loop is not None and self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._explain(entry, command), self._loop)
+
+    def _should_explain(self, key: str) -> bool:
+        if self.explain_interval_seconds <= 0:
+            return False
+        now = time.monotonic()
+        last = self._explained_at.get(key)
+        if last is not None and now - last < self.explain_interval_seconds:
+            return False
+        if len(self._explained_at) >= 1000:
+            self._explained_at.clear()
+        self._explained_at[key] = now
+        return True
+
+    async def _explain(self, entry: dict[str, Any], command: Mapping[str, Any]) -> None:
+        client = self._client
+        if client is None:
+            return
+        explained = {key: value for key, value in command.items() if key not in DRIVER_FIELDS and key[0] != "$"}
+        try:
+            result = await client[entry["database"]].command({"explain": explained, "verbosity": "executionStats"})
+        except Exception as exc:
+            logger.info("Could not explain slow %s on %s: %s", entry["command"], entry["collection"], exc)
+            return
+        entry["plan"] = plan = plan_summary(result)
+        if plan["collscan"] or plan["in_memory_sort"]:
+            logger.warning(
+                "Slow %s on %s plans %s (docs examined %s, returned %s)",
+                entry["command"],
+                entry["collection"],
+                " > ".join(plan["stages"]),
+                plan["docs_examined"],
+                plan["returned"],
+            )
+
+
+slow_queries = SlowQueryRecorder(
+    settings.slow_query_threshold_ms,
+    settings.slow_query_log_size,
+    settings.slow_query_explain_interval_seconds,
+)
@@ -1,13 +1,42 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.container import Container
+from app.core.compression import CompressionMiddleware
+from app.core.metrics import MetricsMiddleware
+from app.core.security import password_hasher
+from app.core.serialization import JSONResponse
 from app.core.settings import get_settings
-from app.db.mongo import lifespan
+from app.db.change_streams import ChangeStreamFeed
+from app.db.mongo import get_database
+from app.db.mongo import lifespan as database_lifespan
+from app.db.orphans import OrphanSweeper
 from app.routes import api_router
 
 settings = get_settings()
 
-app = FastAPI(title=settings.app_name, lifespan=lifespan)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    async with database_lifespan(app):
+        container = app.state.container = Container(get_database())
+        feed = ChangeStreamFeed(get_database(), container.events)
+        await feed.start()
+        sweeper = OrphanSweeper(get_database(), container.events)
+        await sweeper.start()
+        try:
+            yield
+        finally:
+            await sweeper.stop()
+            await feed.stop()
+            container.events.close()
+            password_hasher.shutdown()
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan, default_response_class=JSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,6 +45,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
+# Added last so it wraps everything else and times the whole request.
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(api_router, prefix="/api")
 
@@ -2,21 +2,49 @@ from datetime import datetime
 from typing import Any
 
 from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from app.core.clock import timestamps, utcnow
+from app.core.search import search_document
 
 
 class Client:
     collection_name = "clients"
+    indexes = [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="user_created"),
+        IndexModel(
+            [("user_id", ASCENDING), ("search_prefixes", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="user_search_created",
+        ),
+    ]
+
+    __slots__ = ("id", "user_id", "name", "email", "phone", "company", "notes", "created_at", "updated_at")
+
+    id: str
+    user_id: str
+    name: str
+    email: str | None
+    phone: str | None
+    company: str | None
+    notes: str | None
+    created_at: datetime
+    updated_at: datetime
 
-    def __init__(self, data: dict[str, Any]):
-        self.id: str = str(data.get("_id")) if data.get("_id") else data.get("id")
-        self.user_id: str = data["user_id"]
-        self.name: str = data["name"]
-        self.email: str | None = data.get("email")
-        self.phone: str | None = data.get("phone")
-        self.company: str | None = data.get("company")
-        self.notes: str | None = data.get("notes")
-        self.created_at: datetime = data.get("created_at", datetime.utcnow())
-        self.updated_at: datetime = data.get("updated_at", datetime.utcnow())
+    @classmethod
+    def from_document(cls, data: dict[str, Any]) -> "Client":
+        """Build from a (possibly projected) Mongo document; fields left out of the projection load as None."""
+        self = cls.__new__(cls)
+        get = data.get
+        object_id = get("_id")
+        self.id = str(object_id) if object_id is not None else get("id")
+        self.user_id = get("user_id")
+        self.name = get("name")
+        self.email = get("email")
+        self.phone = get("phone")
+        self.company = get("company")
+        self.notes = get("notes")
+        self.created_at, self.updated_at = timestamps(data)
+        return self
 
     @staticmethod
     def to_document(
@@ -27,8 +55,9 @@ class Client:
         phone: str | None = None,
         company: str | None = None,
         notes: str | None = None,
+        now: datetime | None = None,
     ) -> dict[str, Any]:
-        now = datetime.utcnow()
+        now = now or utcnow()
         return {
             "user_id": user_id,
             "name": name,
@@ -38,6 +67,7 @@ class Client:
             "notes": notes,
             "created_at": now,
             "updated_at": now,
+            **search_document(name, email, company),
         }
 
     @staticmethod
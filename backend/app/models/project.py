@@ -2,23 +2,70 @@ from datetime import datetime
 from typing import Any
 
 from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from app.core.clock import timestamps, utcnow
+from app.core.ranking import initial_rank
 
 
 class Project:
     collection_name = "projects"
     STATUS_CHOICES = ["idea", "talks", "in-progress", "review", "completed"]
+    indexes = [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="user_created"),
+        IndexModel(
+            [("user_id", ASCENDING), ("client_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="user_client_created",
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("status", ASCENDING), ("position", ASCENDING), ("_id", ASCENDING)],
+            name="user_status_position",
+        ),
+    ]
+
+    __slots__ = (
+        "id",
+        "user_id",
+        "client_id",
+        "title",
+        "description",
+        "status",
+        "hourly_rate",
+        "deadline",
+        "position",
+        "created_at",
+        "updated_at",
+    )
+
+    id: str
+    user_id: str
+    client_id: str
+    title: str
+    description: str | None
+    status: str
+    hourly_rate: float | None
+    deadline: datetime | None
+    position: str | None
+    created_at: datetime
+    updated_at: datetime
 
-    def __init__(self, data: dict[str, Any]):
-        self.id: str = str(data.get("_id")) if data.get("_id") else data.get("id")
-        self.user_id: str = data["user_id"]
-        self.client_id: str = data["client_id"]
-        self.title: str = data["title"]
-        self.description: str | None = data.get("description")
-        self.status: str = data.get("status", "idea")
-        self.hourly_rate: float | None = data.get("hourly_rate")
-        self.deadline: datetime | None = data.get("deadline")
-        self.created_at: datetime = data.get("created_at", datetime.utcnow())
-        self.updated_at: datetime = data.get("updated_at", datetime.utcnow())
+    @classmethod
+    def from_document(cls, data: dict[str, Any]) -> "Project":
+        """Build from a (possibly projected) Mongo document; fields left out of the projection load as None."""
+        self = cls.__new__(cls)
+        get = data.get
+        object_id = get("_id")
+        self.id = str(object_id) if object_id is not None else get("id")
+        self.user_id = get("user_id")
+        self.client_id = get("client_id")
+        self.title = get("title")
+        self.description = get("description")
+        self.status = get("status", "idea")
+        self.hourly_rate = get("hourly_rate")
+        self.deadline = get("deadline")
+        self.position = get("position")
+        self.created_at, self.updated_at = timestamps(data)
+        return self
 
     @staticmethod
     def to_document(
@@ -30,9 +77,12 @@ class Project:
         status: str = "idea",
         hourly_rate: float | None = None,
         deadline: datetime | None = None,
+        now: datetime | None = None,
     ) -> dict[str, Any]:
-        now = datetime.utcnow()
+        now = now or utcnow()
+        object_id = ObjectId()
         return {
+            "_id": object_id,
             "user_id": user_id,
             "client_id": client_id,
             "title": title,
@@ -40,6 +90,7 @@ class Project:
             "status": status,
             "hourly_rate": hourly_rate,
             "deadline": deadline,
+            "position": initial_rank(now, object_id),
             "created_at": now,
             "updated_at": now,
         }
@@ -0,0 +1,12 @@
+from pymongo import IndexModel
+
+
+class RateLimitBucket:
+    """Shared token buckets, one document per key: ``tokens``, ``updated_at`` and ``expires_at``.
+
+    ``expires_at`` is when the bucket would be full again; the TTL index then removes it, since
+    a missing bucket counts as full.
+    """
+
+    collection_name = "rate_limits"
+    indexes = [IndexModel([("expires_at", 1)], name="expires_at_ttl", expireAfterSeconds=0)]
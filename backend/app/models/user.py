@@ -2,18 +2,36 @@ from datetime import datetime
 from typing import Any
 
 from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
+
+from app.core.clock import timestamps, utcnow
 
 
 class User:
     collection_name = "users"
+    indexes = [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ]
+
+    __slots__ = ("id", "email", "full_name", "password_hash", "created_at", "updated_at")
+
+    id: str
+    email: str
+    full_name: str | None
+    password_hash: str
+    created_at: datetime
+    updated_at: datetime
 
-    def __init__(self, data: dict[str, Any]):
-        self.id: str = str(data.get("_id")) if data.get("_id") else data.get("id")
-        self.email: str = data["email"]
-        self.full_name: str | None = data.get("full_name")
-        self.password_hash: str = data["password_hash"]
-        self.created_at: datetime = data.get("created_at", datetime.utcnow())
-        self.updated_at: datetime = data.get("updated_at", datetime.utcnow())
+    @classmethod
+    def from_document(cls, data: dict[str, Any]) -> "User":
+        self = cls.__new__(cls)
+        object_id = data.get("_id")
+        self.id = str(object_id) if object_id is not None else data.get("id")
+        self.email = data["email"]
+        self.full_name = data.get("full_name")
+        self.password_hash = data["password_hash"]
+        self.created_at, self.updated_at = timestamps(data)
+        return self
 
     @staticmethod
     def to_document(
@@ -21,8 +39,9 @@ class User:
         email: str,
         password_hash: str,
         full_name: str | None = None,
+        now: datetime | None = None,
     ) -> dict[str, Any]:
-        now = datetime.utcnow()
+        now = now or utcnow()
         return {
             "email": email,
             "full_name": full_name,
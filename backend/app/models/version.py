@@ -0,0 +1,29 @@
+from typing import Any
+
+from pymongo import IndexModel
+
+
+class CollectionVersion:
+    """Per-user write counters, one document per user keyed by ``user_id``.
+
+    Each tracked collection gets a ``<collection>`` counter, incremented with every write to
+    that user's documents in the collection.
+    """
+
+    collection_name = "collection_versions"
+    indexes: list[IndexModel] = []
+
+    __slots__ = ("user_id", "counters")
+
+    user_id: str
+    counters: dict[str, int]
+
+    @classmethod
+    def from_document(cls, data: dict[str, Any]) -> "CollectionVersion":
+        self = cls.__new__(cls)
+        self.user_id = data["_id"]
+        self.counters = {key: value for key, value in data.items() if isinstance(value, int) and key != "_id"}
+        return self
+
+    def version(self, collection: str) -> int:
+        return self.counters.get(collection, 0)
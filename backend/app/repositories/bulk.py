@@ -0,0 +1,59 @@
+from typing import Any, Iterable, NamedTuple, Sequence
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorCollection
+from pymongo.errors import BulkWriteError
+
+
+class BulkWriteOutcome(NamedTuple):
+    errors: dict[int, str]  # write errors by position
+    matched: int  # updates whose filter matched a document
+
+
+def _write_errors(exc: BulkWriteError) -> dict[int, str]:
+    return {error["index"]: error.get("errmsg", "Write failed") for error in exc.details.get("writeErrors", [])}
+
+
+async def insert_many_unordered(collection: AsyncIOMotorCollection, documents: list[dict[str, Any]]) -> dict[int, str]:
+    """Insert with ordered=False; ``_id`` is set on each document and failures are returned by position."""
+    if not documents:
+        return {}
+    try:
+        await collection.insert_many(documents, ordered=False)
+    except BulkWriteError as exc:
+        return _write_errors(exc)
+    return {}
+
+
+async def bulk_write_unordered(
+    collection: AsyncIOMotorCollection,
+    operations: Sequence[Any],
+    session: AsyncIOMotorClientSession | None = None,
+) -> BulkWriteOutcome:
+    """
+    Write with ordered=False. The server only counts matched updates for the whole batch, so callers
+    compare ``matched`` with the updates they sent to spot filters that matched nothing.
+    """
+    if not operations:
+        return BulkWriteOutcome({}, 0)
+    try:
+        result = await collection.bulk_write(list(operations), ordered=False, session=session)
+    except BulkWriteError as exc:
+        return BulkWriteOutcome(_write_errors(exc), exc.details.get("nMatched", 0))
+    return BulkWriteOutcome({}, result.matched_count)
+
+
+async def find_owned(
+    collection: AsyncIOMotorCollection,
+    ids: Iterable[ObjectId],
+    user_id: str,
+    fields: Iterable[str] | None = (),
+    session: AsyncIOMotorClientSession | None = None,
+) -> dict[ObjectId, dict[str, Any]]:
+    """Fetch the subset of ``ids`` owned by ``user_id`` in one ``$in`` query; ``fields=None`` loads whole documents."""
+    unique_ids = list(dict.fromkeys(ids))
+    if not unique_ids:
+        return {}
+    projection = None if fields is None else ({field: 1 for field in fields} or {"_id": 1})
+    cursor = collection.find({"_id": {"$in": unique_ids}, "user_id": user_id}, projection, session=session)
+    return {doc["_id"]: doc async for doc in cursor}
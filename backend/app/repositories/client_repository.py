@@ -1,54 +1,247 @@
-from typing import Any
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterable, Sequence
 
-from motor.motor_asyncio import AsyncIOMotorCollection
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import ReturnDocument, UpdateOne
 
+from app.core.clock import utcnow
+from app.core.fields import projection
+from app.core.pagination import KEYSET_SORT, fetch_page, keyset_filter
+from app.core.search import SEARCH_FIELDS, is_ranked, parse_query, score_expression, search_document
 from app.db.mongo import get_database
 from app.models.client import Client
+from app.repositories.bulk import BulkWriteOutcome, bulk_write_unordered, find_owned, insert_many_unordered
+
+SEARCH_SOURCE_FIELDS = ("name", "email", "company")
+HIDDEN_FIELDS = {field: 0 for field in SEARCH_FIELDS}
+UPDATE_ATTEMPTS = 3
 
 
 class ClientRepository:
-    def __init__(self) -> None:
-        db = get_database()
+    def __init__(self, db: AsyncIOMotorDatabase | None = None) -> None:
+        db = db if db is not None else get_database()
         self.collection: AsyncIOMotorCollection = db[Client.collection_name]
 
     async def insert(self, document: dict[str, Any]) -> Client:
         result = await self.collection.insert_one(document)
         document["_id"] = result.inserted_id
-        return Client(document)
+        return Client.from_document(document)
+
+    async def insert_many(self, documents: list[dict[str, Any]]) -> dict[int, str]:
+        return await insert_many_unordered(self.collection, documents)
+
+    async def find_owned(
+        self,
+        ids: Iterable[ObjectId],
+        user_id: str,
+        fields: Iterable[str] | None = (),
+        session: AsyncIOMotorClientSession | None = None,
+    ) -> dict[ObjectId, dict[str, Any]]:
+        return await find_owned(self.collection, ids, user_id, fields, session)
 
-    async def get_by_id(self, client_id: str, user_id: str) -> Client | None:
+    async def bulk_write(
+        self,
+        operations: Sequence[Any],
+        session: AsyncIOMotorClientSession | None = None,
+    ) -> BulkWriteOutcome:
+        return await bulk_write_unordered(self.collection, operations, session)
+
+    async def get_by_id(
+        self,
+        client_id: str,
+        user_id: str,
+        fields: Iterable[str] | None = None,
+    ) -> Client | None:
         from bson import ObjectId
 
-        doc = await self.collection.find_one({"_id": ObjectId(client_id), "user_id": user_id})
-        return Client(doc) if doc else None
+        selected = HIDDEN_FIELDS if fields is None else projection(fields, ("user_id", "updated_at"))
+        doc = await self.collection.find_one({"_id": ObjectId(client_id), "user_id": user_id}, selected)
+        return Client.from_document(doc) if doc else None
 
-    async def list_by_user(self, user_id: str, search: str | None = None) -> list[Client]:
+    async def list_by_user(
+        self,
+        user_id: str,
+        search: str | None = None,
+        *,
+        limit: int,
+        cursor: str | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> tuple[list[Client], str | None]:
+        """List a page of clients; ``fields`` narrows the projection (sort keys are always loaded)."""
         query: dict[str, Any] = {"user_id": user_id}
         if search:
-            query["$or"] = [
-                {"name": {"$regex": search, "$options": "i"}},
-                {"email": {"$regex": search, "$options": "i"}},
-                {"company": {"$regex": search, "$options": "i"}},
-            ]
-        cursor = self.collection.find(query).sort("created_at", -1)
-        docs = await cursor.to_list(length=None)
-        return [Client(doc) for doc in docs]
-
-    async def update(self, client_id: str, user_id: str, update_data: dict[str, Any]) -> Client | None:
+            keys, terms = parse_query(search)
+            if not keys:
+                return [], None
+            if is_ranked(keys):
+                return await self._search(user_id, keys, terms, limit=limit, cursor=cursor, fields=fields)
+            # Too short to rank cheaply: newest first, straight off the ``user_search_created`` index.
+            query["search_prefixes"] = {"$all": keys}
+        query.update(keyset_filter(cursor))
+        selected = HIDDEN_FIELDS if fields is None else projection(fields, ("user_id", "created_at"))
+        find = self.collection.find(query, selected).sort(KEYSET_SORT).limit(limit + 1)
+        docs, next_cursor = await fetch_page(find, limit)
+        return [Client.from_document(doc) for doc in docs], next_cursor
+
+    async def _search(
+        self,
+        user_id: str,
+        keys: list[str],
+        terms: list[str],
+        *,
+        limit: int,
+        cursor: str | None,
+        fields: Iterable[str] | None,
+    ) -> tuple[list[Client], str | None]:
+        pipeline = self.search_pipeline(user_id, keys, terms, limit=limit, cursor=cursor, fields=fields)
+        docs, next_cursor = await fetch_page(self.collection.aggregate(pipeline), limit, score_field="_score")
+        return [Client.from_document(doc) for doc in docs], next_cursor
+
+    @staticmethod
+    def search_pipeline(
+        user_id: str,
+        keys: list[str],
+        terms: list[str],
+        *,
+        limit: int,
+        cursor: str | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        pipeline: list[dict[str, Any]] = [
+            {"$match": {"user_id": user_id, "search_prefixes": {"$all": keys}}},
+            {"$addFields": {"_score": score_expression(terms)}},
+        ]
+        after = keyset_filter(cursor, score_field="_score")
+        if after:
+            pipeline.append({"$match": after})
+        pipeline += [
+            {"$sort": {"_score": -1, "created_at": -1, "_id": -1}},
+            {"$limit": limit + 1},
+            {"$unset": list(SEARCH_FIELDS)}
+            if fields is None
+            else {"$project": projection(fields, ("user_id", "created_at", "_score"))},
+        ]
+        return pipeline
+
+    async def stream_by_user(self, user_id: str, *, batch_size: int) -> AsyncIterator[dict[str, Any]]:
+        cursor = self.collection.find({"user_id": user_id}, HIDDEN_FIELDS, batch_size=batch_size).sort(KEYSET_SORT)
+        async for doc in cursor:
+            yield doc
+
+    async def references(self, user_id: str) -> list[dict[str, Any]]:
+        """``_id``, ``name`` and ``email`` of every client the user has, for resolving imported references."""
+        return await self.collection.find({"user_id": user_id}, {"name": 1, "email": 1}).to_list(None)
+
+    async def update(
+        self,
+        client_id: str,
+        user_id: str,
+        update_data: dict[str, Any],
+        expected_updated_at: datetime | None = None,
+    ) -> Client | None:
+        """
+        Apply ``update_data`` in one write, search fields included; returns None if missing or
+        ``expected_updated_at`` is stale. When only some of name/email/company change, the others are
+        read first and the write is pinned to the ``updated_at`` seen, retrying if another write lands
+        in between.
+        """
         from bson import ObjectId
 
-        update_data["updated_at"] = Client.to_document(user_id="", name="")["updated_at"]
-        result = await self.collection.update_one(
-            {"_id": ObjectId(client_id), "user_id": user_id},
-            {"$set": update_data},
+        object_id = ObjectId(client_id)
+        missing = [field for field in SEARCH_SOURCE_FIELDS if field not in update_data]
+        if len(missing) == len(SEARCH_SOURCE_FIELDS):
+            missing = []
+        for _ in range(UPDATE_ATTEMPTS):
+            current: dict[str, Any] = {}
+            pinned = expected_updated_at
+            if missing:
+                current = await self.collection.find_one(
+                    {"_id": object_id, "user_id": user_id}, {field: 1 for field in (*missing, "updated_at")}
+                )
+                if not current or (expected_updated_at is not None and current["updated_at"] != expected_updated_at):
+                    return None
+                pinned = current["updated_at"]
+            doc = await self.collection.find_one_and_update(
+                *self._update_spec(object_id, user_id, update_data, current, pinned),
+                projection=HIDDEN_FIELDS,
+                return_document=ReturnDocument.AFTER,
+            )
+            if doc or not missing or expected_updated_at is not None:
+                return Client.from_document(doc) if doc else None
+        return None
+
+    @staticmethod
+    def _update_spec(
+        object_id: ObjectId,
+        user_id: str,
+        update_data: dict[str, Any],
+        current: dict[str, Any],
+        expected_updated_at: datetime | None = None,
+        now: datetime | None = None,
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        query: dict[str, Any] = {"_id": object_id, "user_id": user_id}
+        if expected_updated_at is not None:
+            query["updated_at"] = expected_updated_at
+        update_data = {"updated_at": now or utcnow(), **update_data}
+        if any(field in update_data for field in SEARCH_SOURCE_FIELDS):
+            merged = {field: update_data.get(field, current.get(field)) for field in SEARCH_SOURCE_FIELDS}
+            update_data.update(search_document(merged["name"], merged["email"], merged["company"]))
+        return query, {"$set": update_data}
+
+    @staticmethod
+    def update_operation(
+        object_id: ObjectId,
+        user_id: str,
+        update_data: dict[str, Any],
+        current: dict[str, Any],
+        expected_updated_at: datetime | None = None,
+        now: datetime | None = None,
+    ) -> UpdateOne:
+        """Build a bulk ``UpdateOne``; ``current`` must hold the stored name/email/company."""
+        return UpdateOne(
+            *ClientRepository._update_spec(object_id, user_id, update_data, current, expected_updated_at, now)
         )
-        if result.modified_count == 0:
-            return None
-        return await self.get_by_id(client_id, user_id)
 
-    async def delete(self, client_id: str, user_id: str) -> bool:
+    async def get_updated_at(self, client_id: str, user_id: str) -> datetime | None:
         from bson import ObjectId
 
-        result = await self.collection.delete_one({"_id": ObjectId(client_id), "user_id": user_id})
+        doc = await self.collection.find_one({"_id": ObjectId(client_id), "user_id": user_id}, {"updated_at": 1})
+        return doc["updated_at"] if doc else None
+
+    async def exists(self, client_id: str, user_id: str) -> bool:
+        from bson import ObjectId
+
+        doc = await self.collection.find_one({"_id": ObjectId(client_id), "user_id": user_id}, {"_id": 1})
+        return doc is not None
+
+    async def delete(self, client_id: str, user_id: str, session: AsyncIOMotorClientSession | None = None) -> bool:
+        from bson import ObjectId
+
+        result = await self.collection.delete_one({"_id": ObjectId(client_id), "user_id": user_id}, session=session)
         return result.deleted_count > 0
 
+    async def delete_by_user(self, user_id: str, session: AsyncIOMotorClientSession | None = None) -> int:
+        result = await self.collection.delete_many({"user_id": user_id}, session=session)
+        return result.deleted_count
+
+    async def backfill_search_fields(self, batch_size: int) -> int:
+        """Populate search fields on documents written before they existed; returns the number updated."""
+        updated = 0
+        cursor = self.collection.find(
+            {"search_prefixes": {"$exists": False}},
+            {field: 1 for field in SEARCH_SOURCE_FIELDS},
+            batch_size=batch_size,
+        )
+        operations: list[UpdateOne] = []
+        async for doc in cursor:
+            fields = search_document(doc.get("name"), doc.get("email"), doc.get("company"))
+            operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": fields}))
+            if len(operations) >= batch_size:
+                await self.collection.bulk_write(operations, ordered=False)
+                updated += len(operations)
+                operations = []
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+            updated += len(operations)
+        return updated
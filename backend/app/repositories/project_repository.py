@@ -1,57 +1,267 @@
-from typing import Any
+import asyncio
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterable, Sequence
 
-from motor.motor_asyncio import AsyncIOMotorCollection
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import ReturnDocument, UpdateOne
 
+from app.core.clock import utcnow
+from app.core.fields import projection
+from app.core.pagination import KEYSET_SORT, RANK_SORT, fetch_page, fetch_rank_page, keyset_filter, rank_filter
+from app.core.ranking import initial_rank
 from app.db.mongo import get_database
+from app.models.client import Client
 from app.models.project import Project
+from app.repositories.bulk import BulkWriteOutcome, bulk_write_unordered, find_owned, insert_many_unordered
 
 
 class ProjectRepository:
-    def __init__(self) -> None:
-        db = get_database()
+    def __init__(self, db: AsyncIOMotorDatabase | None = None) -> None:
+        db = db if db is not None else get_database()
         self.collection: AsyncIOMotorCollection = db[Project.collection_name]
+        self.clients: AsyncIOMotorCollection = db[Client.collection_name]
 
     async def insert(self, document: dict[str, Any]) -> Project:
         result = await self.collection.insert_one(document)
         document["_id"] = result.inserted_id
-        return Project(document)
+        return Project.from_document(document)
 
-    async def get_by_id(self, project_id: str, user_id: str) -> Project | None:
+    async def insert_many(self, documents: list[dict[str, Any]]) -> dict[int, str]:
+        return await insert_many_unordered(self.collection, documents)
+
+    async def find_owned(
+        self,
+        ids: Iterable[ObjectId],
+        user_id: str,
+        fields: Iterable[str] | None = (),
+        session: AsyncIOMotorClientSession | None = None,
+    ) -> dict[ObjectId, dict[str, Any]]:
+        return await find_owned(self.collection, ids, user_id, fields, session)
+
+    async def bulk_write(
+        self,
+        operations: Sequence[Any],
+        session: AsyncIOMotorClientSession | None = None,
+    ) -> BulkWriteOutcome:
+        return await bulk_write_unordered(self.collection, operations, session)
+
+    async def get_by_id(
+        self,
+        project_id: str,
+        user_id: str,
+        fields: Iterable[str] | None = None,
+    ) -> Project | None:
         from bson import ObjectId
 
-        doc = await self.collection.find_one({"_id": ObjectId(project_id), "user_id": user_id})
-        return Project(doc) if doc else None
+        selected = None if fields is None else projection(fields, ("user_id", "updated_at"))
+        doc = await self.collection.find_one({"_id": ObjectId(project_id), "user_id": user_id}, selected)
+        return Project.from_document(doc) if doc else None
+
+    async def list_by_user(
+        self,
+        user_id: str,
+        client_id: str | None = None,
+        *,
+        limit: int,
+        cursor: str | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> tuple[list[Project], str | None]:
+        """List a page of projects; ``fields`` narrows the projection (sort keys are always loaded)."""
+        query: dict[str, Any] = {"user_id": user_id}
+        if client_id:
+            query["client_id"] = client_id
+        query.update(keyset_filter(cursor))
+        selected = None if fields is None else projection(fields, ("user_id", "created_at"))
+        find = self.collection.find(query, selected).sort(KEYSET_SORT).limit(limit + 1)
+        docs, next_cursor = await fetch_page(find, limit)
+        return [Project.from_document(doc) for doc in docs], next_cursor
+
+    async def board_column(
+        self,
+        user_id: str,
+        status: str,
+        *,
+        limit: int,
+        cursor: str | None = None,
+    ) -> tuple[list[Project], str | None]:
+        """One page of a board column in position order, served by ``user_status_position``."""
+        query: dict[str, Any] = {"user_id": user_id, "status": status}
+        query.update(rank_filter(cursor))
+        find = self.collection.find(query).sort(RANK_SORT).limit(limit + 1)
+        docs, next_cursor = await fetch_rank_page(find, limit)
+        return [Project.from_document(doc) for doc in docs], next_cursor
+
+    async def adjacent_position(
+        self,
+        user_id: str,
+        status: str,
+        position: str,
+        exclude: Iterable[ObjectId] = (),
+        *,
+        above: bool = False,
+    ) -> str | None:
+        """The nearest position after (or, with ``above``, before) ``position`` in a board column."""
+        query = {
+            "user_id": user_id,
+            "status": status,
+            "position": {"$lt" if above else "$gt": position},
+            "_id": {"$nin": list(exclude)},
+        }
+        sort = [(field, -direction) for field, direction in RANK_SORT] if above else RANK_SORT
+        doc = await self.collection.find_one(query, {"position": 1}, sort=sort)
+        return doc["position"] if doc else None
+
+    async def count_by_status(self, user_id: str) -> dict[str, int]:
+        pipeline = [{"$match": {"user_id": user_id}}, {"$group": {"_id": "$status", "count": {"$sum": 1}}}]
+        return {row["_id"]: row["count"] async for row in self.collection.aggregate(pipeline)}
+
+    @staticmethod
+    def dashboard_pipeline(
+        user_id: str,
+        *,
+        now: datetime,
+        due_before: datetime,
+        top_clients: int,
+        upcoming: int,
+    ) -> list[dict[str, Any]]:
+        """One pass over the user's projects (via ``user_created``) fanned out into rollups with ``$facet``."""
+        rate = {"$ifNull": ["$hourly_rate", 0]}
+        open_status = {"$ne": ["$status", "completed"]}
+        due_soon = {"deadline": {"$gte": now, "$lte": due_before}, "status": {"$ne": "completed"}}
+        client_lookup = {
+            "$lookup": {
+                "from": Client.collection_name,
+                "let": {"client_id": {"$convert": {"input": "$client_id", "to": "objectId", "onError": None}}},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$_id", "$$client_id"]}, "user_id": user_id}},
+                    {"$project": {"_id": 0, "name": 1, "company": 1}},
+                ],
+                "as": "client",
+            }
+        }
+        return [
+            {"$match": {"user_id": user_id}},
+            {
+                "$facet": {
+                    "by_status": [
+                        {
+                            "$group": {
+                                "_id": "$status",
+                                "count": {"$sum": 1},
+                                "hourly_rate_total": {"$sum": rate},
+                                "rated": {"$sum": {"$cond": [{"$gt": ["$hourly_rate", 0]}, 1, 0]}},
+                            }
+                        },
+                    ],
+                    "by_client": [
+                        {
+                            "$group": {
+                                "_id": "$client_id",
+                                "count": {"$sum": 1},
+                                "open": {"$sum": {"$cond": [open_status, 1, 0]}},
+                                "hourly_rate_total": {"$sum": {"$cond": [open_status, rate, 0]}},
+                            }
+                        },
+                        {"$sort": {"count": -1, "_id": 1}},
+                        {"$limit": top_clients},
+                        {"$addFields": {"client_id": "$_id"}},
+                        client_lookup,
+                    ],
+                    "upcoming_deadlines": [
+                        {"$match": due_soon},
+                        {"$sort": {"deadline": 1, "_id": 1}},
+                        {"$limit": upcoming},
+                        client_lookup,
+                        {
+                            "$project": {
+                                "_id": 1,
+                                "title": 1,
+                                "status": 1,
+                                "deadline": 1,
+                                "client_id": 1,
+                                "hourly_rate": 1,
+                                "client": 1,
+                            }
+                        },
+                    ],
+                    "due_soon": [{"$match": due_soon}, {"$count": "count"}],
+                }
+            },
+        ]
 
-    async def list_by_user(self, user_id: str, client_id: str | None = None) -> list[Project]:
+    async def dashboard(self, user_id: str, **options: Any) -> dict[str, Any]:
+        result = await self.collection.aggregate(self.dashboard_pipeline(user_id, **options)).to_list(length=1)
+        return result[0]
+
+    async def stream_by_user(
+        self,
+        user_id: str,
+        client_id: str | None = None,
+        *,
+        batch_size: int,
+    ) -> AsyncIterator[dict[str, Any]]:
         query: dict[str, Any] = {"user_id": user_id}
         if client_id:
             query["client_id"] = client_id
-        cursor = self.collection.find(query).sort("created_at", -1)
-        docs = await cursor.to_list(length=None)
-        return [Project(doc) for doc in docs]
+        cursor = self.collection.find(query, batch_size=batch_size).sort(KEYSET_SORT)
+        async for doc in cursor:
+            yield doc
 
-    async def update(self, project_id: str, user_id: str, update_data: dict[str, Any]) -> Project | None:
+    async def update(
+        self,
+        project_id: str,
+        user_id: str,
+        update_data: dict[str, Any],
+        expected_updated_at: datetime | None = None,
+    ) -> Project | None:
+        """Apply ``update_data`` atomically; returns None if missing or ``expected_updated_at`` is stale."""
         from bson import ObjectId
 
-        update_data["updated_at"] = Project.to_document(user_id="", client_id="", title="")["updated_at"]
-        result = await self.collection.update_one(
-            {"_id": ObjectId(project_id), "user_id": user_id},
+        query: dict[str, Any] = {"_id": ObjectId(project_id), "user_id": user_id}
+        if expected_updated_at is not None:
+            query["updated_at"] = expected_updated_at
+        update_data["updated_at"] = utcnow()
+        doc = await self.collection.find_one_and_update(
+            query,
             {"$set": update_data},
+            return_document=ReturnDocument.AFTER,
         )
-        if result.modified_count == 0:
-            return None
-        return await self.get_by_id(project_id, user_id)
+        return Project.from_document(doc) if doc else None
+
+    async def update_status(
+        self,
+        project_id: str,
+        user_id: str,
+        status: str,
+        expected_updated_at: datetime | None = None,
+    ) -> Project | None:
+        return await self.update(project_id, user_id, {"status": status}, expected_updated_at)
+
+    @staticmethod
+    def update_operation(
+        object_id: ObjectId,
+        user_id: str,
+        update_data: dict[str, Any],
+        expected_updated_at: datetime | None = None,
+        now: datetime | None = None,
+    ) -> UpdateOne:
+        query: dict[str, Any] = {"_id": object_id, "user_id": user_id}
+        if expected_updated_at is not None:
+            query["updated_at"] = expected_updated_at
+        return UpdateOne(query, {"$set": {"updated_at": now or utcnow(), **update_data}})
 
-    async def update_status(self, project_id: str, user_id: str, status: str) -> Project | None:
+    async def get_updated_at(self, project_id: str, user_id: str) -> datetime | None:
         from bson import ObjectId
 
-        result = await self.collection.update_one(
-            {"_id": ObjectId(project_id), "user_id": user_id},
-            {"$set": {"status": status, "updated_at": Project.to_document(user_id="", client_id="", title="")["updated_at"]}},
-        )
-        if result.modified_count == 0:
-            return None
-        return await self.get_by_id(project_id, user_id)
+        doc = await self.collection.find_one({"_id": ObjectId(project_id), "user_id": user_id}, {"updated_at": 1})
+        return doc["updated_at"] if doc else None
+
+    async def exists(self, project_id: str, user_id: str) -> bool:
+        from bson import ObjectId
+
+        doc = await self.collection.find_one({"_id": ObjectId(project_id), "user_id": user_id}, {"_id": 1})
+        return doc is not None
 
     async def delete(self, project_id: str, user_id: str) -> bool:
         from bson import ObjectId
@@ -59,3 +269,66 @@ class ProjectRepository:
         result = await self.collection.delete_one({"_id": ObjectId(project_id), "user_id": user_id})
         return result.deleted_count > 0
 
+    async def delete_by_clients(
+        self,
+        user_id: str,
+        client_ids: Sequence[str],
+        session: AsyncIOMotorClientSession | None = None,
+    ) -> int:
+        """Delete every project of the given clients; served by the ``user_client_created`` index prefix."""
+        if not client_ids:
+            return 0
+        query = {"user_id": user_id, "client_id": {"$in": list(client_ids)}}
+        result = await self.collection.delete_many(query, session=session)
+        return result.deleted_count
+
+    async def delete_by_user(self, user_id: str, session: AsyncIOMotorClientSession | None = None) -> int:
+        result = await self.collection.delete_many({"user_id": user_id}, session=session)
+        return result.deleted_count
+
+    async def purge_orphans(self, batch_size: int, pause: float = 0.0, dry_run: bool = False) -> dict[str, int]:
+        """
+        Delete projects whose client no longer exists (or belongs to another user), walking
+        ``_id`` order in batches and sleeping ``pause`` seconds between them. Returns the number
+        of orphans per user. Safe to interrupt and re-run.
+        """
+        purged: dict[str, int] = {}
+        last_id: ObjectId | None = None
+        while True:
+            query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+            batch = await self.collection.find(query, {"user_id": 1, "client_id": 1}).sort("_id", 1).to_list(
+                batch_size
+            )
+            if not batch:
+                return purged
+            last_id = batch[-1]["_id"]
+
+            client_ids = {ObjectId(doc["client_id"]) for doc in batch if ObjectId.is_valid(doc.get("client_id"))}
+            owners = {
+                str(doc["_id"]): doc["user_id"]
+                async for doc in self.clients.find({"_id": {"$in": list(client_ids)}}, {"user_id": 1})
+            }
+            orphans = [doc for doc in batch if owners.get(str(doc.get("client_id"))) != doc["user_id"]]
+            if orphans and not dry_run:
+                await self.collection.delete_many({"_id": {"$in": [doc["_id"] for doc in orphans]}})
+            for doc in orphans:
+                purged[doc["user_id"]] = purged.get(doc["user_id"], 0) + 1
+            if pause:
+                await asyncio.sleep(pause)
+
+    async def backfill_positions(self, batch_size: int) -> int:
+        """Give board positions to projects created before they existed; returns the number updated."""
+        updated = 0
+        cursor = self.collection.find({"position": {"$exists": False}}, {"created_at": 1}, batch_size=batch_size)
+        operations: list[UpdateOne] = []
+        async for doc in cursor:
+            position = initial_rank(doc["created_at"], doc["_id"])
+            operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"position": position}}))
+            if len(operations) >= batch_size:
+                await self.collection.bulk_write(operations, ordered=False)
+                updated += len(operations)
+                operations = []
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+            updated += len(operations)
+        return updated
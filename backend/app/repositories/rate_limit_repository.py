@@ -0,0 +1,53 @@
+from typing import Any
+
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.core.rate_limit import Limit
+from app.db.mongo import get_database
+from app.models.rate_limit import RateLimitBucket
+
+
+class RateLimitRepository:
+    """Token buckets shared by every worker. One round trip per hit, timed by the server clock."""
+
+    def __init__(self, db: AsyncIOMotorDatabase | None = None) -> None:
+        db = db if db is not None else get_database()
+        self.collection: AsyncIOMotorCollection = db[RateLimitBucket.collection_name]
+
+    async def take(self, key: str, limit: Limit) -> float:
+        try:
+            bucket = await self._take(key, limit)
+        except DuplicateKeyError:
+            # Two first hits on a new key raced to insert it; the loser now finds it.
+            bucket = await self._take(key, limit)
+        if bucket["allowed"]:
+            return 0.0
+        return (1 - bucket["tokens"]) / limit.per_second
+
+    async def _take(self, key: str, limit: Limit) -> dict[str, Any]:
+        elapsed_seconds = {"$divide": [{"$subtract": ["$$NOW", {"$ifNull": ["$updated_at", "$$NOW"]}]}, 1000]}
+        refilled = {
+            "$min": [
+                limit.burst,
+                {"$add": [{"$ifNull": ["$tokens", limit.burst]}, {"$multiply": [elapsed_seconds, limit.per_second]}]},
+            ]
+        }
+        refill_ms = int(limit.burst / limit.per_second * 1000)
+        return await self.collection.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {"tokens": refilled, "updated_at": "$$NOW"}},
+                {
+                    "$set": {
+                        "allowed": {"$gte": ["$tokens", 1]},
+                        "tokens": {"$cond": [{"$gte": ["$tokens", 1]}, {"$subtract": ["$tokens", 1]}, "$tokens"]},
+                        "expires_at": {"$add": ["$$NOW", refill_ms]},
+                    }
+                },
+            ],
+            projection={"tokens": 1, "allowed": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
@@ -1,27 +1,49 @@
 from typing import Any
 
-from motor.motor_asyncio import AsyncIOMotorCollection
+from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorCollection, AsyncIOMotorDatabase
 
+from app.core.clock import utcnow
+from app.core.principal_cache import principal_cache
 from app.db.mongo import get_database
 from app.models.user import User
 
 
 class UserRepository:
-    def __init__(self) -> None:
-        db = get_database()
+    def __init__(self, db: AsyncIOMotorDatabase | None = None) -> None:
+        db = db if db is not None else get_database()
         self.collection: AsyncIOMotorCollection = db[User.collection_name]
 
     async def insert(self, document: dict[str, Any]) -> User:
         result = await self.collection.insert_one(document)
         document["_id"] = result.inserted_id
-        return User(document)
+        return User.from_document(document)
 
     async def get_by_email(self, email: str) -> User | None:
         doc = await self.collection.find_one({"email": email})
-        return User(doc) if doc else None
+        return User.from_document(doc) if doc else None
 
     async def get_by_id(self, user_id: str) -> User | None:
         from bson import ObjectId
 
         doc = await self.collection.find_one({"_id": ObjectId(user_id)})
-        return User(doc) if doc else None
+        return User.from_document(doc) if doc else None
+
+    # Every user write goes through update or delete, so cached principals never outlive the change.
+    async def update(self, user_id: str, update_data: dict[str, Any]) -> User | None:
+        from bson import ObjectId
+        from pymongo import ReturnDocument
+
+        doc = await self.collection.find_one_and_update(
+            {"_id": ObjectId(user_id)},
+            {"$set": {**update_data, "updated_at": utcnow()}},
+            return_document=ReturnDocument.AFTER,
+        )
+        principal_cache.invalidate_user(user_id)
+        return User.from_document(doc) if doc else None
+
+    async def delete(self, user_id: str, session: AsyncIOMotorClientSession | None = None) -> bool:
+        from bson import ObjectId
+
+        result = await self.collection.delete_one({"_id": ObjectId(user_id)}, session=session)
+        principal_cache.invalidate_user(user_id)
+        return result.deleted_count > 0
@@ -0,0 +1,28 @@
+from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorCollection, AsyncIOMotorDatabase
+
+from app.db.mongo import get_database
+from app.models.version import CollectionVersion
+
+
+class VersionRepository:
+    def __init__(self, db: AsyncIOMotorDatabase | None = None) -> None:
+        db = db if db is not None else get_database()
+        self.collection: AsyncIOMotorCollection = db[CollectionVersion.collection_name]
+
+    async def bump(self, user_id: str, *collections: str, session: AsyncIOMotorClientSession | None = None) -> None:
+        """Record a write to ``collections``; call after it so readers never pair new data with an old version."""
+        await self.collection.update_one(
+            {"_id": user_id},
+            {"$inc": {collection: 1 for collection in collections}},
+            upsert=True,
+            session=session,
+        )
+
+    async def get(self, user_id: str, *collections: str) -> str:
+        """The counters for ``collections`` joined with dots; zero before the first write."""
+        doc = await self.collection.find_one({"_id": user_id}, {collection: 1 for collection in collections})
+        versions = CollectionVersion.from_document(doc or {"_id": user_id})
+        return ".".join(str(versions.version(collection)) for collection in collections)
+
+    async def delete(self, user_id: str, session: AsyncIOMotorClientSession | None = None) -> None:
+        await self.collection.delete_one({"_id": user_id}, session=session)
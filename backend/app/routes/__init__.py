@@ -1,9 +1,13 @@
 from fastapi import APIRouter
 
-from app.routes import auth, client, health, project
+from app.routes import admin, auth, client, dashboard, events, health, metrics, project
 
 api_router = APIRouter()
 api_router.include_router(health.router, prefix="/health", tags=["health"])
 api_router.include_router(auth.router)
 api_router.include_router(client.router)
 api_router.include_router(project.router)
+api_router.include_router(dashboard.router)
+api_router.include_router(events.router)
+api_router.include_router(metrics.router)
+api_router.include_router(admin.router)
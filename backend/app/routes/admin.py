@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+
+from app.controllers import admin_controller
+from app.schema.admin import SlowQueryLog
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+router.add_api_route(
+    "/slow-queries",
+    admin_controller.list_slow_queries,
+    methods=["GET"],
+    name="slow_queries",
+    response_model=SlowQueryLog,
+    summary="Recent slow Mongo commands on this worker",
+)
@@ -1,27 +1,17 @@
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter
 
 from app.controllers import auth_controller
-from app.core.dependencies import get_current_user
-from app.schema.auth import AuthResponse, LoginRequest, RegisterRequest, UserResponse
+from app.schema.auth import AuthResponse, UserResponse
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-
-@router.post("/register", response_model=UserResponse)
-async def register(payload: RegisterRequest) -> UserResponse:
-    return await auth_controller.register_user(payload)
-
-
-@router.post("/login", response_model=AuthResponse)
-async def login(payload: LoginRequest, response: Response) -> AuthResponse:
-    return await auth_controller.login_user(payload, response)
-
-
-@router.post("/logout")
-async def logout(response: Response) -> dict[str, str]:
-    return await auth_controller.logout_user(response)
-
-
-@router.get("/me", response_model=UserResponse)
-async def me(user: UserResponse = Depends(get_current_user)) -> UserResponse:
-    return user
+router.add_api_route(
+    "/register", auth_controller.register_user, methods=["POST"], name="register", response_model=UserResponse
+)
+router.add_api_route("/login", auth_controller.login_user, methods=["POST"], name="login", response_model=AuthResponse)
+router.add_api_route("/logout", auth_controller.logout_user, methods=["POST"], name="logout")
+router.add_api_route("/me", auth_controller.current_user, methods=["GET"], name="me", response_model=UserResponse)
+router.add_api_route(
+    "/me", auth_controller.update_current_user, methods=["PATCH"], name="update_me", response_model=UserResponse
+)
+router.add_api_route("/me", auth_controller.delete_current_user, methods=["DELETE"], name="delete_me", status_code=204)
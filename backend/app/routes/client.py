@@ -1,35 +1,39 @@
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 
 from app.controllers import client_controller
-from app.schema.client import ClientCreate, ClientResponse, ClientUpdate
+from app.schema.bulk import BulkResponse
+from app.schema.client import ClientPage, ClientResponse
 
 router = APIRouter(prefix="/clients", tags=["clients"])
 
-
-@router.post("", response_model=ClientResponse, status_code=201)
-async def create(payload: ClientCreate) -> ClientResponse:
-    return await client_controller.create_client(payload)
-
-
-@router.get("", response_model=list[ClientResponse])
-async def list_clients() -> list[ClientResponse]:
-    return await client_controller.list_clients()
-
-
-@router.get("/{client_id}", response_model=ClientResponse)
-async def get(client_id: str) -> ClientResponse:
-    return await client_controller.get_client(client_id)
-
-
-@router.put("/{client_id}", response_model=ClientResponse)
-async def update(client_id: str, payload: ClientUpdate) -> ClientResponse:
-    return await client_controller.update_client(client_id, payload)
-
-
-@router.delete("/{client_id}", status_code=204)
-async def delete(client_id: str) -> None:
-    from fastapi import Response
-
-    await client_controller.delete_client(client_id)
-    return Response(status_code=204)
-
+# The controllers declare their own parameters and dependencies, so they are registered as they are.
+router.add_api_route(
+    "", client_controller.create_client, methods=["POST"], name="create", response_model=ClientResponse, status_code=201
+)
+router.add_api_route(
+    "/bulk", client_controller.bulk_clients, methods=["POST"], name="bulk", response_model=BulkResponse
+)
+router.add_api_route(
+    "", client_controller.list_clients, methods=["GET"], name="list_clients", response_model=ClientPage
+)
+router.add_api_route(
+    "/import",
+    client_controller.import_clients,
+    methods=["POST"],
+    name="import_clients",
+    response_class=StreamingResponse,
+    summary="Import clients from CSV or NDJSON",
+)
+router.add_api_route(
+    "/export", client_controller.export_clients, methods=["GET"], name="export", response_class=StreamingResponse
+)
+router.add_api_route(
+    "/{client_id}", client_controller.get_client, methods=["GET"], name="get", response_model=ClientResponse
+)
+router.add_api_route(
+    "/{client_id}", client_controller.update_client, methods=["PUT"], name="update", response_model=ClientResponse
+)
+router.add_api_route(
+    "/{client_id}", client_controller.delete_client, methods=["DELETE"], name="delete", status_code=204
+)
@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+
+from app.controllers import dashboard_controller
+from app.schema.dashboard import DashboardResponse
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+router.add_api_route(
+    "", dashboard_controller.get_dashboard, methods=["GET"], name="get", response_model=DashboardResponse
+)
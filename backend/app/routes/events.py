@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from app.controllers import events_controller
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+router.add_api_route(
+    "",
+    events_controller.stream_events,
+    methods=["GET"],
+    name="stream",
+    response_class=StreamingResponse,
+    summary="Server-Sent Events stream of the user's client and project changes",
+    description=(
+        "Sends `ready` on connect, then a `change` event per created, updated or deleted client or "
+        'project: `{"collection", "op", "id", "data"}`. `op` is `reset` when changes were too many '
+        "or were missed; the client should then refetch that collection."
+    ),
+)
@@ -1,4 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from app.core.dependencies import get_admin_user
+from app.core.principal_cache import principal_cache
+from app.schema.auth import UserResponse
 
 router = APIRouter()
 
@@ -6,3 +10,8 @@ router = APIRouter()
 @router.get("/", summary="Service availability probe")
 async def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@router.get("/principal-cache", summary="Authenticated principal cache counters")
+async def principal_cache_stats(current_user: UserResponse = Depends(get_admin_user)) -> dict[str, int]:
+    return principal_cache.stats()
@@ -0,0 +1,88 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import PlainTextResponse
+
+from app.core.dependencies import require_metrics_access
+from app.core.events import EventBroker
+from app.core.metrics import counter, gauge, http_metrics, render
+from app.core.principal_cache import principal_cache
+from app.core.rate_limit import RateLimiter
+from app.db.monitoring import command_metrics
+from app.db.pool import pool_stats
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_TEXT = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _pool() -> list[str]:
+    stats = pool_stats.snapshot()
+    return [
+        *gauge("mongodb_pool_max_size", "maxPoolSize per server.", [({}, stats["max_pool_size"])]),
+        *gauge("mongodb_pool_open_connections", "Open connections.", [({}, stats["open"])]),
+        *gauge("mongodb_pool_checked_out_connections", "Connections in use.", [({}, stats["checked_out"])]),
+        *gauge("mongodb_pool_wait_queue", "Checkouts in progress.", [({}, stats["wait_queue"])]),
+        *gauge("mongodb_pool_waits_per_second", "Queued checkouts, last minute.", [({}, stats["waits_per_second"])]),
+        *counter("mongodb_pool_checkouts_total", "Completed checkouts.", [({}, stats["checkouts"])]),
+        *counter("mongodb_pool_waits_total", "Checkouts that queued behind maxPoolSize.", [({}, stats["waits"])]),
+        *counter("mongodb_pool_checkout_failures_total", "Failed checkouts.", [({}, stats["checkout_failures"])]),
+    ]
+
+
+def _principal_cache() -> list[str]:
+    stats = principal_cache.stats()
+    outcomes = (("token_hit", "token_hits"), ("user_hit", "user_hits"), ("miss", "misses"))
+    return [
+        *counter(
+            "principal_cache_lookups_total",
+            "Principal cache lookups by outcome.",
+            [({"outcome": outcome}, stats[key]) for outcome, key in outcomes],
+        ),
+        *gauge(
+            "principal_cache_entries",
+            "Cached principals by key.",
+            [({"key": "token"}, stats["token_entries"]), ({"key": "user"}, stats["user_entries"])],
+        ),
+    ]
+
+
+def _rate_limiter(limiter: RateLimiter) -> list[str]:
+    stats = limiter.stats()
+    return [
+        *counter(
+            "auth_rate_limit_decisions_total",
+            "Login and registration attempts by throttle decision.",
+            [({"decision": "allowed"}, stats["allowed"]), ({"decision": "rejected"}, stats["rejected"])],
+        ),
+        *gauge("auth_rate_limit_buckets", "Buckets held by the in-memory store.", [({}, stats["buckets"])]),
+    ]
+
+
+def _events(broker: EventBroker) -> list[str]:
+    stats = broker.stats()
+    return [
+        *gauge("events_subscribers", "Open live event streams.", [({}, stats["subscribers"])]),
+        *counter("events_published_total", "Changes published to users with open streams.", [({}, stats["published"])]),
+        *counter(
+            "events_overflows_total",
+            "Streams whose buffer filled up and were told to refetch.",
+            [({}, stats["overflows"])],
+        ),
+    ]
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Prometheus metrics for this worker",
+    dependencies=[Depends(require_metrics_access)],
+)
+async def metrics(request: Request) -> PlainTextResponse:
+    sections = (
+        http_metrics.exposition(),
+        command_metrics.exposition(),
+        _pool(),
+        _principal_cache(),
+        _rate_limiter(request.app.state.container.rate_limiter),
+        _events(request.app.state.container.events),
+    )
+    return PlainTextResponse(render(sections), media_type=PROMETHEUS_TEXT)
@@ -1,40 +1,57 @@
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 
 from app.controllers import project_controller
-from app.schema.project import ProjectCreate, ProjectResponse, ProjectStatusUpdate, ProjectUpdate
+from app.schema.bulk import BulkResponse
+from app.schema.project import BoardResponse, ProjectPage, ProjectResponse
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
-
-@router.post("", response_model=ProjectResponse, status_code=201)
-async def create(payload: ProjectCreate) -> ProjectResponse:
-    return await project_controller.create_project(payload)
-
-
-@router.get("", response_model=list[ProjectResponse])
-async def list_projects() -> list[ProjectResponse]:
-    return await project_controller.list_projects()
-
-
-@router.get("/{project_id}", response_model=ProjectResponse)
-async def get(project_id: str) -> ProjectResponse:
-    return await project_controller.get_project(project_id)
-
-
-@router.put("/{project_id}", response_model=ProjectResponse)
-async def update(project_id: str, payload: ProjectUpdate) -> ProjectResponse:
-    return await project_controller.update_project(project_id, payload)
-
-
-@router.patch("/{project_id}/status", response_model=ProjectResponse)
-async def update_status(project_id: str, payload: ProjectStatusUpdate) -> ProjectResponse:
-    return await project_controller.update_project_status(project_id, payload)
-
-
-@router.delete("/{project_id}", status_code=204)
-async def delete(project_id: str) -> None:
-    from fastapi import Response
-
-    await project_controller.delete_project(project_id)
-    return Response(status_code=204)
-
+# The controllers declare their own parameters and dependencies, so they are registered as they are.
+router.add_api_route(
+    "",
+    project_controller.create_project,
+    methods=["POST"],
+    name="create",
+    response_model=ProjectResponse,
+    status_code=201,
+)
+router.add_api_route(
+    "/bulk", project_controller.bulk_projects, methods=["POST"], name="bulk", response_model=BulkResponse
+)
+router.add_api_route(
+    "", project_controller.list_projects, methods=["GET"], name="list_projects", response_model=ProjectPage
+)
+router.add_api_route(
+    "/import",
+    project_controller.import_projects,
+    methods=["POST"],
+    name="import_projects",
+    response_class=StreamingResponse,
+    summary="Import projects from CSV or NDJSON",
+)
+router.add_api_route(
+    "/export", project_controller.export_projects, methods=["GET"], name="export", response_class=StreamingResponse
+)
+router.add_api_route(
+    "/board", project_controller.get_board, methods=["GET"], name="board", response_model=BoardResponse
+)
+router.add_api_route(
+    "/board", project_controller.move_projects, methods=["PATCH"], name="move", response_model=list[ProjectResponse]
+)
+router.add_api_route(
+    "/{project_id}", project_controller.get_project, methods=["GET"], name="get", response_model=ProjectResponse
+)
+router.add_api_route(
+    "/{project_id}", project_controller.update_project, methods=["PUT"], name="update", response_model=ProjectResponse
+)
+router.add_api_route(
+    "/{project_id}/status",
+    project_controller.update_project_status,
+    methods=["PATCH"],
+    name="update_status",
+    response_model=ProjectResponse,
+)
+router.add_api_route(
+    "/{project_id}", project_controller.delete_project, methods=["DELETE"], name="delete", status_code=204
+)
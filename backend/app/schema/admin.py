@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class QueryPlan(BaseModel):
+    stages: list[str]
+    collscan: bool
+    in_memory_sort: bool
+    docs_examined: int | None = None
+    keys_examined: int | None = None
+    returned: int | None = None
+    execution_ms: int | None = None
+
+
+class SlowQuery(BaseModel):
+    at: datetime
+    database: str
+    collection: str
+    command: str
+    shape: dict[str, Any]
+    duration_ms: float
+    documents: int
+    error: str | None = None
+    plan: QueryPlan | None = None
+
+
+class SlowQueryLog(BaseModel):
+    threshold_ms: float
+    items: list[SlowQuery]
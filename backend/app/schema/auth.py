@@ -12,6 +12,10 @@ class LoginRequest(BaseModel):
     password: str
 
 
+class UserUpdate(BaseModel):
+    full_name: str | None = Field(default=None, max_length=80)
+
+
 class UserResponse(BaseModel):
     id: str
     email: EmailStr
@@ -0,0 +1,32 @@
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, ValidationError
+
+BULK_MAX_ITEMS = 1000
+
+
+class BulkRequest(BaseModel):
+    """Items are validated one by one so a bad row is reported instead of failing the batch."""
+
+    create: list[dict[str, Any]] = Field(default_factory=list, max_length=BULK_MAX_ITEMS)
+    update: list[dict[str, Any]] = Field(default_factory=list, max_length=BULK_MAX_ITEMS)
+    delete: list[str] = Field(default_factory=list, max_length=BULK_MAX_ITEMS)
+
+
+class BulkItemResult(BaseModel):
+    op: Literal["create", "update", "delete"]
+    index: int
+    status: int
+    id: str | None = None
+    detail: str | None = None
+
+
+class BulkResponse(BaseModel):
+    results: list[BulkItemResult]
+
+
+def validation_detail(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in exc.errors()
+    )
@@ -1,4 +1,8 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from datetime import datetime
+
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter, field_validator
+
+_email_adapter = TypeAdapter(EmailStr)
 
 
 class ClientCreate(BaseModel):
@@ -20,7 +24,7 @@ class ClientCreate(BaseModel):
     def validate_email_format(cls, v: str | None) -> EmailStr | None:
         if v is None:
             return None
-        return EmailStr(v)
+        return _email_adapter.validate_python(v)
 
 
 class ClientUpdate(BaseModel):
@@ -29,6 +33,9 @@ class ClientUpdate(BaseModel):
     phone: str | None = Field(default=None, max_length=20)
     company: str | None = Field(default=None, max_length=100)
     notes: str | None = None
+    expected_updated_at: datetime | None = Field(
+        default=None, description="Reject with 409 unless the client's updated_at still equals this value"
+    )
 
     @field_validator("email", mode="before")
     @classmethod
@@ -42,16 +49,22 @@ class ClientUpdate(BaseModel):
     def validate_email_format(cls, v: str | None) -> EmailStr | None:
         if v is None:
             return None
-        return EmailStr(v)
+        return _email_adapter.validate_python(v)
 
 
 class ClientResponse(BaseModel):
+    """Fields other than ``id`` are omitted from the body when a ``fields=`` selection leaves them out."""
+
     id: str
-    name: str
+    name: str | None = None
     email: str | None = None
     phone: str | None = None
     company: str | None = None
     notes: str | None = None
-    created_at: str
-    updated_at: str
+    created_at: str | None = None
+    updated_at: str | None = None
+
 
+class ClientPage(BaseModel):
+    items: list[ClientResponse]
+    next_cursor: str | None = None
@@ -0,0 +1,41 @@
+from pydantic import BaseModel
+
+
+class DashboardTotals(BaseModel):
+    projects: int
+    active: int
+    due_soon: int
+    average_rate: float
+    pipeline_value: float
+
+
+class StatusRollup(BaseModel):
+    status: str
+    count: int
+    hourly_rate_total: float
+
+
+class ClientRollup(BaseModel):
+    client_id: str
+    name: str | None = None
+    company: str | None = None
+    count: int
+    open: int
+    hourly_rate_total: float
+
+
+class UpcomingDeadline(BaseModel):
+    id: str
+    title: str
+    status: str
+    deadline: str
+    hourly_rate: float | None = None
+    client_id: str
+    client_name: str | None = None
+
+
+class DashboardResponse(BaseModel):
+    totals: DashboardTotals
+    by_status: list[StatusRollup]
+    by_client: list[ClientRollup]
+    upcoming_deadlines: list[UpcomingDeadline]
@@ -17,20 +17,63 @@ class ProjectUpdate(BaseModel):
     status: str | None = Field(default=None, pattern="^(idea|talks|in-progress|review|completed)$")
     hourly_rate: float | None = Field(default=None, ge=0)
     deadline: datetime | None = None
+    expected_updated_at: datetime | None = Field(
+        default=None, description="Reject with 409 unless the project's updated_at still equals this value"
+    )
 
 
 class ProjectStatusUpdate(BaseModel):
     status: str = Field(pattern="^(idea|talks|in-progress|review|completed)$")
+    expected_updated_at: datetime | None = Field(
+        default=None, description="Reject with 409 unless the project's updated_at still equals this value"
+    )
 
 
 class ProjectResponse(BaseModel):
+    """Fields other than ``id`` are omitted from the body when a ``fields=`` selection leaves them out."""
+
     id: str
-    client_id: str
-    title: str
+    client_id: str | None = None
+    title: str | None = None
     description: str | None = None
-    status: str
+    status: str | None = None
     hourly_rate: float | None = None
     deadline: str | None = None
-    created_at: str
-    updated_at: str
+    position: str | None = None
+    created_at: str | None = None
+    updated_at: str | None = None
+
+
+class ProjectPage(BaseModel):
+    items: list[ProjectResponse]
+    next_cursor: str | None = None
+
+
+class BoardProject(ProjectResponse):
+    client_name: str | None = None
+    client_company: str | None = None
+
+
+class BoardColumn(BaseModel):
+    status: str
+    count: int = Field(description="Projects in this column, across all pages")
+    items: list[BoardProject]
+    next_cursor: str | None = None
+
+
+class BoardResponse(BaseModel):
+    columns: list[BoardColumn]
+
+
+class BoardMove(BaseModel):
+    id: str
+    status: str = Field(pattern="^(idea|talks|in-progress|review|completed)$")
+    before_id: str | None = Field(default=None, description="Card that should end up directly above")
+    after_id: str | None = Field(default=None, description="Card that should end up directly below")
+    expected_updated_at: datetime | None = None
+
+
+class BoardMoveRequest(BaseModel):
+    """Moves are applied in order, so later moves may reference cards moved earlier in the batch."""
 
+    moves: list[BoardMove] = Field(min_length=1, max_length=500)
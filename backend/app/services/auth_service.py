@@ -1,18 +1,55 @@
+import math
+
 from fastapi import HTTPException, status
 from fastapi.responses import Response
+from pymongo.errors import DuplicateKeyError
 
-from app.core.security import create_access_token, hash_password, verify_password
+from app.core.rate_limit import Limit, MemoryRateLimitStore, RateLimiter
+from app.core.security import PasswordHasherBusy, create_access_token, password_hasher
 from app.core.settings import get_settings
+from app.db.mongo import transaction
 from app.models.user import User
+from app.repositories.client_repository import ClientRepository
+from app.repositories.project_repository import ProjectRepository
 from app.repositories.user_repository import UserRepository
-from app.schema.auth import LoginRequest, RegisterRequest, UserResponse
+from app.repositories.version_repository import VersionRepository
+from app.schema.auth import LoginRequest, RegisterRequest, UserResponse, UserUpdate
 
 settings = get_settings()
 
+IP_LIMIT = Limit(settings.auth_rate_limit_ip_burst, settings.auth_rate_limit_ip_per_minute)
+EMAIL_LIMIT = Limit(settings.auth_rate_limit_email_burst, settings.auth_rate_limit_email_per_minute)
+
 
 class AuthService:
-    def __init__(self, repository: UserRepository | None = None) -> None:
+    def __init__(
+        self,
+        repository: UserRepository | None = None,
+        limiter: RateLimiter | None = None,
+        client_repository: ClientRepository | None = None,
+        project_repository: ProjectRepository | None = None,
+        versions: VersionRepository | None = None,
+    ) -> None:
         self.repository = repository or UserRepository()
+        self.limiter = limiter or RateLimiter(
+            MemoryRateLimitStore(settings.rate_limit_max_keys), enabled=settings.rate_limit_enabled
+        )
+        self.client_repository = client_repository or ClientRepository()
+        self.project_repository = project_repository or ProjectRepository()
+        self.versions = versions or VersionRepository()
+
+    async def throttle(self, action: str, client_ip: str, email: str) -> None:
+        """Reject a ``login`` or ``register`` attempt over its IP or email limit; call before any lookup or hashing."""
+        wait = await self.limiter.hit(
+            (f"{action}:ip:{client_ip}", IP_LIMIT),
+            (f"{action}:email:{email.lower()}", EMAIL_LIMIT),
+        )
+        if wait:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts, please retry later",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
 
     async def register(self, payload: RegisterRequest) -> User:
         existing = await self.repository.get_by_email(payload.email)
@@ -21,17 +58,59 @@ class AuthService:
 
         document = User.to_document(
             email=payload.email,
-            password_hash=hash_password(payload.password),
+            password_hash=await self._hash(payload.password),
             full_name=payload.full_name,
         )
-        return await self.repository.insert(document)
+        try:
+            return await self.repository.insert(document)
+        except DuplicateKeyError as exc:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already registered") from exc
 
     async def authenticate(self, payload: LoginRequest) -> User:
         user = await self.repository.get_by_email(payload.email)
-        if not user or not verify_password(payload.password, user.password_hash):
+        if not user or not await self._verify(payload.password, user.password_hash):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
         return user
 
+    async def update(self, user_id: str, payload: UserUpdate) -> User:
+        user = await self.repository.update(user_id, payload.model_dump(exclude_unset=True))
+        if not user:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        return user
+
+    async def delete(self, user_id: str) -> None:
+        """Delete the account with all of its clients and projects."""
+        async with transaction() as session:
+            # The user goes last: an interrupted delete without transactions can then be retried.
+            await self.project_repository.delete_by_user(user_id, session=session)
+            await self.client_repository.delete_by_user(user_id, session=session)
+            await self.versions.delete(user_id, session=session)
+            deleted = await self.repository.delete(user_id, session=session)
+        if not deleted:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+    @staticmethod
+    async def _hash(password: str) -> str:
+        try:
+            return await password_hasher.hash(password)
+        except PasswordHasherBusy as exc:
+            raise AuthService._busy() from exc
+
+    @staticmethod
+    async def _verify(password: str, password_hash: str) -> bool:
+        try:
+            return await password_hasher.verify(password, password_hash)
+        except PasswordHasherBusy as exc:
+            raise AuthService._busy() from exc
+
+    @staticmethod
+    def _busy() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in attempts in progress, please retry",
+            headers={"Retry-After": "1"},
+        )
+
     async def login_response(self, response: Response, user: User) -> tuple[UserResponse, str]:
         token = create_access_token(user.id)
         max_age = settings.access_token_expire_minutes * 60
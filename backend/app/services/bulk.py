@@ -0,0 +1,159 @@
+from datetime import datetime
+from typing import Any, NamedTuple, TypeVar
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from motor.motor_asyncio import AsyncIOMotorClientSession
+from pydantic import BaseModel, ValidationError
+
+from app.core.clock import as_stored
+from app.repositories.client_repository import ClientRepository
+from app.repositories.project_repository import ProjectRepository
+from app.schema.bulk import BulkItemResult, validation_detail
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_OP_ORDER = {"create": 0, "update": 1, "delete": 2}
+
+
+class PendingWrite(NamedTuple):
+    op: str
+    index: int
+    object_id: ObjectId
+    operation: Any
+
+
+class WriteFailure(NamedTuple):
+    status: int
+    detail: str
+
+
+def parse_creates(
+    items: list[dict[str, Any]],
+    model: type[ModelT],
+    results: list[BulkItemResult],
+) -> list[tuple[int, ModelT]]:
+    parsed: list[tuple[int, ModelT]] = []
+    for index, item in enumerate(items):
+        try:
+            parsed.append((index, model.model_validate(item)))
+        except ValidationError as exc:
+            results.append(BulkItemResult(op="create", index=index, status=422, detail=validation_detail(exc)))
+    return parsed
+
+
+def parse_updates(
+    items: list[dict[str, Any]],
+    model: type[ModelT],
+    results: list[BulkItemResult],
+) -> list[tuple[int, ObjectId, ModelT]]:
+    """Validate update items, which must carry an ``id`` alongside the update fields."""
+    parsed: list[tuple[int, ObjectId, ModelT]] = []
+    for index, item in enumerate(items):
+        raw_id = item.get("id")
+        try:
+            if raw_id is None:  # ObjectId(None) would mint a fresh id
+                raise InvalidId
+            object_id = ObjectId(raw_id)
+        except (InvalidId, TypeError):
+            results.append(BulkItemResult(op="update", index=index, status=422, id=raw_id, detail="id: invalid id"))
+            continue
+        try:
+            payload = model.model_validate({key: value for key, value in item.items() if key != "id"})
+        except ValidationError as exc:
+            results.append(
+                BulkItemResult(op="update", index=index, status=422, id=raw_id, detail=validation_detail(exc))
+            )
+            continue
+        parsed.append((index, object_id, payload))
+    return parsed
+
+
+def parse_deletes(ids: list[str], results: list[BulkItemResult]) -> list[tuple[int, ObjectId]]:
+    parsed: list[tuple[int, ObjectId]] = []
+    for index, raw_id in enumerate(ids):
+        try:
+            parsed.append((index, ObjectId(raw_id)))
+        except (InvalidId, TypeError):
+            results.append(BulkItemResult(op="delete", index=index, status=422, id=raw_id, detail="invalid id"))
+    return parsed
+
+
+def expected_timestamp(payload: BaseModel) -> datetime | None:
+    expected = getattr(payload, "expected_updated_at", None)
+    return as_stored(expected) if expected else None
+
+
+def created_results(
+    documents: list[dict[str, Any]],
+    positions: list[int],
+    errors: dict[int, str],
+) -> list[BulkItemResult]:
+    results: list[BulkItemResult] = []
+    for offset, (index, document) in enumerate(zip(positions, documents)):
+        if offset in errors:
+            results.append(BulkItemResult(op="create", index=index, status=409, detail=errors[offset]))
+        else:
+            results.append(BulkItemResult(op="create", index=index, status=201, id=str(document["_id"])))
+    return results
+
+
+async def apply_writes(
+    repository: ClientRepository | ProjectRepository,
+    writes: list[PendingWrite],
+    user_id: str,
+    now: datetime,
+    noun: str,
+    session: AsyncIOMotorClientSession | None = None,
+) -> dict[int, WriteFailure]:
+    """
+    Run ``writes`` as one unordered bulk write and return failures by position. Every update must
+    set ``updated_at`` to ``now``. When fewer updates matched than were sent, those whose document
+    no longer carries ``now`` lost a race: the document was changed (409) or deleted (404) after it
+    was read. Deletes have no precondition beyond ownership, so one that finds its document already
+    gone still reports success.
+    """
+    outcome = await repository.bulk_write([write.operation for write in writes], session)
+    failures = {offset: WriteFailure(409, detail) for offset, detail in outcome.errors.items()}
+    updates = {
+        offset: write.object_id
+        for offset, write in enumerate(writes)
+        if write.op == "update" and offset not in failures
+    }
+    if outcome.matched < len(updates):
+        stored = await repository.find_owned(updates.values(), user_id, ("updated_at",), session)
+        for offset, object_id in updates.items():
+            if object_id not in stored:
+                failures[offset] = WriteFailure(404, f"{noun} not found")
+            elif stored[object_id].get("updated_at") != now:
+                failures[offset] = WriteFailure(409, f"{noun} was modified by someone else")
+    return failures
+
+
+def written_results(writes: list[PendingWrite], failures: dict[int, WriteFailure]) -> list[BulkItemResult]:
+    results: list[BulkItemResult] = []
+    for offset, write in enumerate(writes):
+        object_id = str(write.object_id)
+        failure = failures.get(offset)
+        if failure is not None:
+            results.append(
+                BulkItemResult(
+                    op=write.op, index=write.index, status=failure.status, id=object_id, detail=failure.detail
+                )
+            )
+        else:
+            status = 204 if write.op == "delete" else 200
+            results.append(BulkItemResult(op=write.op, index=write.index, status=status, id=object_id))
+    return results
+
+
+def not_found(op: str, index: int, object_id: ObjectId, detail: str) -> BulkItemResult:
+    return BulkItemResult(op=op, index=index, status=404, id=str(object_id), detail=detail)
+
+
+def conflict(index: int, object_id: ObjectId, detail: str) -> BulkItemResult:
+    return BulkItemResult(op="update", index=index, status=409, id=str(object_id), detail=detail)
+
+
+def ordered(results: list[BulkItemResult]) -> list[BulkItemResult]:
+    return sorted(results, key=lambda result: (_OP_ORDER[result.op], result.index))
@@ -1,13 +1,40 @@
+from datetime import datetime
+from typing import Any, AsyncIterator, BinaryIO
+
 from fastapi import HTTPException, status
+from pymongo import DeleteOne
 
+from app.core.clock import as_stored, utcnow
+from app.core.events import EventBroker, build_broker, changed, deletion, reset
+from app.core.export import encode_documents
+from app.core.fields import parse_fields
+from app.core.imports import ImportRow, read_batches
+from app.core.settings import get_settings
+from app.db.mongo import transaction
 from app.models.client import Client
-from app.repositories.client_repository import ClientRepository
+from app.models.project import Project
+from app.repositories.client_repository import SEARCH_SOURCE_FIELDS, ClientRepository
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.version_repository import VersionRepository
+from app.schema.bulk import BulkItemResult, BulkRequest
 from app.schema.client import ClientCreate, ClientResponse, ClientUpdate
+from app.services import bulk, imports
+
+settings = get_settings()
 
 
 class ClientService:
-    def __init__(self, repository: ClientRepository | None = None) -> None:
+    def __init__(
+        self,
+        repository: ClientRepository | None = None,
+        project_repository: ProjectRepository | None = None,
+        events: EventBroker | None = None,
+        versions: VersionRepository | None = None,
+    ) -> None:
         self.repository = repository or ClientRepository()
+        self.project_repository = project_repository or ProjectRepository()
+        self.events = events or build_broker()
+        self.versions = versions or VersionRepository()
 
     async def create(self, user_id: str, payload: ClientCreate) -> Client:
         document = Client.to_document(
@@ -18,29 +45,186 @@ class ClientService:
             company=payload.company,
             notes=payload.notes,
         )
-        return await self.repository.insert(document)
+        client = await self.repository.insert(document)
+        await self.versions.bump(user_id, Client.collection_name)
+        self.events.notify(user_id, changed("created", client))
+        return client
+
+    async def bulk(self, user_id: str, request: BulkRequest) -> list[BulkItemResult]:
+        results: list[BulkItemResult] = []
+
+        creates = bulk.parse_creates(request.create, ClientCreate, results)
+        now = utcnow()
+        documents: list[dict[str, Any]] = [
+            Client.to_document(
+                user_id=user_id,
+                name=payload.name,
+                email=payload.email,
+                phone=payload.phone,
+                company=payload.company,
+                notes=payload.notes,
+                now=now,
+            )
+            for _, payload in creates
+        ]
+        errors = await self.repository.insert_many(documents)
+        results += bulk.created_results(documents, [index for index, _ in creates], errors)
+
+        updates = bulk.parse_updates(request.update, ClientUpdate, results)
+        deletes = bulk.parse_deletes(request.delete, results)
+        owned = await self.repository.find_owned(
+            [object_id for _, object_id, _ in updates] + [object_id for _, object_id in deletes],
+            user_id,
+            (*SEARCH_SOURCE_FIELDS, "updated_at"),
+        )
+
+        writes: list[bulk.PendingWrite] = []
+        for index, object_id, payload in updates:
+            current = owned.get(object_id)
+            if current is None:
+                results.append(bulk.not_found("update", index, object_id, "Client not found"))
+                continue
+            expected = bulk.expected_timestamp(payload)
+            if expected is not None and current.get("updated_at") != expected:
+                results.append(bulk.conflict(index, object_id, "Client was modified by someone else"))
+                continue
+            update_data = payload.model_dump(exclude_unset=True, exclude={"expected_updated_at"})
+            operation = self.repository.update_operation(object_id, user_id, update_data, current, expected, now)
+            writes.append(bulk.PendingWrite("update", index, object_id, operation))
+        for index, object_id in deletes:
+            if object_id not in owned:
+                results.append(bulk.not_found("delete", index, object_id, "Client not found"))
+                continue
+            operation = DeleteOne({"_id": object_id, "user_id": user_id})
+            writes.append(bulk.PendingWrite("delete", index, object_id, operation))
+
+        # As in delete(), a transaction keeps each client's projects from outliving it.
+        async with transaction() as session:
+            failures = await bulk.apply_writes(self.repository, writes, user_id, now, "Client", session)
+            deleted = [
+                str(write.object_id)
+                for offset, write in enumerate(writes)
+                if write.op == "delete" and offset not in failures
+            ]
+            removed = await self.project_repository.delete_by_clients(user_id, deleted, session=session)
+            if removed:
+                await self.versions.bump(user_id, Client.collection_name, Project.collection_name, session=session)
+            elif documents or writes:
+                await self.versions.bump(user_id, Client.collection_name, session=session)
+        results += bulk.written_results(writes, failures)
+        if removed:
+            self.events.notify(user_id, reset(Client.collection_name), reset(Project.collection_name))
+        elif documents or writes:
+            self.events.notify(user_id, reset(Client.collection_name))
+        return bulk.ordered(results)
+
+    async def list(
+        self,
+        user_id: str,
+        search: str | None = None,
+        *,
+        limit: int,
+        cursor: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> tuple[list[Client], str | None]:
+        try:
+            return await self.repository.list_by_user(user_id, search, limit=limit, cursor=cursor, fields=fields)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+    def export(self, user_id: str, export_format: str) -> AsyncIterator[bytes]:
+        docs = self.repository.stream_by_user(user_id, batch_size=settings.export_batch_size)
+        return encode_documents(docs, list(ClientResponse.model_fields), export_format, settings.export_chunk_size)
+
+    async def import_file(
+        self,
+        user_id: str,
+        file: BinaryIO,
+        import_format: str | None,
+        filename: str | None,
+        batch_size: int,
+    ) -> AsyncIterator[bytes]:
+        import_format = imports.resolve_format(import_format, filename)
+
+        def prepare(row: ImportRow, now: datetime) -> dict[str, Any] | str:
+            payload = imports.validate(row.data, ClientCreate)
+            if isinstance(payload, str):
+                return payload
+            return Client.to_document(
+                user_id=user_id,
+                name=payload.name,
+                email=payload.email,
+                phone=payload.phone,
+                company=payload.company,
+                notes=payload.notes,
+                now=now,
+            )
+
+        async def inserted() -> None:
+            await self.versions.bump(user_id, Client.collection_name)
+            self.events.notify(user_id, reset(Client.collection_name))
+
+        return imports.run(
+            read_batches(file, import_format, batch_size),
+            prepare,
+            self.repository.insert_many,
+            inserted,
+        )
+
+    async def version(self, user_id: str) -> str:
+        return await self.versions.get(user_id, Client.collection_name)
+
+    async def revision(self, client_id: str, user_id: str) -> datetime:
+        updated_at = await self.repository.get_updated_at(client_id, user_id)
+        if updated_at is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found")
+        return updated_at
 
-    async def list(self, user_id: str, search: str | None = None) -> list[Client]:
-        return await self.repository.list_by_user(user_id, search)
+    @staticmethod
+    def fields(raw: str | None) -> tuple[str, ...] | None:
+        try:
+            return parse_fields(raw, ClientResponse.model_fields)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
-    async def get(self, client_id: str, user_id: str) -> Client:
-        client = await self.repository.get_by_id(client_id, user_id)
+    async def get(self, client_id: str, user_id: str, fields: tuple[str, ...] | None = None) -> Client:
+        client = await self.repository.get_by_id(client_id, user_id, fields)
         if not client:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found")
         return client
 
     async def update(self, client_id: str, user_id: str, payload: ClientUpdate) -> Client:
-        update_data = payload.model_dump(exclude_unset=True)
+        update_data = payload.model_dump(exclude_unset=True, exclude={"expected_updated_at"})
+        expected = as_stored(payload.expected_updated_at) if payload.expected_updated_at else None
         if not update_data:
             return await self.get(client_id, user_id)
 
-        client = await self.repository.update(client_id, user_id, update_data)
+        client = await self.repository.update(client_id, user_id, update_data, expected)
         if not client:
+            if await self.repository.exists(client_id, user_id):
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Client was modified by someone else; reload and try again",
+                )
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found")
+        await self.versions.bump(user_id, Client.collection_name)
+        self.events.notify(user_id, changed("updated", client))
         return client
 
     async def delete(self, client_id: str, user_id: str) -> None:
-        deleted = await self.repository.delete(client_id, user_id)
+        # Without transactions the client goes first: if the cascade is interrupted, the leftover
+        # projects are orphans that the orphan sweeper (app.db.orphans) removes on its next run.
+        async with transaction() as session:
+            deleted = await self.repository.delete(client_id, user_id, session=session)
+            removed = 0
+            if deleted:
+                removed = await self.project_repository.delete_by_clients(user_id, [client_id], session=session)
+                touched = [Client.collection_name, Project.collection_name] if removed else [Client.collection_name]
+                await self.versions.bump(user_id, *touched, session=session)
         if not deleted:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found")
+        if removed:
+            self.events.notify(user_id, deletion(Client.collection_name, client_id), reset(Project.collection_name))
+        else:
+            self.events.notify(user_id, deletion(Client.collection_name, client_id))
 
@@ -0,0 +1,72 @@
+from datetime import timedelta
+from typing import Any
+
+from app.core.clock import utcnow
+from app.models.project import Project
+from app.repositories.project_repository import ProjectRepository
+
+ACTIVE_STATUSES = ("talks", "in-progress", "review")
+DUE_SOON_DAYS = 7
+TOP_CLIENTS = 20
+UPCOMING_LIMIT = 10
+
+
+class DashboardService:
+    def __init__(self, repository: ProjectRepository | None = None) -> None:
+        self.repository = repository or ProjectRepository()
+
+    async def summary(self, user_id: str) -> dict[str, Any]:
+        """Project rollups for the dashboard, shaped like ``DashboardResponse``, from a single aggregation."""
+        now = utcnow()
+        facets = await self.repository.dashboard(
+            user_id,
+            now=now,
+            due_before=now + timedelta(days=DUE_SOON_DAYS),
+            top_clients=TOP_CLIENTS,
+            upcoming=UPCOMING_LIMIT,
+        )
+        statuses = {row["_id"]: row for row in facets["by_status"]}
+        open_rows = [row for status, row in statuses.items() if status != "completed"]
+        rated = sum(row["rated"] for row in open_rows)
+        pipeline_value = float(sum(row["hourly_rate_total"] for row in open_rows))
+        due_soon = facets["due_soon"][0]["count"] if facets["due_soon"] else 0
+        return {
+            "totals": {
+                "projects": sum(row["count"] for row in statuses.values()),
+                "active": sum(statuses[status]["count"] for status in ACTIVE_STATUSES if status in statuses),
+                "due_soon": due_soon,
+                "average_rate": pipeline_value / rated if rated else 0.0,
+                "pipeline_value": pipeline_value,
+            },
+            "by_status": [
+                {
+                    "status": status,
+                    "count": statuses.get(status, {}).get("count", 0),
+                    "hourly_rate_total": float(statuses.get(status, {}).get("hourly_rate_total", 0)),
+                }
+                for status in Project.STATUS_CHOICES
+            ],
+            "by_client": [
+                {
+                    "client_id": row["client_id"],
+                    "name": row["client"][0].get("name") if row["client"] else None,
+                    "company": row["client"][0].get("company") if row["client"] else None,
+                    "count": row["count"],
+                    "open": row["open"],
+                    "hourly_rate_total": float(row["hourly_rate_total"]),
+                }
+                for row in facets["by_client"]
+            ],
+            "upcoming_deadlines": [
+                {
+                    "id": str(row["_id"]),
+                    "title": row["title"],
+                    "status": row["status"],
+                    "deadline": row["deadline"],
+                    "hourly_rate": row.get("hourly_rate"),
+                    "client_id": row["client_id"],
+                    "client_name": row["client"][0].get("name") if row["client"] else None,
+                }
+                for row in facets["upcoming_deadlines"]
+            ],
+        }
@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+
+from app.core.clock import utcnow
+from app.core.imports import ImportRow, detect_format
+from app.core.serialization import dumps
+from app.schema.bulk import validation_detail
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Builds the document for a row, or returns the reason the row was rejected.
+Prepare = Callable[[ImportRow, datetime], dict[str, Any] | str]
+
+
+def resolve_format(requested: str | None, filename: str | None) -> str:
+    try:
+        return detect_format(requested, filename)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+def validate(data: dict[str, Any], model: type[ModelT]) -> ModelT | str:
+    try:
+        return model.model_validate(data)
+    except ValidationError as exc:
+        return validation_detail(exc)
+
+
+async def run(
+    batches: AsyncIterator[list[ImportRow]],
+    prepare: Prepare,
+    insert_many: Callable[[list[dict[str, Any]]], Awaitable[dict[int, str]]],
+    on_inserted: Callable[[], Awaitable[None]],
+) -> AsyncIterator[bytes]:
+    """
+    Insert rows batch by batch, streaming NDJSON events: an ``error`` per rejected row, a
+    ``progress`` after every batch and a final ``done`` with the totals.
+    """
+    rows = inserted = failed = 0
+    async for batch in batches:
+        now = utcnow()
+        documents: list[dict[str, Any]] = []
+        lines: list[int] = []
+        events: list[dict[str, Any]] = []
+        for row in batch:
+            prepared = row.error or prepare(row, now)
+            if isinstance(prepared, str):
+                events.append({"event": "error", "line": row.line, "detail": prepared})
+                continue
+            documents.append(prepared)
+            lines.append(row.line)
+        errors = await insert_many(documents)
+        for position, detail in sorted(errors.items()):
+            events.append({"event": "error", "line": lines[position], "detail": detail})
+        if len(documents) > len(errors):
+            await on_inserted()
+
+        rows += len(batch)
+        inserted += len(documents) - len(errors)
+        failed += len(batch) - len(documents) + len(errors)
+        events.append({"event": "progress", "rows": rows, "inserted": inserted, "failed": failed})
+        yield b"".join(dumps(event) + b"\n" for event in events)
+    yield dumps({"event": "done", "rows": rows, "inserted": inserted, "failed": failed}) + b"\n"
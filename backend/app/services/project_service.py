@@ -1,9 +1,30 @@
+import asyncio
+from datetime import datetime
+from typing import Any, AsyncIterator, BinaryIO
+
+from bson import ObjectId
+from bson.errors import InvalidId
 from fastapi import HTTPException, status
+from pymongo import DeleteOne
 
+from app.core.clock import as_stored, utcnow
+from app.core.events import EventBroker, build_broker, changed, deletion, reset
+from app.core.export import encode_documents
+from app.core.fields import parse_fields
+from app.core.imports import ImportRow, read_batches
+from app.core.ranking import initial_rank, rank_between
+from app.core.settings import get_settings
+from app.db.mongo import transaction
+from app.models.client import Client
 from app.models.project import Project
 from app.repositories.client_repository import ClientRepository
 from app.repositories.project_repository import ProjectRepository
-from app.schema.project import ProjectCreate, ProjectStatusUpdate, ProjectUpdate
+from app.repositories.version_repository import VersionRepository
+from app.schema.bulk import BulkItemResult, BulkRequest
+from app.schema.project import BoardMoveRequest, ProjectCreate, ProjectResponse, ProjectStatusUpdate, ProjectUpdate
+from app.services import bulk, imports
+
+settings = get_settings()
 
 
 class ProjectService:
@@ -11,9 +32,13 @@ class ProjectService:
         self,
         repository: ProjectRepository | None = None,
         client_repository: ClientRepository | None = None,
+        events: EventBroker | None = None,
+        versions: VersionRepository | None = None,
     ) -> None:
         self.repository = repository or ProjectRepository()
         self.client_repository = client_repository or ClientRepository()
+        self.events = events or build_broker()
+        self.versions = versions or VersionRepository()
 
     async def create(self, user_id: str, payload: ProjectCreate) -> Project:
         client = await self.client_repository.get_by_id(payload.client_id, user_id)
@@ -29,35 +54,389 @@ class ProjectService:
             hourly_rate=payload.hourly_rate,
             deadline=payload.deadline,
         )
-        return await self.repository.insert(document)
+        project = await self.repository.insert(document)
+        await self.versions.bump(user_id, Project.collection_name)
+        self.events.notify(user_id, changed("created", project))
+        return project
+
+    async def bulk(self, user_id: str, request: BulkRequest) -> list[BulkItemResult]:
+        results: list[BulkItemResult] = []
+
+        creates = bulk.parse_creates(request.create, ProjectCreate, results)
+        client_ids: dict[str, ObjectId | None] = {}
+        for _, payload in creates:
+            try:
+                client_ids[payload.client_id] = ObjectId(payload.client_id)
+            except (InvalidId, TypeError):
+                client_ids[payload.client_id] = None
+        owned_clients = await self.client_repository.find_owned(
+            [object_id for object_id in client_ids.values() if object_id is not None], user_id
+        )
+        now = utcnow()
+        documents: list[dict[str, Any]] = []
+        positions: list[int] = []
+        for index, payload in creates:
+            if client_ids[payload.client_id] not in owned_clients:
+                results.append(BulkItemResult(op="create", index=index, status=404, detail="Client not found"))
+                continue
+            documents.append(
+                Project.to_document(
+                    user_id=user_id,
+                    client_id=payload.client_id,
+                    title=payload.title,
+                    description=payload.description,
+                    status=payload.status,
+                    hourly_rate=payload.hourly_rate,
+                    deadline=payload.deadline,
+                    now=now,
+                )
+            )
+            positions.append(index)
+        errors = await self.repository.insert_many(documents)
+        results += bulk.created_results(documents, positions, errors)
+
+        updates = bulk.parse_updates(request.update, ProjectUpdate, results)
+        deletes = bulk.parse_deletes(request.delete, results)
+        owned = await self.repository.find_owned(
+            [object_id for _, object_id, _ in updates] + [object_id for _, object_id in deletes],
+            user_id,
+            ("updated_at",),
+        )
+
+        writes: list[bulk.PendingWrite] = []
+        for index, object_id, payload in updates:
+            current = owned.get(object_id)
+            if current is None:
+                results.append(bulk.not_found("update", index, object_id, "Project not found"))
+                continue
+            expected = bulk.expected_timestamp(payload)
+            if expected is not None and current.get("updated_at") != expected:
+                results.append(bulk.conflict(index, object_id, "Project was modified by someone else"))
+                continue
+            update_data = payload.model_dump(exclude_unset=True, exclude={"expected_updated_at"})
+            operation = self.repository.update_operation(object_id, user_id, update_data, expected, now)
+            writes.append(bulk.PendingWrite("update", index, object_id, operation))
+        for index, object_id in deletes:
+            if object_id not in owned:
+                results.append(bulk.not_found("delete", index, object_id, "Project not found"))
+                continue
+            operation = DeleteOne({"_id": object_id, "user_id": user_id})
+            writes.append(bulk.PendingWrite("delete", index, object_id, operation))
+
+        failures = await bulk.apply_writes(self.repository, writes, user_id, now, "Project")
+        results += bulk.written_results(writes, failures)
+        if documents or writes:
+            await self.versions.bump(user_id, Project.collection_name)
+            self.events.notify(user_id, reset(Project.collection_name))
+        return bulk.ordered(results)
+
+    async def move(self, user_id: str, request: BoardMoveRequest) -> list[Project]:
+        """Apply a batch of board moves with one read and one bulk write; returns only the moved projects."""
+        object_ids: list[ObjectId] = []
+        for move in request.moves:
+            for raw_id in (move.id, move.before_id, move.after_id):
+                try:
+                    object_ids.append(ObjectId(raw_id))
+                except (InvalidId, TypeError):
+                    if raw_id is move.id:
+                        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+        owned = await self.repository.find_owned(object_ids, user_id, None)
+        docs = {str(object_id): doc for object_id, doc in owned.items()}
+
+        now = utcnow()
+        moved: dict[str, dict[str, Any]] = {}
+        expected: dict[str, datetime | None] = {}
+        for move in request.moves:
+            doc = docs.get(move.id)
+            if doc is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+            if move.id not in expected:
+                expected[move.id] = as_stored(move.expected_updated_at) if move.expected_updated_at else None
+                if expected[move.id] is not None and doc["updated_at"] != expected[move.id]:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="Project was modified by someone else; reload and try again",
+                    )
+            before = docs.get(move.before_id) if move.before_id else None
+            after = docs.get(move.after_id) if move.after_id else None
+            low, high = self._position(before), self._position(after)
+            if low is not None and high is not None and low >= high:
+                if low > high:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="before_id is below after_id; reload the board and try again",
+                    )
+                # Bulk creates and imports used to give a whole batch one key, leaving no room between
+                # two of its cards. Re-key ``after`` between ``before`` and the card that follows it.
+                assert after is not None
+                following = await self._adjacent_position(user_id, move.status, low, moved, doc["_id"])
+                after["position"] = high = rank_between(low, following)
+                after["updated_at"] = now
+                moved[move.after_id] = after
+                expected.setdefault(move.after_id, None)
+            elif low is not None and high is None:
+                # Only the card above was named: land directly below it, not at the bottom of the column.
+                high = await self._adjacent_position(user_id, move.status, low, moved, doc["_id"])
+            elif high is not None and low is None:
+                low = await self._adjacent_position(user_id, move.status, high, moved, doc["_id"], above=True)
+            doc["position"] = rank_between(low, high)
+            doc["status"] = move.status
+            doc["updated_at"] = now
+            moved[move.id] = doc
+
+        writes = [
+            bulk.PendingWrite(
+                "update",
+                index,
+                doc["_id"],
+                self.repository.update_operation(
+                    doc["_id"],
+                    user_id,
+                    {"status": doc["status"], "position": doc["position"]},
+                    expected[project_id],
+                    now,
+                ),
+            )
+            for index, (project_id, doc) in enumerate(moved.items())
+        ]
+        # A transaction keeps the board whole: one failed move rolls back the rest of the batch.
+        async with transaction() as session:
+            failures = await bulk.apply_writes(self.repository, writes, user_id, now, "Project", session)
+            if failures and session is not None:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Some moves could not be applied; nothing was changed. Reload the board and try again",
+                )
+            await self.versions.bump(user_id, Project.collection_name, session=session)
+        if failures:
+            # Without transactions the other moves are already written, so clients must refetch.
+            self.events.notify(user_id, reset(Project.collection_name))
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Some moves could not be applied. Reload the board and try again",
+            )
+        projects = [Project.from_document(doc) for doc in moved.values()]
+        self.events.notify(user_id, *(changed("updated", project) for project in projects))
+        return projects
+
+    @staticmethod
+    def _position(doc: dict[str, Any] | None) -> str | None:
+        if doc is None:
+            return None
+        return doc.get("position") or initial_rank(doc["created_at"], doc["_id"])
+
+    async def _adjacent_position(
+        self,
+        user_id: str,
+        column: str,
+        position: str,
+        moved: dict[str, dict[str, Any]],
+        moving: ObjectId,
+        *,
+        above: bool = False,
+    ) -> str | None:
+        """The neighbouring position after (or ``above``) ``position`` in ``column``, counting earlier moves."""
+        exclude = {doc["_id"] for doc in moved.values()} | {moving}
+        stored = await self.repository.adjacent_position(user_id, column, position, exclude, above=above)
+        pending = [
+            doc["position"]
+            for doc in moved.values()
+            if doc["_id"] != moving
+            and doc["status"] == column
+            and (doc["position"] < position if above else doc["position"] > position)
+        ]
+        candidates = [key for key in (stored, *pending) if key is not None]
+        if not candidates:
+            return None
+        return max(candidates) if above else min(candidates)
+
+    async def board(
+        self,
+        user_id: str,
+        *,
+        limit: int,
+        column: str | None = None,
+        cursor: str | None = None,
+    ) -> tuple[list[tuple[str, int, list[Project], str | None]], dict[str, dict[str, Any]]]:
+        """Board columns as ``(status, total, page, next_cursor)`` plus the referenced clients by id.
+
+        Columns are read concurrently (one indexed query each) and their clients with one ``$in``.
+        ``cursor`` pages a single ``column`` and therefore requires it.
+        """
+        if cursor and not column:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="cursor requires status")
+        statuses = [column] if column else Project.STATUS_CHOICES
+        try:
+            counts, *pages = await asyncio.gather(
+                self.repository.count_by_status(user_id),
+                *(self.repository.board_column(user_id, name, limit=limit, cursor=cursor) for name in statuses),
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
 
-    async def list(self, user_id: str, client_id: str | None = None) -> list[Project]:
-        return await self.repository.list_by_user(user_id, client_id)
+        client_ids: set[ObjectId] = set()
+        for projects, _ in pages:
+            for project in projects:
+                try:
+                    client_ids.add(ObjectId(project.client_id))
+                except (InvalidId, TypeError):
+                    continue
+        owned = await self.client_repository.find_owned(client_ids, user_id, ("name", "company"))
+        clients = {str(object_id): doc for object_id, doc in owned.items()}
+        columns = [
+            (name, counts.get(name, 0), projects, next_cursor) for name, (projects, next_cursor) in zip(statuses, pages)
+        ]
+        return columns, clients
 
-    async def get(self, project_id: str, user_id: str) -> Project:
-        project = await self.repository.get_by_id(project_id, user_id)
+    async def list(
+        self,
+        user_id: str,
+        client_id: str | None = None,
+        *,
+        limit: int,
+        cursor: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> tuple[list[Project], str | None]:
+        try:
+            return await self.repository.list_by_user(user_id, client_id, limit=limit, cursor=cursor, fields=fields)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+    def export(self, user_id: str, export_format: str, client_id: str | None = None) -> AsyncIterator[bytes]:
+        docs = self.repository.stream_by_user(user_id, client_id, batch_size=settings.export_batch_size)
+        return encode_documents(docs, list(ProjectResponse.model_fields), export_format, settings.export_chunk_size)
+
+    async def import_file(
+        self,
+        user_id: str,
+        file: BinaryIO,
+        import_format: str | None,
+        filename: str | None,
+        batch_size: int,
+    ) -> AsyncIterator[bytes]:
+        """
+        Rows name their client by ``client_id``, ``client_email``, ``client_name`` or ``client``
+        (an email or a name). References resolve against every client of the user, loaded once.
+        """
+        import_format = imports.resolve_format(import_format, filename)
+        client_ids: set[str] = set()
+        by_email: dict[str, str | None] = {}
+        by_name: dict[str, str | None] = {}
+        for doc in await self.client_repository.references(user_id):
+            client_id = str(doc["_id"])
+            client_ids.add(client_id)
+            for lookup, key in ((by_email, doc.get("email")), (by_name, doc.get("name"))):
+                if key:
+                    key = key.strip().lower()
+                    # Shared names (or emails) can't identify one client; None marks them ambiguous.
+                    lookup[key] = client_id if lookup.get(key, client_id) == client_id else None
+
+        def resolve(data: dict[str, Any]) -> str:
+            if data.get("client_id"):
+                if data["client_id"] not in client_ids:
+                    return "Client not found"
+                return data["client_id"]
+            reference = data.get("client_email") or data.get("client_name") or data.get("client")
+            if not reference:
+                return "One of client_id, client_email, client_name or client is required"
+            is_email = bool(data.get("client_email")) or (not data.get("client_name") and "@" in reference)
+            key = reference.strip().lower()
+            lookup = by_email if is_email else by_name
+            if key not in lookup:
+                return f"Client not found: {reference}"
+            if lookup[key] is None:
+                return f"More than one client matches {reference!r}; use client_email or client_id"
+            return lookup[key]
+
+        def prepare(row: ImportRow, now: datetime) -> dict[str, Any] | str:
+            client_id = resolve(row.data)
+            if client_id not in client_ids:
+                return client_id
+            payload = imports.validate({**row.data, "client_id": client_id}, ProjectCreate)
+            if isinstance(payload, str):
+                return payload
+            return Project.to_document(
+                user_id=user_id,
+                client_id=client_id,
+                title=payload.title,
+                description=payload.description,
+                status=payload.status,
+                hourly_rate=payload.hourly_rate,
+                deadline=payload.deadline,
+                now=now,
+            )
+
+        async def inserted() -> None:
+            await self.versions.bump(user_id, Project.collection_name)
+            self.events.notify(user_id, reset(Project.collection_name))
+
+        return imports.run(
+            read_batches(file, import_format, batch_size),
+            prepare,
+            self.repository.insert_many,
+            inserted,
+        )
+
+    async def version(self, user_id: str) -> str:
+        return await self.versions.get(user_id, Project.collection_name)
+
+    async def board_version(self, user_id: str) -> str:
+        """Board version: it embeds client names, so client writes invalidate it too."""
+        return await self.versions.get(user_id, Project.collection_name, Client.collection_name)
+
+    async def revision(self, project_id: str, user_id: str) -> datetime:
+        updated_at = await self.repository.get_updated_at(project_id, user_id)
+        if updated_at is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+        return updated_at
+
+    @staticmethod
+    def fields(raw: str | None) -> tuple[str, ...] | None:
+        try:
+            return parse_fields(raw, ProjectResponse.model_fields)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    async def get(self, project_id: str, user_id: str, fields: tuple[str, ...] | None = None) -> Project:
+        project = await self.repository.get_by_id(project_id, user_id, fields)
         if not project:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
         return project
 
     async def update(self, project_id: str, user_id: str, payload: ProjectUpdate) -> Project:
-        update_data = payload.model_dump(exclude_unset=True)
+        update_data = payload.model_dump(exclude_unset=True, exclude={"expected_updated_at"})
+        expected = as_stored(payload.expected_updated_at) if payload.expected_updated_at else None
         if not update_data:
             return await self.get(project_id, user_id)
 
-        project = await self.repository.update(project_id, user_id, update_data)
+        project = await self.repository.update(project_id, user_id, update_data, expected)
         if not project:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+            await self._raise_missing_or_conflict(project_id, user_id, expected)
+        await self.versions.bump(user_id, Project.collection_name)
+        self.events.notify(user_id, changed("updated", project))
         return project
 
     async def update_status(self, project_id: str, user_id: str, payload: ProjectStatusUpdate) -> Project:
-        project = await self.repository.update_status(project_id, user_id, payload.status)
+        expected = as_stored(payload.expected_updated_at) if payload.expected_updated_at else None
+        project = await self.repository.update_status(project_id, user_id, payload.status, expected)
         if not project:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+            await self._raise_missing_or_conflict(project_id, user_id, expected)
+        await self.versions.bump(user_id, Project.collection_name)
+        self.events.notify(user_id, changed("updated", project))
         return project
 
+    async def _raise_missing_or_conflict(self, project_id: str, user_id: str, expected: datetime | None) -> None:
+        if expected is not None and await self.repository.exists(project_id, user_id):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Project was modified by someone else; reload and try again",
+            )
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+
     async def delete(self, project_id: str, user_id: str) -> None:
         deleted = await self.repository.delete(project_id, user_id)
         if not deleted:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+        await self.versions.bump(user_id, Project.collection_name)
+        self.events.notify(user_id, deletion(Project.collection_name, project_id))
 
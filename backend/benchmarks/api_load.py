@@ -0,0 +1,375 @@
+"""
+API load test.
+
+Runs ``app.main:app`` in-process behind httpx's ``ASGITransport`` and drives it with virtual
+users, each logged in as one of a set of seeded users. Every virtual user loops over a weighted
+mix of scenarios:
+
+- ``login``: ``POST /api/auth/login``
+- ``board``: the board page, ``GET /api/projects/board`` plus ``GET /api/clients?fields=id,name``
+- ``search``: typing a client name, one ``GET /api/clients?search=`` per keystroke
+- ``drag``: dropping a card in another column, ``PATCH /api/projects/board``
+
+The report is JSON with p50/p95/p99, error count and throughput per route template, plus run
+metadata (commit, scale, seed). Pass ``--compare`` with an earlier report to print the deltas.
+
+Run from backend/, against a disposable database (seeded data is removed afterwards):
+    MONGO_DB=clienthub_bench python -m benchmarks.api_load --users 20 --clients 50 --projects 4
+    python -m benchmarks.api_load --in-memory --duration 10 --output before.json
+    python -m benchmarks.api_load --in-memory --duration 10 --compare before.json
+
+``--in-memory`` swaps in mongomock-motor (``pip install mongomock-motor``). It is handy for
+checking the harness and app-side overhead, but its timings say nothing about a real mongod.
+mongomock cannot run ranked search, so searches stop at the short, unranked prefixes there.
+The exit status is 1 if any request failed.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+PASSWORD = "benchmark-password"
+STATUSES = ("idea", "talks", "in-progress", "review", "completed")
+NAME_WORDS = ("acme", "globex", "initech", "umbrella", "stark", "wayne", "hooli", "vandelay", "wonka", "tyrell")
+COMPANY_WORDS = ("labs", "studio", "partners", "group", "digital", "works", "systems", "media")
+DEFAULT_MIX = "board=4,search=3,drag=2,login=1"
+
+
+@dataclass
+class Seeded:
+    run_id: str
+    users: list[dict[str, str]]
+    user_ids: list[str]
+
+
+@dataclass
+class Recorder:
+    samples: dict[str, list[float]] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+
+    async def call(
+        self,
+        route: str,
+        send: Callable[[], Awaitable[httpx.Response]],
+        ok: tuple[int, ...],
+    ) -> httpx.Response:
+        started = time.perf_counter()
+        response = await send()
+        self.samples.setdefault(route, []).append((time.perf_counter() - started) * 1000)
+        if response.status_code not in ok:
+            self.errors[route] = self.errors.get(route, 0) + 1
+        return response
+
+
+@dataclass
+class VirtualUser:
+    http: httpx.AsyncClient
+    email: str
+    recorder: Recorder
+    rng: random.Random
+    board: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    client_names: list[str] = field(default_factory=list)
+    search_keystrokes: int = 6
+
+    async def login(self) -> None:
+        await self.recorder.call(
+            "POST /api/auth/login",
+            lambda: self.http.post("/api/auth/login", json={"email": self.email, "password": PASSWORD}),
+            (200,),
+        )
+
+    async def load_board(self) -> None:
+        board, clients = await asyncio.gather(
+            self.recorder.call(
+                "GET /api/projects/board", lambda: self.http.get("/api/projects/board", params={"limit": 50}), (200,)
+            ),
+            self.recorder.call(
+                "GET /api/clients", lambda: self.http.get("/api/clients", params={"fields": "id,name"}), (200,)
+            ),
+        )
+        if board.status_code == 200:
+            self.board = {column["status"]: column["items"] for column in board.json()["columns"]}
+        if clients.status_code == 200:
+            self.client_names = [client["name"] for client in clients.json()["items"]]
+
+    async def search(self) -> None:
+        word = (self.rng.choice(self.client_names) if self.client_names else self.rng.choice(NAME_WORDS)).split()[0]
+        for end in range(1, min(len(word), self.search_keystrokes) + 1):
+            await self.recorder.call(
+                "GET /api/clients?search",
+                lambda: self.http.get("/api/clients", params={"search": word[:end]}),
+                (200,),
+            )
+            await asyncio.sleep(0)
+
+    async def drag(self) -> None:
+        if not any(self.board.values()):
+            await self.load_board()
+        sources = [status for status, cards in self.board.items() if cards]
+        if not sources:
+            return
+        source = self.rng.choice(sources)
+        card = self.board[source].pop(self.rng.randrange(len(self.board[source])))
+        target = self.rng.choice([status for status in STATUSES if status != source])
+        column = self.board.setdefault(target, [])
+        move = {"id": card["id"], "status": target, "after_id": column[0]["id"] if column else None}
+        await self.recorder.call(
+            "PATCH /api/projects/board", lambda: self.http.patch("/api/projects/board", json={"moves": [move]}), (200,)
+        )
+        column.insert(0, card)
+
+
+SCENARIOS: dict[str, Callable[[VirtualUser], Awaitable[None]]] = {
+    "login": VirtualUser.login,
+    "board": VirtualUser.load_board,
+    "search": VirtualUser.search,
+    "drag": VirtualUser.drag,
+}
+
+
+def parse_mix(raw: str) -> dict[str, int]:
+    mix: dict[str, int] = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+async def seed(users: int, clients: int, projects: int, rng: random.Random) -> Seeded:
+    from app.core.clock import utcnow
+    from app.core.security import hash_password
+    from app.models.client import Client
+    from app.models.project import Project
+    from app.models.user import User
+    from app.repositories.client_repository import ClientRepository
+    from app.repositories.project_repository import ProjectRepository
+    from app.repositories.user_repository import UserRepository
+
+    run_id = uuid.uuid4().hex[:8]
+    password_hash = hash_password(PASSWORD)  # bcrypt once; every seeded user shares the password
+    now = utcnow()
+    user_docs = [
+        User.to_document(email=f"load-{run_id}-{index}@example.com", password_hash=password_hash, now=now)
+        for index in range(users)
+    ]
+    await UserRepository().collection.insert_many(user_docs)
+    user_ids = [str(doc["_id"]) for doc in user_docs]
+
+    client_collection = ClientRepository().collection
+    project_collection = ProjectRepository().collection
+    for user_id in user_ids:
+        client_docs = [
+            Client.to_document(
+                user_id=user_id,
+                name=f"{rng.choice(NAME_WORDS).title()} {rng.choice(COMPANY_WORDS).title()} {index}",
+                email=f"contact{index}@example.com",
+                company=f"{rng.choice(NAME_WORDS).title()} {rng.choice(COMPANY_WORDS).title()}",
+                now=now - timedelta(minutes=index),
+            )
+            for index in range(clients)
+        ]
+        await client_collection.insert_many(client_docs)
+        project_docs = [
+            Project.to_document(
+                user_id=user_id,
+                client_id=str(client["_id"]),
+                title=f"Project {index}",
+                status=rng.choice(STATUSES),
+                hourly_rate=float(rng.randrange(40, 200)),
+                deadline=now + timedelta(days=rng.randrange(-10, 60)),
+                now=now - timedelta(seconds=index),
+            )
+            for client in client_docs
+            for index in range(projects)
+        ]
+        if project_docs:
+            await project_collection.insert_many(project_docs)
+    return Seeded(run_id, [{"email": doc["email"]} for doc in user_docs], user_ids)
+
+
+async def cleanup(seeded: Seeded) -> None:
+    from app.repositories.client_repository import ClientRepository
+    from app.repositories.project_repository import ProjectRepository
+    from app.repositories.user_repository import UserRepository
+    from app.repositories.version_repository import VersionRepository
+
+    owned = {"user_id": {"$in": seeded.user_ids}}
+    await ProjectRepository().collection.delete_many(owned)
+    await ClientRepository().collection.delete_many(owned)
+    await VersionRepository().collection.delete_many({"_id": {"$in": seeded.user_ids}})
+    await UserRepository().collection.delete_many({"email": {"$regex": f"^load-{seeded.run_id}-"}})
+
+
+async def virtual_user(
+    app: Any,
+    email: str,
+    mix: dict[str, int],
+    rng: random.Random,
+    recorder: Recorder,
+    deadline: float,
+    search_keystrokes: int,
+) -> None:
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    # https so the session cookie is sent even when it is marked Secure.
+    async with httpx.AsyncClient(transport=transport, base_url="https://bench") as http:
+        user = VirtualUser(http, email, recorder, rng, search_keystrokes=search_keystrokes)
+        await user.login()
+        await user.load_board()
+        names, weights = list(mix), list(mix.values())
+        while time.perf_counter() < deadline:
+            await SCENARIOS[rng.choices(names, weights)[0]](user)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict[str, Any]:
+    routes = {}
+    for route, samples in sorted(recorder.samples.items()):
+        routes[route] = {
+            "requests": len(samples),
+            "errors": recorder.errors.get(route, 0),
+            "throughput_rps": round(len(samples) / elapsed, 2),
+            "mean_ms": round(statistics.fmean(samples), 3),
+            "p50_ms": round(percentile(samples, 50), 3),
+            "p95_ms": round(percentile(samples, 95), 3),
+            "p99_ms": round(percentile(samples, 99), 3),
+        }
+    total = sum(route["requests"] for route in routes.values())
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "requests": total,
+        "errors": sum(recorder.errors.values()),
+        "throughput_rps": round(total / elapsed, 2),
+        "routes": routes,
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> None:
+    print(f"{'route':<28} {'p50 ms':>18} {'p95 ms':>18} {'p99 ms':>18} {'rps':>18}", file=sys.stderr)
+    for route, now in current["results"]["routes"].items():
+        before = baseline["results"]["routes"].get(route)
+        if before is None:
+            continue
+        cells = [f"{before[key]:.1f} -> {now[key]:.1f}" for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")]
+        print(f"{route:<28} {' '.join(f'{cell:>18}' for cell in cells)}", file=sys.stderr)
+
+
+async def main(args: argparse.Namespace) -> dict[str, Any]:
+    search_keystrokes = 6
+    if args.in_memory:
+        from mongomock.collection import BulkOperationBuilder
+        from mongomock_motor import AsyncMongoMockClient
+
+        import app.db.mongo
+
+        from app.core.search import MIN_RANKED_LENGTH
+        from app.core.settings import get_settings
+
+        add_update = BulkOperationBuilder.add_update
+
+        def add_update_without_sort(self, *args, sort=None, **kwargs):  # type: ignore[no-untyped-def]
+            # pymongo 4.11+ passes ``sort`` for every bulk UpdateOne; mongomock predates it.
+            return add_update(self, *args, **kwargs)
+
+        # As in the tests: mongomock has no transactions or change streams (services publish live
+        # events themselves), and cannot run the ranked search aggregation.
+        BulkOperationBuilder.add_update = add_update_without_sort
+        app.db.mongo._client = AsyncMongoMockClient()
+        app.db.mongo._supports_transactions = False
+        get_settings().events_change_streams = False
+        search_keystrokes = MIN_RANKED_LENGTH - 1
+
+    from app.main import app
+
+    rng = random.Random(args.seed)
+    mix = parse_mix(args.mix)
+    async with app.router.lifespan_context(app):
+        # Every virtual user logs in from the same address; measure the app, not the login throttle.
+        app.state.container.rate_limiter.enabled = False
+        seeded = await seed(args.users, args.clients, args.projects, rng)
+        try:
+            recorder = Recorder()
+            started = time.perf_counter()
+            deadline = started + args.duration
+            emails = [seeded.users[index % len(seeded.users)]["email"] for index in range(args.concurrency)]
+            await asyncio.gather(
+                *(
+                    virtual_user(app, email, mix, random.Random(rng.random()), recorder, deadline, search_keystrokes)
+                    for email in emails
+                )
+            )
+            elapsed = time.perf_counter() - started
+        finally:
+            await cleanup(seeded)
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "backend": "mongomock" if args.in_memory else "mongod",
+            "seed": args.seed,
+            "users": args.users,
+            "clients_per_user": args.clients,
+            "projects_per_client": args.projects,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "mix": mix,
+            "search_keystrokes": search_keystrokes,
+        },
+        "results": summarize(recorder, elapsed),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.api_load")
+    parser.add_argument("--users", type=int, default=10, help="seeded users")
+    parser.add_argument("--clients", type=int, default=50, help="clients per user")
+    parser.add_argument("--projects", type=int, default=4, help="projects per client")
+    parser.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of load")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--in-memory", action="store_true", help="use mongomock-motor instead of MONGO_URI")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="earlier JSON report to diff against (printed to stderr)")
+    args = parser.parse_args()
+
+    report = asyncio.run(main(args))
+    body = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(body + "\n")
+    else:
+        print(body)
+    if args.compare:
+        with open(args.compare) as handle:
+            compare(json.load(handle), report)
+    failed = {route: result["errors"] for route, result in report["results"]["routes"].items() if result["errors"]}
+    if failed:
+        print(f"Requests failed: {failed}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,104 @@
+"""
+Response compression benchmark.
+
+Builds representative response bodies (client and project pages at the default and maximum
+page size, a sparse ``fields=id,name`` page, a full board and an NDJSON export) and compresses
+each with every available encoding over a range of levels. For each it reports CPU time,
+compressed size, and the transfer time saved on a slow link, which is what ``LEVELS`` in
+``app.core.compression`` is tuned against. Pure CPU; no database needed.
+
+Run from backend/ (install the ``compression`` extra for zstd and brotli):
+    python -m benchmarks.compression --link-mbps 5
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app.core.compression import ENCODERS, LEVELS, compress, level_for
+from app.core.serialization import as_dict, dumps, page, select
+from app.models.project import Project
+from app.schema.client import ClientResponse
+from app.schema.project import ProjectResponse
+from benchmarks.models import make_documents
+from benchmarks.serialization import make_clients
+
+CLIENT_FIELDS = tuple(ClientResponse.model_fields)
+PROJECT_FIELDS = tuple(ProjectResponse.model_fields)
+STATUSES = ("idea", "talks", "in-progress", "review", "completed")
+LEVELS_TRIED = {"gzip": (1, 4, 6, 9), "br": (1, 2, 4, 5, 6, 9), "zstd": (1, 3, 6, 9, 12)}
+
+
+def make_projects(count: int) -> list[Project]:
+    documents = make_documents(count)
+    started = datetime(2024, 1, 1)
+    for index, document in enumerate(documents):
+        document["status"] = STATUSES[index % len(STATUSES)]
+        document["client_id"] = str(ObjectId())
+        document["description"] = "Landing page refresh and CMS migration." if index % 3 else None
+        document["deadline"] = started + timedelta(days=index % 90)
+        document["position"] = f"a{index:05d}"
+    return [Project.from_document(document) for document in documents]
+
+
+def payloads() -> dict[str, bytes]:
+    clients = make_clients(10_000)
+    projects = make_projects(250)
+    board = {
+        "columns": [
+            {
+                "status": status,
+                "count": 50,
+                "items": [as_dict(project, PROJECT_FIELDS) for project in projects if project.status == status],
+                "next_cursor": None,
+            }
+            for status in STATUSES
+        ]
+    }
+    export = b"".join(dumps(as_dict(client, CLIENT_FIELDS)) + b"\n" for client in clients)
+    return {
+        "clients?fields=id,name (50)": page(clients[:50], select(CLIENT_FIELDS, ["name"]), None).body,
+        "clients (50)": page(clients[:50], CLIENT_FIELDS, "cursor").body,
+        "clients (200)": page(clients[:200], CLIENT_FIELDS, "cursor").body,
+        "projects (200)": page(projects[:200], PROJECT_FIELDS, "cursor").body,
+        "board (5x50)": dumps(board),
+        "clients export (10k)": export,
+    }
+
+
+def best_of(encoding: str, body: bytes, level: int, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(compress(encoding, body, level))
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compression")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--link-mbps", type=float, default=5.0, help="Link speed used for the transfer saving")
+    args = parser.parse_args()
+    bytes_per_ms = args.link_mbps * 1_000_000 / 8 / 1000
+
+    for name, body in payloads().items():
+        print(f"\n{name}: {len(body):,} bytes, {len(body) / bytes_per_ms:.1f} ms at {args.link_mbps:g} Mbit/s")
+        print(f"  {'encoding':<8} {'level':>5} {'cpu ms':>8} {'bytes':>10} {'ratio':>6} {'saved ms':>9}")
+        for encoding in ENCODERS:
+            chosen = level_for(encoding, len(body))
+            for level in LEVELS_TRIED[encoding]:
+                cpu_ms, size = best_of(encoding, body, level, args.repeat)
+                saved_ms = (len(body) - size) / bytes_per_ms - cpu_ms
+                marker = " <" if level == chosen else ""
+                print(
+                    f"  {encoding:<8} {level:>5} {cpu_ms:>8.2f} {size:>10,} {len(body) / size:>5.1f}x"
+                    f" {saved_ms:>9.1f}{marker}"
+                )
+    print(f"\n< marks the level the middleware picks; steps: {LEVELS}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Per-request dependency overhead benchmark.
+
+Times what FastAPI does for an authenticated request before the endpoint body runs, with the
+principal cache warm so no query is made:
+
+- ``legacy``: the old wiring, ``UserRepository`` and ``ClientService`` built by ``Depends()``
+  on every request. Each is a sync constructor, so FastAPI runs it in the threadpool, and each
+  builds fresh Motor collection objects.
+- ``container``: repositories and services shared from ``app.state.container``, handed out by
+  async getters; only the principal lookup remains per request.
+
+Requests go through httpx's ``ASGITransport`` to a one-route app, so the numbers are the
+dependency graph plus routing, not database time. The Motor client never connects.
+
+Run from backend/:
+    python -m benchmarks.dependencies --requests 5000 --concurrency 1 16
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.container import Container
+from app.core.dependencies import get_client_service, get_current_user, get_user_repository
+from app.core.principal_cache import principal_cache
+from app.core.security import create_access_token, decode_access_token
+from app.repositories.user_repository import UserRepository
+from app.schema.auth import UserResponse
+from app.services.client_service import ClientService
+
+USER = UserResponse(id="0" * 24, email="bench@example.com", full_name="Bench")
+
+
+# What ``Depends()`` on the classes used to do: a sync call, run in the threadpool.
+def legacy_user_repository() -> UserRepository:
+    return UserRepository()
+
+
+def legacy_client_service() -> ClientService:
+    return ClientService()
+
+
+def build_app(mode: str, container: Container) -> FastAPI:
+    app = FastAPI()
+    app.state.container = container
+
+    @app.get("/probe")
+    async def probe(
+        current_user: UserResponse = Depends(get_current_user),
+        service: ClientService = Depends(get_client_service),
+    ) -> dict[str, str]:
+        return {"id": current_user.id}
+
+    if mode == "legacy":
+        app.dependency_overrides[get_user_repository] = legacy_user_repository
+        app.dependency_overrides[get_client_service] = legacy_client_service
+    return app
+
+
+async def run(app: FastAPI, token: str, requests: int, concurrency: int) -> list[float]:
+    samples: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+    cookies = {"access_token": token}
+    async with httpx.AsyncClient(transport=transport, base_url="https://bench", cookies=cookies) as client:
+
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                started = time.perf_counter()
+                response = await client.get("/probe")
+                samples.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        share, extra = divmod(requests, concurrency)
+        await asyncio.gather(*(worker(share + (index < extra)) for index in range(concurrency)))
+    return samples
+
+
+def construction(container: Container, repeat: int) -> dict[str, float]:
+    """Microseconds to obtain the request's objects, outside FastAPI."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        UserRepository()
+        ClientService()
+    legacy_us = (time.perf_counter() - started) / repeat * 1e6
+    started = time.perf_counter()
+    for _ in range(repeat):
+        container.user_repository
+        container.client_service
+    container_us = (time.perf_counter() - started) / repeat * 1e6
+    return {"legacy": legacy_us, "container": container_us}
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    import app.db.mongo as mongo
+
+    mongo._client = AsyncIOMotorClient("mongodb://127.0.0.1:1", connect=False)
+    container = Container(mongo.get_database())
+    token = create_access_token(USER.id)
+    principal_cache.put(token, USER, decode_access_token(token).get("exp"))
+
+    built = construction(container, args.repeat)
+    print(f"object construction per request: legacy {built['legacy']:.1f} us, container {built['container']:.2f} us")
+    print(f"{'mode':>10} {'conc':>5} {'mean us':>9} {'p50 us':>8} {'p99 us':>8} {'req/s':>8}")
+    for concurrency in args.concurrency:
+        for mode in ("legacy", "container"):
+            app = build_app(mode, container)
+            await run(app, token, min(args.requests, 200), concurrency)  # warm up
+            started = time.perf_counter()
+            samples = await run(app, token, args.requests, concurrency)
+            elapsed = time.perf_counter() - started
+            ordered = sorted(samples)
+            print(
+                f"{mode:>10} {concurrency:>5} {statistics.fmean(samples) * 1e6:>9.0f}"
+                f" {ordered[len(ordered) // 2] * 1e6:>8.0f} {ordered[int(len(ordered) * 0.99)] * 1e6:>8.0f}"
+                f" {len(samples) / elapsed:>8.0f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.dependencies")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--repeat", type=int, default=20_000, help="Iterations for the construction timing")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Login storm benchmark.
+
+Measures client-list latency while concurrent logins are hashing passwords, once with
+bcrypt running inline on the event loop (the old behaviour) and once through the
+bounded password-hashing pool.
+
+Run from backend/ against a disposable database:
+    MONGO_DB=clienthub_bench python -m benchmarks.login_storm --logins 8 --duration 5
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+
+from fastapi import HTTPException
+
+from app.core.clock import utcnow
+from app.core.security import hash_password, password_hasher, verify_password
+from app.models.client import Client
+from app.models.user import User
+from app.repositories.client_repository import ClientRepository
+from app.repositories.user_repository import UserRepository
+from app.schema.auth import LoginRequest
+from app.services.auth_service import AuthService
+from app.services.client_service import ClientService
+
+PASSWORD = "benchmark-password"
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def probe(user_id: str, stop: asyncio.Event) -> list[float]:
+    service = ClientService()
+    samples: list[float] = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        # Yield first so time spent waiting for a blocked event loop counts against the request.
+        await asyncio.sleep(0)
+        await service.list(user_id, limit=50)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+async def login_loop(email: str, mode: str, stop: asyncio.Event, outcome: dict[str, int]) -> None:
+    service = AuthService()
+    repository = UserRepository()
+    while not stop.is_set():
+        if mode == "inline":
+            user = await repository.get_by_email(email)
+            verify_password(PASSWORD, user.password_hash)
+            outcome["ok"] += 1
+            await asyncio.sleep(0)
+            continue
+        try:
+            await service.authenticate(LoginRequest(email=email, password=PASSWORD))
+            outcome["ok"] += 1
+        except HTTPException as exc:
+            outcome[str(exc.status_code)] = outcome.get(str(exc.status_code), 0) + 1
+            await asyncio.sleep(0.01)
+
+
+async def run_mode(mode: str, user_id: str, email: str, logins: int, duration: float) -> dict:
+    stop = asyncio.Event()
+    outcome = {"ok": 0}
+    probe_task = asyncio.create_task(probe(user_id, stop))
+    storm = [asyncio.create_task(login_loop(email, mode, stop, outcome)) for _ in range(logins if mode != "idle" else 0)]
+    await asyncio.sleep(duration)
+    stop.set()
+    samples = await probe_task
+    await asyncio.gather(*storm)
+    return {
+        "mode": mode,
+        "list_requests": len(samples),
+        "list_p50_ms": round(statistics.median(samples), 2) if samples else 0.0,
+        "list_p95_ms": round(percentile(samples, 95), 2),
+        "list_max_ms": round(max(samples), 2) if samples else 0.0,
+        "logins": outcome,
+    }
+
+
+async def main(logins: int, duration: float, clients: int) -> None:
+    users = UserRepository()
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    user = await users.insert(User.to_document(email=email, password_hash=hash_password(PASSWORD)))
+    client_repository = ClientRepository()
+    now = utcnow()
+    await client_repository.collection.insert_many(
+        [Client.to_document(user_id=user.id, name=f"Client {i}", now=now) for i in range(clients)]
+    )
+    try:
+        results = [await run_mode(mode, user.id, email, logins, duration) for mode in ("idle", "inline", "pooled")]
+    finally:
+        await client_repository.collection.delete_many({"user_id": user.id})
+        await users.delete(user.id)
+        password_hasher.shutdown()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=8, help="concurrent login loops")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per mode")
+    parser.add_argument("--clients", type=int, default=200, help="clients seeded for the list probe")
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.duration, args.clients))
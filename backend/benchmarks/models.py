@@ -0,0 +1,87 @@
+"""
+Model footprint benchmark.
+
+Loads N project documents into the slotted ``Project`` model and into a copy of the previous
+dict-backed model, and reports construction time and memory retained per instance (the
+documents themselves are excluded). Pure CPU; no database needed.
+
+Run from backend/:
+    python -m benchmarks.models --count 100000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from bson import ObjectId
+
+from app.models.project import Project
+
+
+class LegacyProject:
+    """The pre-slots model: per-instance __dict__ and two eager clock reads per construction."""
+
+    def __init__(self, data: dict[str, Any]):
+        self.id: str = str(data.get("_id")) if data.get("_id") else data.get("id")
+        self.user_id: str = data["user_id"]
+        self.client_id: str = data["client_id"]
+        self.title: str = data["title"]
+        self.description: str | None = data.get("description")
+        self.status: str = data.get("status", "idea")
+        self.hourly_rate: float | None = data.get("hourly_rate")
+        self.deadline: datetime | None = data.get("deadline")
+        self.position: str | None = data.get("position")
+        self.created_at: datetime = data.get("created_at", datetime.utcnow())
+        self.updated_at: datetime = data.get("updated_at", datetime.utcnow())
+
+
+def make_documents(count: int) -> list[dict[str, Any]]:
+    started = datetime(2024, 1, 1)
+    return [
+        {
+            "_id": ObjectId(),
+            "user_id": "bench",
+            "client_id": "client",
+            "title": f"Project {index}",
+            "description": None,
+            "status": "in-progress",
+            "hourly_rate": 95.0,
+            "deadline": None,
+            "position": "i",
+            "created_at": started + timedelta(seconds=index),
+            "updated_at": started + timedelta(seconds=index),
+        }
+        for index in range(count)
+    ]
+
+
+def measure(build: Callable[[dict[str, Any]], Any], documents: list[dict[str, Any]]) -> tuple[float, float]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    models = [build(doc) for doc in documents]
+    elapsed = time.perf_counter() - started
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del models
+    return elapsed * 1000, retained / len(documents)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.models")
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    documents = make_documents(args.count)
+    legacy_ms, legacy_bytes = measure(LegacyProject, documents)
+    slotted_ms, slotted_bytes = measure(Project.from_document, documents)
+    print(f"{args.count} projects   build ms   bytes/instance   MB total")
+    for label, ms, per in (("dict-backed", legacy_ms, legacy_bytes), ("slotted", slotted_ms, slotted_bytes)):
+        print(f"{label:<14} {ms:>12.1f} {per:>16.0f} {per * args.count / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
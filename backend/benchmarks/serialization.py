@@ -0,0 +1,102 @@
+"""
+List serialization benchmark.
+
+Compares the old response path (a ``ClientResponse`` built per item with ``.isoformat()``,
+re-validated against the ``response_model``, run through ``jsonable_encoder`` and ``json.dumps``)
+with the orjson path in ``app.core.serialization``. Pure CPU; no database needed.
+
+Run from backend/:
+    python -m benchmarks.serialization --sizes 1000 10000 100000
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.serialization import page, select
+from app.models.client import Client
+from app.schema.client import ClientPage, ClientResponse
+
+CLIENT_FIELDS = tuple(ClientResponse.model_fields)
+_page_adapter = TypeAdapter(ClientPage)
+
+
+def make_clients(count: int) -> list[Client]:
+    started = datetime(2024, 1, 1)
+    return [
+        Client.from_document(
+            {
+                "_id": ObjectId(),
+                "user_id": "bench",
+                "name": f"Client {index}",
+                "email": f"client{index}@example.com",
+                "phone": "+1 555 0100",
+                "company": f"Company {index % 97}",
+                "notes": "Prefers email. Invoices net 30." * 4,
+                "created_at": started + timedelta(seconds=index),
+                "updated_at": started + timedelta(seconds=index, milliseconds=250),
+            }
+        )
+        for index in range(count)
+    ]
+
+
+def legacy(clients: list[Client]) -> bytes:
+    items = [
+        ClientResponse(
+            id=c.id,
+            name=c.name,
+            email=c.email,
+            phone=c.phone,
+            company=c.company,
+            notes=c.notes,
+            created_at=c.created_at.isoformat(),
+            updated_at=c.updated_at.isoformat(),
+        )
+        for c in clients
+    ]
+    validated = _page_adapter.validate_python(ClientPage(items=items, next_cursor=None), from_attributes=True)
+    content = jsonable_encoder(validated)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def orjson_path(clients: list[Client]) -> bytes:
+    return page(clients, select(CLIENT_FIELDS), None).body
+
+
+def timed(fn, clients: list[Client], repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn(clients)
+        best = min(best, time.perf_counter() - started)
+        size = len(body)
+    return best * 1000, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serialization")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sample = make_clients(3)
+    if json.loads(legacy(sample)) != json.loads(orjson_path(sample)):
+        raise SystemExit("orjson path produced a different body from the legacy path")
+    print(f"{'items':>8} {'legacy ms':>10} {'orjson ms':>10} {'speedup':>8} {'bytes':>10}")
+    for count in args.sizes:
+        clients = make_clients(count)
+        legacy_ms, legacy_size = timed(legacy, clients, args.repeat)
+        fast_ms, fast_size = timed(orjson_path, clients, args.repeat)
+        print(f"{count:>8} {legacy_ms:>10.1f} {fast_ms:>10.1f} {legacy_ms / fast_ms:>7.1f}x {fast_size:>10}")
+        if legacy_size != fast_size:
+            print(f"{'':>8} body size differs: legacy {legacy_size} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Shared fixtures.
+
+API tests run the real app in-process against mongomock-motor, an in-memory stand-in for
+Mongo, so no server is needed. Features it lacks (transactions, change streams) are switched
+off, as they are on a standalone server. Tests that need a real server (query plans,
+``$lookup`` with ``let``) use the ``mongod`` fixture, which skips when MONGO_URI is unreachable.
+"""
+import os
+from functools import lru_cache
+from typing import AsyncIterator
+
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from mongomock.collection import BulkOperationBuilder  # noqa: E402
+from mongomock_motor import AsyncMongoMockClient  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase  # noqa: E402
+from pymongo import MongoClient  # noqa: E402
+from pymongo.errors import PyMongoError  # noqa: E402
+
+import app.db.mongo  # noqa: E402
+from app.core.settings import get_settings  # noqa: E402
+from app.db.indexes import ensure_indexes  # noqa: E402
+
+PASSWORD = "correct-horse-battery"
+
+_add_update = BulkOperationBuilder.add_update
+
+
+def _add_update_without_sort(self, *args, sort=None, **kwargs):  # type: ignore[no-untyped-def]
+    # pymongo 4.11+ passes ``sort`` for every bulk UpdateOne; mongomock predates it.
+    assert sort is None, "mongomock cannot sort bulk updates"
+    return _add_update(self, *args, **kwargs)
+
+
+BulkOperationBuilder.add_update = _add_update_without_sort
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+def database(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Point the app at an empty in-memory database."""
+    monkeypatch.setattr(app.db.mongo, "_client", AsyncMongoMockClient())
+    monkeypatch.setattr(app.db.mongo, "_supports_transactions", False)
+    monkeypatch.setattr(get_settings(), "events_change_streams", False)
+
+
+@lru_cache
+def server_available() -> bool:
+    client: MongoClient = MongoClient(get_settings().mongo_uri, serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        return False
+    finally:
+        client.close()
+    return True
+
+
+@pytest.fixture
+async def mongod(request: pytest.FixtureRequest) -> AsyncIterator[AsyncIOMotorDatabase]:
+    """A scratch database with the declared indexes on the MONGO_URI server, dropped afterwards."""
+    settings = get_settings()
+    if not server_available():
+        pytest.skip(f"no MongoDB server at {settings.mongo_uri}")
+    client: AsyncIOMotorClient = AsyncIOMotorClient(settings.mongo_uri)
+    database = client[f"{settings.mongo_db}_{request.module.__name__.rpartition('.')[2]}"]
+    await ensure_indexes(database)
+    try:
+        yield database
+    finally:
+        await client.drop_database(database.name)
+        client.close()
+
+
+@pytest.fixture
+async def api(database: None) -> AsyncIterator[httpx.AsyncClient]:
+    """An HTTP client for a fresh app and an empty database."""
+    from app.main import app as application
+
+    async with application.router.lifespan_context(application):
+        application.state.container.rate_limiter.enabled = False
+        transport = httpx.ASGITransport(app=application)
+        async with httpx.AsyncClient(transport=transport, base_url="https://test") as client:
+            yield client
+
+
+async def sign_in(api: httpx.AsyncClient, email: str = "freelancer@example.com") -> None:
+    response = await api.post("/api/auth/register", json={"email": email, "password": PASSWORD, "full_name": "F"})
+    assert response.status_code == 200, response.text
+    response = await api.post("/api/auth/login", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+
+
+@pytest.fixture
+async def user(api: httpx.AsyncClient) -> httpx.AsyncClient:
+    """``api``, signed in as a newly registered user."""
+    await sign_in(api)
+    return api
+
+
+@pytest.fixture
+async def admin(api: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch) -> httpx.AsyncClient:
+    """``api``, signed in as a user listed in ``ADMIN_EMAILS``."""
+    monkeypatch.setattr(get_settings(), "admin_emails", ["admin@example.com"])
+    await sign_in(api, "admin@example.com")
+    return api
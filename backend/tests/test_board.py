@@ -0,0 +1,74 @@
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_client(api: httpx.AsyncClient) -> str:
+    response = await api.post("/api/clients", json={"name": "Acme"})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+async def column(api: httpx.AsyncClient, status: str) -> list[str]:
+    response = await api.get(f"/api/projects/board?status={status}")
+    assert response.status_code == 200, response.text
+    return [item["title"] for item in response.json()["columns"][0]["items"]]
+
+
+async def test_move_between_cards_of_one_bulk_create(user: httpx.AsyncClient) -> None:
+    ids = await bulk_create(user, "ABC")
+    board = await column(user, "idea")
+    first, second, third = board
+
+    move = {"id": ids[third], "status": "idea", "before_id": ids[first], "after_id": ids[second]}
+    response = await user.patch("/api/projects/board", json={"moves": [move]})
+    assert response.status_code == 200, response.text
+    assert await column(user, "idea") == [first, third, second]
+
+
+async def bulk_create(api: httpx.AsyncClient, titles: str, status: str = "idea") -> dict[str, str]:
+    client_id = await create_client(api)
+    created = await api.post(
+        "/api/projects/bulk",
+        json={"create": [{"client_id": client_id, "title": title, "status": status} for title in titles]},
+    )
+    assert created.status_code == 200, created.text
+    return {titles[item["index"]]: item["id"] for item in created.json()["results"]}
+
+
+async def test_move_with_only_before_id_lands_directly_below_it(user: httpx.AsyncClient) -> None:
+    ids = await bulk_create(user, "ABCD")
+    board = await column(user, "idea")
+    top, last = board[0], board[-1]
+
+    move = {"id": ids[last], "status": "idea", "before_id": ids[top]}
+    response = await user.patch("/api/projects/board", json={"moves": [move]})
+    assert response.status_code == 200, response.text
+    assert await column(user, "idea") == [top, last, *board[1:-1]]
+
+
+async def test_move_with_only_after_id_lands_directly_above_it(user: httpx.AsyncClient) -> None:
+    ids = await bulk_create(user, "ABCD")
+    board = await column(user, "idea")
+    top, last = board[0], board[-1]
+
+    move = {"id": ids[top], "status": "idea", "after_id": ids[last]}
+    response = await user.patch("/api/projects/board", json={"moves": [move]})
+    assert response.status_code == 200, response.text
+    assert await column(user, "idea") == [*board[1:-1], top, last]
+
+
+async def test_one_sided_moves_in_one_batch_see_each_other(user: httpx.AsyncClient) -> None:
+    ids = await bulk_create(user, "ABCD")
+    board = await column(user, "idea")
+    top = board[0]
+    first, second = board[2], board[3]
+
+    moves = [
+        {"id": ids[first], "status": "idea", "before_id": ids[top]},
+        {"id": ids[second], "status": "idea", "before_id": ids[top]},
+    ]
+    response = await user.patch("/api/projects/board", json={"moves": moves})
+    assert response.status_code == 200, response.text
+    assert await column(user, "idea") == [top, second, first, board[1]]
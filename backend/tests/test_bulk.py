@@ -0,0 +1,98 @@
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Sequence
+
+import httpx
+import pytest
+from bson import ObjectId
+
+from app.core.clock import utcnow
+from app.main import app
+
+pytestmark = pytest.mark.anyio
+
+
+async def bulk(api: httpx.AsyncClient, **body: Any) -> list[tuple[str, int, int]]:
+    response = await api.post("/api/clients/bulk", json=body)
+    assert response.status_code == 200, response.text
+    return [(item["op"], item["index"], item["status"]) for item in response.json()["results"]]
+
+
+async def create(api: httpx.AsyncClient, *names: str) -> list[str]:
+    response = await api.post("/api/clients/bulk", json={"create": [{"name": name} for name in names]})
+    return [item["id"] for item in response.json()["results"]]
+
+
+async def test_each_item_gets_its_own_result(user: httpx.AsyncClient) -> None:
+    kept, removed = await create(user, "Kept", "Removed")
+    results = await bulk(
+        user,
+        create=[{"name": "New"}, {"name": ""}],
+        update=[{"id": kept, "company": "Acme"}, {"id": str(ObjectId()), "name": "Ghost"}, {"name": "No id"}],
+        delete=[removed, "not-an-id"],
+    )
+    assert results == [
+        ("create", 0, 201),
+        ("create", 1, 422),
+        ("update", 0, 200),
+        ("update", 1, 404),
+        ("update", 2, 422),
+        ("delete", 0, 204),
+        ("delete", 1, 422),
+    ]
+    response = await user.get(f"/api/clients/{kept}")
+    assert response.json()["company"] == "Acme"
+    assert (await user.get(f"/api/clients/{removed}")).status_code == 404
+
+
+async def test_stale_expected_updated_at_is_a_conflict(user: httpx.AsyncClient) -> None:
+    (client_id,) = await create(user, "Acme")
+    stale = "2000-01-01T00:00:00Z"
+    results = await bulk(user, update=[{"id": client_id, "name": "Renamed", "expected_updated_at": stale}])
+    assert results == [("update", 0, 409)]
+
+
+Write = Callable[[Any], Awaitable[None]]
+
+
+@pytest.fixture
+def interleave(monkeypatch: pytest.MonkeyPatch) -> Callable[[Write], None]:
+    """Run a write against the clients collection between the bulk endpoint's read and its write."""
+
+    def install(write: Write) -> None:
+        repository = app.state.container.client_repository
+        bulk_write = repository.bulk_write
+
+        async def racing(operations: Sequence[Any], session: Any = None) -> Any:
+            await write(repository.collection)
+            return await bulk_write(operations, session)
+
+        monkeypatch.setattr(repository, "bulk_write", racing)
+
+    return install
+
+
+async def test_update_that_loses_a_race_reports_409(user: httpx.AsyncClient, interleave: Any) -> None:
+    (client_id,) = await create(user, "Acme")
+    current = (await user.get(f"/api/clients/{client_id}")).json()["updated_at"]
+
+    async def concurrent_edit(collection: Any) -> None:
+        changes = {"name": "Theirs", "updated_at": utcnow() + timedelta(seconds=1)}
+        await collection.update_one({"_id": ObjectId(client_id)}, {"$set": changes})
+
+    interleave(concurrent_edit)
+    results = await bulk(user, update=[{"id": client_id, "name": "Mine", "expected_updated_at": current}])
+    assert results == [("update", 0, 409)]
+    assert (await user.get(f"/api/clients/{client_id}")).json()["name"] == "Theirs"
+
+
+async def test_update_of_a_concurrently_deleted_document_reports_404(
+    user: httpx.AsyncClient, interleave: Any
+) -> None:
+    first, second = await create(user, "First", "Second")
+
+    async def concurrent_delete(collection: Any) -> None:
+        await collection.delete_one({"_id": ObjectId(first)})
+
+    interleave(concurrent_delete)
+    results = await bulk(user, update=[{"id": first, "name": "Mine"}, {"id": second, "name": "Also mine"}])
+    assert results == [("update", 0, 404), ("update", 1, 200)]
@@ -0,0 +1,118 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import httpx
+import pytest
+from bson import ObjectId
+
+from app.db.mongo import get_database
+from app.db.orphans import OrphanSweeper, purge_orphans
+from app.main import app
+from app.models.project import Project
+from app.services import client_service
+
+pytestmark = pytest.mark.anyio
+
+
+async def client_with_projects(api: httpx.AsyncClient, name: str, *titles: str) -> str:
+    client_id = (await api.post("/api/clients", json={"name": name})).json()["id"]
+    for title in titles:
+        response = await api.post("/api/projects", json={"client_id": client_id, "title": title})
+        assert response.status_code == 201, response.text
+    return client_id
+
+
+async def project_titles(api: httpx.AsyncClient) -> list[str]:
+    response = await api.get("/api/projects?fields=title")
+    return sorted(project["title"] for project in response.json()["items"])
+
+
+@pytest.fixture
+def transactions(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Record each transaction the client service opens; mongomock has none, so the session stays None."""
+    opened: list[str] = []
+
+    @asynccontextmanager
+    async def transaction() -> AsyncIterator[None]:
+        opened.append("open")
+        yield None
+        opened.append("commit")
+
+    monkeypatch.setattr(client_service, "transaction", transaction)
+    return opened
+
+
+async def test_delete_removes_the_clients_projects(user: httpx.AsyncClient, transactions: list[str]) -> None:
+    doomed = await client_with_projects(user, "Doomed", "Site", "Shop")
+    await client_with_projects(user, "Kept", "Logo")
+
+    assert (await user.delete(f"/api/clients/{doomed}")).status_code == 204
+
+    assert await project_titles(user) == ["Logo"]
+    assert transactions == ["open", "commit"]
+
+
+async def test_bulk_delete_removes_the_clients_projects(user: httpx.AsyncClient, transactions: list[str]) -> None:
+    first = await client_with_projects(user, "First", "Site")
+    second = await client_with_projects(user, "Second", "Shop")
+    await client_with_projects(user, "Kept", "Logo")
+
+    response = await user.post("/api/clients/bulk", json={"delete": [first, second]})
+
+    assert [item["status"] for item in response.json()["results"]] == [204, 204]
+    assert await project_titles(user) == ["Logo"]
+    assert transactions == ["open", "commit"]
+
+
+async def orphan(user_id: str, title: str, client_id: str | None = None) -> None:
+    document = Project.to_document(user_id=user_id, client_id=client_id or str(ObjectId()), title=title)
+    await get_database()[Project.collection_name].insert_one(document)
+
+
+async def current_user_id(api: httpx.AsyncClient) -> str:
+    return (await api.get("/api/auth/me")).json()["id"]
+
+
+async def test_purge_orphans_dry_run_only_counts(user: httpx.AsyncClient) -> None:
+    user_id = await current_user_id(user)
+    await client_with_projects(user, "Kept", "Logo")
+    await orphan(user_id, "Lost")
+
+    assert await purge_orphans(get_database(), batch_size=1, pause=0, dry_run=True) == {user_id: 1}
+    assert await project_titles(user) == ["Logo", "Lost"]
+
+
+async def test_purge_orphans_deletes_them_and_refreshes_lists(user: httpx.AsyncClient) -> None:
+    user_id = await current_user_id(user)
+    await client_with_projects(user, "Kept", "Logo")
+    # Another user's client does not count as the owner's.
+    foreign = await get_database()["clients"].insert_one({"user_id": "someone-else", "name": "Theirs"})
+    await orphan(user_id, "Lost")
+    await orphan(user_id, "Borrowed", str(foreign.inserted_id))
+    tag = (await user.get("/api/projects")).headers["etag"]
+
+    assert await purge_orphans(get_database(), batch_size=1, pause=0) == {user_id: 2}
+
+    assert await project_titles(user) == ["Logo"]
+    assert (await user.get("/api/projects", headers={"If-None-Match": tag})).status_code == 200
+    assert await purge_orphans(get_database(), batch_size=1, pause=0) == {}
+
+
+async def test_sweeper_runs_without_transactions_and_tells_owners_to_refetch(
+    user: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user_id = await current_user_id(user)
+    await orphan(user_id, "Lost")
+    broker = app.state.container.events
+    notified: list[tuple[str, Any]] = []
+    monkeypatch.setattr(broker, "notify", lambda owner, *events: notified.append((owner, events)))
+
+    sweeper = OrphanSweeper(get_database(), broker)
+    assert await sweeper.start()
+    try:
+        assert await sweeper.sweep() == {user_id: 1}
+    finally:
+        await sweeper.stop()
+
+    assert [owner for owner, _ in notified] == [user_id]
+    assert await project_titles(user) == []
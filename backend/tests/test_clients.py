@@ -0,0 +1,79 @@
+from typing import Any
+
+import httpx
+import pytest
+from bson import ObjectId
+
+from app.main import app
+
+pytestmark = pytest.mark.anyio
+
+
+async def stored(client_id: str) -> dict[str, Any]:
+    collection = app.state.container.client_repository.collection
+    return await collection.find_one({"_id": ObjectId(client_id)})
+
+
+@pytest.fixture
+def writes(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Names of the write methods called on the clients collection."""
+    collection = app.state.container.client_repository.collection
+    calls: list[str] = []
+    for name in ("update_one", "update_many", "find_one_and_update", "bulk_write"):
+        method = getattr(collection, name)
+
+        def record(*args: Any, _name: str = name, _method: Any = method, **kwargs: Any) -> Any:
+            calls.append(_name)
+            return _method(*args, **kwargs)
+
+        monkeypatch.setattr(collection, name, record)
+    return calls
+
+
+async def test_partial_update_refreshes_search_fields_in_one_write(user: httpx.AsyncClient, writes: list[str]) -> None:
+    created = await user.post("/api/clients", json={"name": "Ada Lovelace", "email": "ada@example.com"})
+    client_id = created.json()["id"]
+
+    response = await user.put(f"/api/clients/{client_id}", json={"company": "Analytical Engines"})
+    assert response.status_code == 200, response.text
+    assert writes == ["find_one_and_update"]
+    terms = (await stored(client_id))["search_terms"]
+    assert {"ada", "lovelace", "analytical", "engines"} <= set(terms)
+
+
+async def test_update_without_search_fields_leaves_them_alone(user: httpx.AsyncClient, writes: list[str]) -> None:
+    created = await user.post("/api/clients", json={"name": "Ada Lovelace"})
+    client_id = created.json()["id"]
+    before = (await stored(client_id))["search_terms"]
+
+    response = await user.put(f"/api/clients/{client_id}", json={"phone": "555-0100"})
+    assert response.status_code == 200, response.text
+    assert writes == ["find_one_and_update"]
+    assert (await stored(client_id))["search_terms"] == before
+
+
+async def test_stale_update_is_a_conflict(user: httpx.AsyncClient) -> None:
+    created = await user.post("/api/clients", json={"name": "Ada Lovelace"})
+    client_id = created.json()["id"]
+
+    body = {"company": "Initech", "expected_updated_at": "2000-01-01T00:00:00Z"}
+    response = await user.put(f"/api/clients/{client_id}", json=body)
+    assert response.status_code == 409
+    response = await user.put(f"/api/clients/{ObjectId()}", json={"company": "Initech"})
+    assert response.status_code == 404
+
+
+async def test_short_search_pages_newest_first_without_ranking(user: httpx.AsyncClient) -> None:
+    for name in ("Ada Lovelace", "Bob Babbage", "Adam Smith", "Alan Turing"):
+        await user.post("/api/clients", json={"name": name})
+
+    names: list[str] = []
+    cursor = None
+    while True:
+        params = {"search": "ad", "limit": 1, **({"cursor": cursor} if cursor else {})}
+        body = (await user.get("/api/clients", params=params)).json()
+        names += [item["name"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert names == ["Adam Smith", "Ada Lovelace"]
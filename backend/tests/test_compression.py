@@ -0,0 +1,78 @@
+import gzip
+
+import httpx
+import pytest
+
+from app.core.compression import ENCODERS, LEVELS, compress, level_for, negotiate
+
+needs_brotli = pytest.mark.skipif("br" not in ENCODERS, reason="needs the compression extra")
+needs_zstd = pytest.mark.skipif("zstd" not in ENCODERS, reason="needs the compression extra")
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("GZIP;q=0.5", "gzip"),
+        ("gzip;q=0", None),
+        ("deflate, compress", None),
+        ("gzip;q=bogus, identity", None),
+        pytest.param("gzip, br", "br", marks=needs_brotli),
+        pytest.param("br;q=0.5, gzip", "gzip", marks=needs_brotli),
+        pytest.param("gzip, deflate, br, zstd", "zstd", marks=needs_zstd),
+        pytest.param("*", "zstd", marks=needs_zstd),
+        pytest.param("*, zstd;q=0", "br", marks=[needs_zstd, needs_brotli]),
+    ],
+)
+def test_negotiate(accept_encoding: str, expected: str | None) -> None:
+    assert negotiate(accept_encoding) == expected
+
+
+def test_level_drops_as_the_body_grows() -> None:
+    for encoding, steps in LEVELS.items():
+        small, large = steps[0][1], steps[-1][1]
+        assert level_for(encoding, 100) == small
+        assert level_for(encoding, 64 * 1024 * 1024) == large
+        assert level_for(encoding, None) == large
+
+
+def test_gzip_round_trip() -> None:
+    body = b'{"items": []}' * 100
+    assert gzip.decompress(compress("gzip", body)) == body
+
+
+@pytest.mark.anyio
+async def test_large_json_is_compressed_and_small_json_is_not(user: httpx.AsyncClient) -> None:
+    clients = [{"name": f"Client {n}", "notes": "x" * 50} for n in range(40)]
+    await user.post("/api/clients/bulk", json={"create": clients})
+    headers = {"Accept-Encoding": "gzip"}
+
+    response = await user.get("/api/clients?limit=40", headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert len(response.json()["items"]) == 40
+
+    response = await user.get("/api/clients?limit=1", headers=headers)
+    assert "content-encoding" not in response.headers
+
+    response = await user.get("/api/clients?limit=40", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.anyio
+async def test_not_modified_and_streams_are_handled(user: httpx.AsyncClient) -> None:
+    await user.post("/api/clients/bulk", json={"create": [{"name": f"Client {n}"} for n in range(40)]})
+    headers = {"Accept-Encoding": "gzip"}
+
+    etag = (await user.get("/api/clients", headers=headers)).headers["etag"]
+    response = await user.get("/api/clients", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert "content-encoding" not in response.headers
+
+    response = await user.get("/api/clients/export?format=ndjson", headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert len(response.text.splitlines()) == 40
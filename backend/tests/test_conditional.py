@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import httpx
+import pytest
+
+from app.models import client as client_model
+
+pytestmark = pytest.mark.anyio
+
+
+async def etag(api: httpx.AsyncClient, url: str) -> str:
+    response = await api.get(url)
+    assert response.status_code == 200, response.text
+    return response.headers["etag"]
+
+
+async def revalidate(api: httpx.AsyncClient, url: str, tag: str) -> int:
+    return (await api.get(url, headers={"If-None-Match": tag})).status_code
+
+
+async def test_list_revalidates_until_a_write(user: httpx.AsyncClient) -> None:
+    tag = await etag(user, "/api/clients")
+    assert await revalidate(user, "/api/clients", tag) == 304
+
+    created = await user.post("/api/clients", json={"name": "Acme"})
+    client_id = created.json()["id"]
+    assert await revalidate(user, "/api/clients", tag) == 200
+
+    tag = await etag(user, "/api/clients")
+    await user.put(f"/api/clients/{client_id}", json={"name": "Acme Ltd"})
+    assert await revalidate(user, "/api/clients", tag) == 200
+
+    tag = await etag(user, "/api/clients")
+    await user.delete(f"/api/clients/{client_id}")
+    assert await revalidate(user, "/api/clients", tag) == 200
+
+
+async def test_list_revalidates_after_writes_in_the_same_millisecond(
+    user: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(client_model, "utcnow", lambda: datetime(2026, 1, 1))
+    first = await user.post("/api/clients", json={"name": "Acme"})
+    await user.post("/api/clients", json={"name": "Globex"})
+    tag = await etag(user, "/api/clients")
+
+    # Same count and same newest updated_at as before: only the write counter tells them apart.
+    await user.delete(f"/api/clients/{first.json()['id']}")
+    await user.post("/api/clients", json={"name": "Initech"})
+    assert await revalidate(user, "/api/clients", tag) == 200
+
+
+async def test_list_etag_depends_on_the_query(user: httpx.AsyncClient) -> None:
+    assert await etag(user, "/api/clients?limit=5") != await etag(user, "/api/clients?limit=6")
+
+
+async def test_board_revalidates_after_a_client_rename(user: httpx.AsyncClient) -> None:
+    created = await user.post("/api/clients", json={"name": "Acme"})
+    client_id = created.json()["id"]
+    await user.post("/api/projects", json={"client_id": client_id, "title": "Site", "status": "idea"})
+    tag = await etag(user, "/api/projects/board")
+    assert await revalidate(user, "/api/projects/board", tag) == 304
+
+    await user.put(f"/api/clients/{client_id}", json={"name": "Acme Ltd"})
+    assert await revalidate(user, "/api/projects/board", tag) == 200
+
+
+async def test_detail_revalidates_until_an_update(user: httpx.AsyncClient) -> None:
+    created = await user.post("/api/clients", json={"name": "Acme"})
+    url = f"/api/clients/{created.json()['id']}"
+    tag = await etag(user, url)
+    assert await revalidate(user, url, tag) == 304
+
+    await user.put(url, json={"notes": "Prefers email"})
+    assert await revalidate(user, url, tag) == 200
@@ -0,0 +1,78 @@
+"""``$lookup`` with ``let`` is not implemented in mongomock, so these tests need a real server."""
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.clock import utcnow
+from app.models.client import Client
+from app.models.project import Project
+from app.repositories.client_repository import ClientRepository
+from app.repositories.project_repository import ProjectRepository
+from app.services.dashboard_service import DashboardService
+
+pytestmark = pytest.mark.anyio
+
+
+async def seed(db: AsyncIOMotorDatabase) -> None:
+    clients = ClientRepository(db)
+    acme = await clients.insert(Client.to_document(user_id="owner", name="Acme", company="Acme Inc"))
+    globex = await clients.insert(Client.to_document(user_id="owner", name="Globex"))
+    now = utcnow()
+
+    def project(user_id: str, client_id: str, title: str, status: str, rate: float | None, days: int) -> dict[str, Any]:
+        deadline = now + timedelta(days=days)
+        return Project.to_document(
+            user_id=user_id, client_id=client_id, title=title, status=status, hourly_rate=rate, deadline=deadline
+        )
+
+    await db[Project.collection_name].insert_many(
+        [
+            project("owner", acme.id, "Site", "idea", 50, 2),
+            project("owner", acme.id, "Shop", "in-progress", 100, 10),
+            project("owner", acme.id, "Logo", "completed", 80, 1),
+            project("owner", globex.id, "Audit", "review", None, 3),
+            project("owner", globex.id, "Retainer", "talks", 30, -1),
+            project("someone-else", acme.id, "Not mine", "idea", 1000, 1),
+        ]
+    )
+
+
+async def test_summary_rolls_up_the_users_projects(mongod: AsyncIOMotorDatabase) -> None:
+    await seed(mongod)
+
+    summary = await DashboardService(ProjectRepository(mongod)).summary("owner")
+
+    assert summary["totals"] == {
+        "projects": 5,
+        "active": 3,
+        "due_soon": 2,
+        "average_rate": 60.0,
+        "pipeline_value": 180.0,
+    }
+    assert [(row["status"], row["count"], row["hourly_rate_total"]) for row in summary["by_status"]] == [
+        ("idea", 1, 50.0),
+        ("talks", 1, 30.0),
+        ("in-progress", 1, 100.0),
+        ("review", 1, 0.0),
+        ("completed", 1, 80.0),
+    ]
+    assert [
+        (row["name"], row["company"], row["count"], row["open"], row["hourly_rate_total"])
+        for row in summary["by_client"]
+    ] == [("Acme", "Acme Inc", 3, 2, 150.0), ("Globex", None, 2, 2, 30.0)]
+    assert [(row["title"], row["client_name"]) for row in summary["upcoming_deadlines"]] == [
+        ("Site", "Acme"),
+        ("Audit", "Globex"),
+    ]
+
+
+async def test_summary_of_a_user_without_projects(mongod: AsyncIOMotorDatabase) -> None:
+    summary = await DashboardService(ProjectRepository(mongod)).summary("owner")
+
+    assert summary["totals"]["projects"] == 0
+    assert summary["totals"]["average_rate"] == 0.0
+    assert all(row["count"] == 0 for row in summary["by_status"])
+    assert summary["by_client"] == []
+    assert summary["upcoming_deadlines"] == []
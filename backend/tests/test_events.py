@@ -0,0 +1,126 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator
+
+import httpx
+import pytest
+
+from app.core.events import HEARTBEAT, READY, Change, EventBroker, deletion, reset
+from app.main import app
+
+pytestmark = pytest.mark.anyio
+
+
+def broker(queue_size: int = 10, heartbeat_seconds: float = 60, max_connection_seconds: float = 60) -> EventBroker:
+    return EventBroker(queue_size, heartbeat_seconds, max_connection_seconds)
+
+
+def changes(frame: bytes) -> list[dict[str, Any]]:
+    return [
+        json.loads(line.removeprefix(b"data: "))
+        for line in frame.splitlines()
+        if line.startswith(b"data: ") and line != b"data: {}"
+    ]
+
+
+async def subscribe(events: EventBroker, user_id: str = "u1") -> AsyncIterator[bytes]:
+    stream = events.stream(user_id)
+    assert await anext(stream) == READY
+    return stream
+
+
+async def test_notified_changes_reach_the_users_streams_only() -> None:
+    events = broker()
+    mine, theirs = await subscribe(events, "u1"), await subscribe(events, "u2")
+
+    events.notify("u1", deletion("clients", "c1"), reset("projects"))
+
+    assert changes(await anext(mine)) == [
+        {"collection": "clients", "op": "deleted", "id": "c1", "data": None},
+        {"collection": "projects", "op": "reset", "id": None, "data": None},
+    ]
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(anext(theirs), 0.05)
+    await mine.aclose()
+    await theirs.aclose()
+
+
+async def test_notify_is_skipped_while_a_change_stream_delivers() -> None:
+    events = broker()
+    stream = await subscribe(events)
+    events.external = True
+
+    events.notify("u1", reset("clients"))
+    events.publish("u1", deletion("clients", "c1"))
+
+    assert [change["op"] for change in changes(await anext(stream))] == ["deleted"]
+    await stream.aclose()
+
+
+async def test_a_full_queue_is_replaced_by_a_reset() -> None:
+    events = broker(queue_size=2)
+    stream = await subscribe(events)
+
+    for index in range(5):
+        events.publish("u1", Change("projects", "updated", f"p{index}"))
+
+    assert changes(await anext(stream)) == [
+        {"collection": collection, "op": "reset", "id": None, "data": None} for collection in ("clients", "projects")
+    ]
+    assert events.stats()["overflows"] == 1
+    # Delivery resumes normally once the client has caught up.
+    events.publish("u1", deletion("projects", "p9"))
+    assert [change["id"] for change in changes(await anext(stream))] == ["p9"]
+    await stream.aclose()
+
+
+async def test_idle_streams_send_heartbeats() -> None:
+    stream = await subscribe(broker(heartbeat_seconds=0.01))
+
+    assert await anext(stream) == HEARTBEAT
+    await stream.aclose()
+
+
+async def test_streams_end_after_the_connection_limit_and_on_close() -> None:
+    expiring = await subscribe(broker(max_connection_seconds=0.01))
+    assert {frame async for frame in expiring} <= {HEARTBEAT}
+
+    events = broker()
+    stream = await subscribe(events)
+    events.close()
+    with pytest.raises(StopAsyncIteration):
+        await anext(stream)
+
+
+async def test_disconnecting_releases_the_subscription() -> None:
+    events = broker()
+    first, second = await subscribe(events), await subscribe(events)
+    assert events.subscribers == 2
+
+    await first.aclose()
+    assert events.watching("u1")
+    await second.aclose()
+
+    assert not events.watching("u1")
+    assert events.subscribers == 0
+
+
+async def test_event_stream_endpoint(user: httpx.AsyncClient) -> None:
+    # ASGITransport returns the body once the stream ends, so cap the connection.
+    app.state.container.events.max_connection_seconds = 0.2
+
+    async def create_client() -> None:
+        await asyncio.sleep(0.05)
+        await user.post("/api/clients", json={"name": "Acme"})
+
+    response, _ = await asyncio.gather(user.get("/api/events"), create_client())
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.content.startswith(READY)
+    assert [(change["op"], change["data"]["name"]) for change in changes(response.content)] == [("created", "Acme")]
+    assert app.state.container.events.subscribers == 0
+
+
+async def test_event_stream_requires_a_session(api: httpx.AsyncClient) -> None:
+    assert (await api.get("/api/events")).status_code == 401
@@ -0,0 +1,13 @@
+"""Query plans need a real server: these tests run against MONGO_URI and skip when it is unreachable."""
+import pytest
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.db.explain import EXPLAINED_QUERIES, plan
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("name", list(EXPLAINED_QUERIES))
+async def test_query_uses_an_index(mongod: AsyncIOMotorDatabase, name: str) -> None:
+    stages, problems = await plan(mongod, EXPLAINED_QUERIES[name]())
+    assert not problems, f"{name}: {' > '.join(stages)}"
@@ -0,0 +1,66 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator
+
+import httpx
+import pytest
+from bson import ObjectId
+
+from app.core.export import encode_documents
+
+pytestmark = pytest.mark.anyio
+
+FIELDS = ["id", "name", "created_at"]
+
+
+async def documents(count: int, consumed: list[int] | None = None) -> AsyncIterator[dict[str, Any]]:
+    for index in range(count):
+        if consumed is not None:
+            consumed.append(index)
+        yield {"_id": ObjectId(), "name": f"Client {index}", "created_at": datetime(2026, 1, 2, tzinfo=timezone.utc)}
+
+
+async def collect(chunks: AsyncIterator[bytes]) -> list[bytes]:
+    return [chunk async for chunk in chunks]
+
+
+async def test_ndjson_rows() -> None:
+    chunks = await collect(encode_documents(documents(3), FIELDS, "ndjson", 1 << 16))
+    rows = [json.loads(line) for line in b"".join(chunks).splitlines()]
+    assert [row["name"] for row in rows] == ["Client 0", "Client 1", "Client 2"]
+    assert rows[0]["created_at"] == "2026-01-02T00:00:00+00:00"
+    assert all(ObjectId.is_valid(row["id"]) for row in rows)
+
+
+async def test_chunks_flush_at_the_byte_threshold() -> None:
+    chunks = await collect(encode_documents(documents(50), FIELDS, "ndjson", 200))
+    assert len(chunks) > 1
+    assert all(len(chunk) >= 200 for chunk in chunks[:-1])
+    assert all(chunk.endswith(b"\n") for chunk in chunks)
+    assert len(b"".join(chunks).splitlines()) == 50
+
+
+async def test_csv_header_is_sent_before_any_row_is_read() -> None:
+    consumed: list[int] = []
+    chunks = encode_documents(documents(3, consumed), FIELDS, "csv", 1 << 16)
+    assert await chunks.__anext__() == b"id,name,created_at\r\n"
+    assert consumed == []
+    rows = list(csv.DictReader(io.StringIO("id,name,created_at\r\n" + b"".join(await collect(chunks)).decode())))
+    assert [row["name"] for row in rows] == ["Client 0", "Client 1", "Client 2"]
+
+
+async def test_export_endpoint(user: httpx.AsyncClient) -> None:
+    for name in ("Ada", "Grace"):
+        assert (await user.post("/api/clients", json={"name": name})).status_code == 201
+
+    response = await user.get("/api/clients/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert sorted(json.loads(line)["name"] for line in response.text.splitlines()) == ["Ada", "Grace"]
+
+    response = await user.get("/api/clients/export", params={"format": "csv"})
+    assert response.headers["content-disposition"] == 'attachment; filename="clients.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert sorted(row["name"] for row in rows) == ["Ada", "Grace"]
@@ -0,0 +1,82 @@
+import httpx
+import pytest
+
+from app.core.fields import parse_fields, projection
+
+pytestmark = pytest.mark.anyio
+
+ALLOWED = ("id", "name", "email", "company")
+
+
+def test_parse_fields() -> None:
+    assert parse_fields(None, ALLOWED) is None
+    assert parse_fields(" , ", ALLOWED) is None
+    assert parse_fields("name, email,name", ALLOWED) == ("name", "email")
+    with pytest.raises(ValueError, match="secret, notes"):
+        parse_fields("name,secret,notes", ALLOWED)
+
+
+def test_projection_keeps_sort_keys_and_leaves_id_implicit() -> None:
+    assert projection(("id", "name"), always=("created_at",)) == {"created_at": 1, "name": 1}
+
+
+async def create_clients(api: httpx.AsyncClient, *names: str) -> list[str]:
+    ids = []
+    for name in names:
+        response = await api.post("/api/clients", json={"name": name, "email": f"{name.lower()}@example.com"})
+        assert response.status_code == 201, response.text
+        ids.append(response.json()["id"])
+    return ids
+
+
+async def test_list_returns_only_the_selected_fields_and_id(user: httpx.AsyncClient) -> None:
+    await create_clients(user, "Ada")
+
+    response = await user.get("/api/clients", params={"fields": "name,email"})
+    assert response.status_code == 200, response.text
+    assert [sorted(item) for item in response.json()["items"]] == [["email", "id", "name"]]
+
+
+async def test_detail_returns_only_the_selected_fields_and_id(user: httpx.AsyncClient) -> None:
+    [client_id] = await create_clients(user, "Ada")
+
+    response = await user.get(f"/api/clients/{client_id}", params={"fields": "company"})
+    assert response.json() == {"id": client_id, "company": None}
+
+
+async def test_unknown_fields_are_rejected(user: httpx.AsyncClient) -> None:
+    for url in ("/api/clients", "/api/projects", "/api/projects/000000000000000000000000"):
+        response = await user.get(url, params={"fields": "name,password_hash"})
+        assert response.status_code == 400, url
+        assert "password_hash" in response.json()["detail"]
+
+
+async def test_cursors_page_through_a_sparse_list(user: httpx.AsyncClient) -> None:
+    ids = await create_clients(user, "Ada", "Grace", "Edsger")
+
+    seen, cursor = [], None
+    while True:
+        params = {"fields": "name", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = (await user.get("/api/clients", params=params)).json()
+        assert all(sorted(item) == ["id", "name"] for item in page["items"])
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == ids[::-1]
+
+
+async def test_list_etags_differ_per_field_selection(user: httpx.AsyncClient) -> None:
+    await create_clients(user, "Ada")
+    names = await user.get("/api/clients", params={"fields": "name"})
+    emails = await user.get("/api/clients", params={"fields": "email"})
+    assert names.headers["etag"] != emails.headers["etag"]
+
+    revalidated = await user.get(
+        "/api/clients", params={"fields": "email"}, headers={"If-None-Match": names.headers["etag"]}
+    )
+    assert revalidated.status_code == 200
+    assert revalidated.json()["items"][0]["email"] == "ada@example.com"
+
+    again = await user.get("/api/clients", params={"fields": "name"}, headers={"If-None-Match": names.headers["etag"]})
+    assert again.status_code == 304
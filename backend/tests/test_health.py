@@ -0,0 +1,18 @@
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_principal_cache_stats_require_an_admin(api: httpx.AsyncClient) -> None:
+    assert (await api.get("/api/health/principal-cache")).status_code == 401
+
+
+async def test_principal_cache_stats_forbid_other_users(user: httpx.AsyncClient) -> None:
+    assert (await user.get("/api/health/principal-cache")).status_code == 403
+
+
+async def test_principal_cache_stats(admin: httpx.AsyncClient) -> None:
+    response = await admin.get("/api/health/principal-cache")
+    assert response.status_code == 200, response.text
+    assert set(response.json()) == {"token_hits", "user_hits", "misses", "token_entries", "user_entries"}
@@ -0,0 +1,126 @@
+import io
+import json
+from typing import Any
+
+import httpx
+import pytest
+
+from app.core.imports import iter_rows
+
+pytestmark = pytest.mark.anyio
+
+
+async def upload(
+    api: httpx.AsyncClient, url: str, content: str, filename: str, **params: Any
+) -> list[dict[str, Any]]:
+    response = await api.post(url, params=params, files={"file": (filename, content.encode())})
+    assert response.status_code == 200, response.text
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def errors(events: list[dict[str, Any]]) -> dict[int, str]:
+    return {event["line"]: event["detail"] for event in events if event["event"] == "error"}
+
+
+async def client_names(api: httpx.AsyncClient) -> list[str]:
+    return sorted(client["name"] for client in (await api.get("/api/clients")).json()["items"])
+
+
+async def test_csv_rows_are_validated_with_their_line_numbers(user: httpx.AsyncClient) -> None:
+    content = (
+        "name,email,company\n"
+        "Acme,ops@acme.example,Acme Inc\n"
+        ",nobody@example.com,\n"
+        '"Globex, ""the"" company",,\n'
+        "Initech,not-an-email,\n"
+    )
+    events = await upload(user, "/api/clients/import", content, "clients.csv")
+
+    assert sorted(errors(events)) == [3, 5]
+    assert "name" in errors(events)[3]
+    assert "email" in errors(events)[5]
+    assert events[-1] == {"event": "done", "rows": 4, "inserted": 2, "failed": 2}
+    assert await client_names(user) == ["Acme", 'Globex, "the" company']
+
+
+async def test_ndjson_rows_are_validated_with_their_line_numbers(user: httpx.AsyncClient) -> None:
+    content = "\n".join(
+        [
+            '{"name": "Acme", "company": "Acme Inc"}',
+            "",
+            '{"name": ',
+            '["not", "an", "object"]',
+            '{"name": ""}',
+            '{"name": "Globex"}',
+        ]
+    )
+    events = await upload(user, "/api/clients/import", content, "clients.ndjson")
+
+    assert sorted(errors(events)) == [3, 4, 5]
+    assert errors(events)[3].startswith("Invalid JSON")
+    assert errors(events)[4] == "Expected a JSON object"
+    assert "name" in errors(events)[5]
+    assert events[-1] == {"event": "done", "rows": 5, "inserted": 2, "failed": 3}
+    assert await client_names(user) == ["Acme", "Globex"]
+
+
+async def test_rows_are_inserted_in_batches_with_progress_after_each(user: httpx.AsyncClient) -> None:
+    content = "name\n" + "".join(f"Client {index}\n" for index in range(5)) + "\n"
+    events = await upload(user, "/api/clients/import", content, "clients.txt", format="csv", batch_size=2)
+
+    assert events == [
+        {"event": "progress", "rows": 2, "inserted": 2, "failed": 0},
+        {"event": "progress", "rows": 4, "inserted": 4, "failed": 0},
+        {"event": "progress", "rows": 5, "inserted": 5, "failed": 0},
+        {"event": "done", "rows": 5, "inserted": 5, "failed": 0},
+    ]
+    assert len(await client_names(user)) == 5
+
+
+async def test_the_format_must_be_known(user: httpx.AsyncClient) -> None:
+    response = await user.post("/api/clients/import", files={"file": ("clients.txt", b"name\nAcme\n")})
+    assert response.status_code == 400
+
+
+async def test_project_rows_resolve_their_client(user: httpx.AsyncClient) -> None:
+    acme = (await user.post("/api/clients", json={"name": "Acme", "email": "ops@acme.example"})).json()["id"]
+    globex = (await user.post("/api/clients", json={"name": "Globex"})).json()["id"]
+    for _ in range(2):
+        await user.post("/api/clients", json={"name": "Twin"})
+    rows = [
+        {"title": "By id", "client_id": acme},
+        {"title": "By email", "client_email": "OPS@acme.example"},
+        {"title": "By name", "client_name": " globex "},
+        {"title": "By either, email", "client": "ops@acme.example"},
+        {"title": "By either, name", "client": "Globex"},
+        {"title": "Ambiguous", "client_name": "Twin"},
+        {"title": "Unknown", "client": "Umbrella"},
+        {"title": "Unknown id", "client_id": "0" * 24},
+        {"title": "No client"},
+        {"client": "Acme"},
+    ]
+    content = "\n".join(json.dumps(row) for row in rows)
+    events = await upload(user, "/api/projects/import", content, "projects.ndjson")
+
+    rejected = errors(events)
+    assert sorted(rejected) == [6, 7, 8, 9, 10]
+    assert rejected[6] == "More than one client matches 'Twin'; use client_email or client_id"
+    assert rejected[7] == "Client not found: Umbrella"
+    assert rejected[8] == "Client not found"
+    assert rejected[9] == "One of client_id, client_email, client_name or client is required"
+    assert "title" in rejected[10]
+    projects = (await user.get("/api/projects?fields=title,client_id")).json()["items"]
+    assert sorted((project["title"], project["client_id"]) for project in projects) == [
+        ("By either, email", acme),
+        ("By either, name", globex),
+        ("By email", acme),
+        ("By id", acme),
+        ("By name", globex),
+    ]
+
+
+def test_an_undecodable_file_ends_with_an_error_row() -> None:
+    (row,) = iter_rows(io.BytesIO(b"name\nAcme\n\xff\xfe\n"), "csv")
+
+    assert row.data is None
+    assert row.error is not None and row.error.startswith("Could not read file")
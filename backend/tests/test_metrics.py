@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.core.metrics import UNMATCHED_ROUTE, HttpMetrics, MetricsMiddleware, http_metrics
+from app.core.settings import get_settings
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def metrics(monkeypatch: pytest.MonkeyPatch) -> HttpMetrics:
+    """A fresh ``http_metrics``, so series from other tests don't leak in."""
+    fresh = HttpMetrics()
+    monkeypatch.setattr(http_metrics, "series", fresh.series)
+    return http_metrics
+
+
+async def test_requests_are_labelled_by_route_template(user: httpx.AsyncClient, metrics: HttpMetrics) -> None:
+    created = await user.post("/api/clients", json={"name": "Ada Lovelace", "email": "ada@example.com"})
+    await user.get(f"/api/clients/{created.json()['id']}")
+    await user.get("/api/projects/board")
+    await user.get("/api/nowhere")
+
+    assert metrics.series["/api/clients"]["POST"].statuses == {201: 1}
+    assert metrics.series["/api/clients/{client_id}"]["GET"].statuses == {200: 1}
+    assert metrics.series["/api/projects/board"]["GET"].statuses == {200: 1}
+    assert metrics.series[UNMATCHED_ROUTE]["GET"].statuses == {404: 1}
+
+
+@pytest.mark.parametrize(
+    ("path", "root_path", "path_format", "template"),
+    [
+        ("/api/clients/abc", "", "/clients/{client_id}", "/api/clients/{client_id}"),
+        ("/api/clients/abc", "", "/api/clients/{client_id}", "/api/clients/{client_id}"),
+        ("/proxy/api/clients/", "/proxy", "/clients/", "/api/clients/"),
+        ("/", "", "/", "/"),
+    ],
+)
+def test_template_restores_include_prefixes(path: str, root_path: str, path_format: str, template: str) -> None:
+    scope = {"path": path, "root_path": root_path, "route": SimpleNamespace(path_format=path_format)}
+    assert MetricsMiddleware._template(scope) == template
+
+
+async def test_metrics_require_an_admin(user: httpx.AsyncClient) -> None:
+    assert (await user.get("/api/metrics")).status_code == 403
+
+
+async def test_metrics_for_an_admin(admin: httpx.AsyncClient) -> None:
+    response = await admin.get("/api/metrics")
+    assert response.status_code == 200, response.text
+    assert "http_request_duration_seconds_bucket" in response.text
+
+
+async def test_metrics_accept_the_scrape_token(api: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "metrics_token", "scrape-secret")
+
+    assert (await api.get("/api/metrics", headers={"Authorization": "Bearer wrong"})).status_code == 401
+    response = await api.get("/api/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200, response.text
@@ -0,0 +1,65 @@
+import base64
+import json
+from datetime import datetime
+
+import httpx
+import pytest
+from bson import ObjectId
+
+from app.core.pagination import decode_cursor, encode_cursor, encode_rank_cursor, rank_filter
+
+
+def test_cursor_round_trip() -> None:
+    created_at, object_id = datetime(2025, 3, 1, 12, 30, 15, 123000), ObjectId()
+    assert decode_cursor(encode_cursor(created_at, object_id)) == (created_at, object_id, None)
+    assert decode_cursor(encode_cursor(created_at, object_id, 3)) == (created_at, object_id, 3)
+    assert rank_filter(encode_rank_cursor("a1", object_id)) == {
+        "$or": [{"position": {"$gt": "a1"}}, {"position": "a1", "_id": {"$gt": object_id}}]
+    }
+
+
+def tampered(cursor: str, **changes: object) -> str:
+    data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    data.update(changes)
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-a-cursor",
+        base64.urlsafe_b64encode(b"[1, 2]").decode(),
+        tampered(encode_cursor(datetime(2025, 1, 1), ObjectId()), i="nope"),
+        tampered(encode_cursor(datetime(2025, 1, 1), ObjectId()), c="yesterday"),
+        tampered(encode_cursor(datetime(2025, 1, 1), ObjectId(), 2), s="high"),
+    ],
+)
+def test_malformed_cursors_are_rejected(cursor: str) -> None:
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.anyio
+async def test_pages_cover_every_client_once(user: httpx.AsyncClient) -> None:
+    names = {f"Client {number}" for number in range(7)}
+    await user.post("/api/clients/bulk", json={"create": [{"name": name} for name in names]})
+
+    seen: list[str] = []
+    params: dict[str, object] = {"limit": 3}
+    while True:
+        body = (await user.get("/api/clients", params=params)).json()
+        seen += [item["name"] for item in body["items"]]
+        if not body["next_cursor"]:
+            break
+        params["cursor"] = body["next_cursor"]
+    assert sorted(seen) == sorted(names)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("url", ["/api/clients", "/api/projects", "/api/projects/board?status=idea"])
+async def test_tampered_cursor_is_a_400(user: httpx.AsyncClient, url: str) -> None:
+    cursor = tampered(encode_cursor(datetime(2025, 1, 1), ObjectId()), i="nope")
+    separator = "&" if "?" in url else "?"
+    response = await user.get(f"{url}{separator}cursor={cursor}")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,59 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from app.core.security import PasswordHasher, PasswordHasherBusy, password_hasher
+from app.main import app
+from app.services import auth_service
+from tests.conftest import PASSWORD, sign_in
+
+pytestmark = pytest.mark.anyio
+
+
+async def occupy(hasher: PasswordHasher, count: int) -> tuple[threading.Event, list[asyncio.Task]]:
+    """Start ``count`` operations that hold their worker until the returned event is set."""
+    release = threading.Event()
+    tasks = [asyncio.create_task(hasher._run(release.wait)) for _ in range(count)]
+    while hasher.pending < count:
+        await asyncio.sleep(0)
+    return release, tasks
+
+
+async def test_rejects_work_beyond_max_pending() -> None:
+    hasher = PasswordHasher(workers=1, max_pending=2)
+    release, tasks = await occupy(hasher, 2)
+    try:
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.verify(PASSWORD, "unused")
+        assert hasher.rejected == 1
+    finally:
+        release.set()
+        await asyncio.gather(*tasks)
+        hasher.shutdown()
+    assert hasher.pending == 0
+
+
+async def test_login_gets_503_while_the_hasher_is_saturated(
+    api: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    await sign_in(api)
+    hasher = PasswordHasher(workers=1, max_pending=1)
+    monkeypatch.setattr(auth_service, "password_hasher", hasher)
+    release, tasks = await occupy(hasher, 1)
+    try:
+        response = await api.post("/api/auth/login", json={"email": "freelancer@example.com", "password": PASSWORD})
+    finally:
+        release.set()
+        await asyncio.gather(*tasks)
+        hasher.shutdown()
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+async def test_lifespan_exit_shuts_the_hasher_down(database: None) -> None:
+    async with app.router.lifespan_context(app):
+        await password_hasher.hash(PASSWORD)
+        assert password_hasher._executor is not None
+    assert password_hasher._executor is None
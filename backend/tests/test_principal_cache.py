@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.core import principal_cache as principal_cache_module
+from app.core.principal_cache import PrincipalCache, principal_cache
+from app.main import app
+from app.schema.auth import UserResponse
+
+pytestmark = pytest.mark.anyio
+
+ADA = UserResponse(id="a" * 24, email="ada@example.com")
+GRACE = UserResponse(id="b" * 24, email="grace@example.com")
+
+
+class Clock:
+    """Wall time and monotonic time, both starting at ``now``."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(principal_cache_module, "time", SimpleNamespace(monotonic=clock, time=clock))
+    return clock
+
+
+def test_token_entries_expire_with_the_token(clock: Clock) -> None:
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    cache.put("header.payload.ada", ADA, token_exp=clock.now + 5)
+
+    clock.now += 4
+    assert cache.get_by_token("header.payload.ada") == ADA
+    clock.now += 2
+    assert cache.get_by_token("header.payload.ada") is None
+    # The user entry keeps the full TTL: a new token for the same user still skips the lookup.
+    assert cache.get_by_user(ADA.id) == ADA
+    clock.now += 60
+    assert cache.get_by_user(ADA.id) is None
+
+
+def test_expired_tokens_are_not_cached(clock: Clock) -> None:
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    cache.put("header.payload.ada", ADA, token_exp=clock.now - 1)
+    assert cache.get_by_token("header.payload.ada") is None
+
+
+def test_token_must_match_not_only_its_signature(clock: Clock) -> None:
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    cache.put("header.payload.ada", ADA, token_exp=None)
+    assert cache.get_by_token("header.forged.ada") is None
+
+
+def test_least_recently_used_entries_are_evicted(clock: Clock) -> None:
+    cache = PrincipalCache(max_size=2, ttl_seconds=60)
+    third = UserResponse(id="c" * 24, email="third@example.com")
+    cache.put("t.t.ada", ADA, token_exp=None)
+    cache.put("t.t.grace", GRACE, token_exp=None)
+    assert cache.get_by_user(ADA.id) == ADA  # Grace is now the least recently used
+    cache.put("t.t.third", third, token_exp=None)
+
+    assert cache.get_by_user(GRACE.id) is None
+    assert cache.get_by_user(ADA.id) == ADA
+    assert cache.stats()["user_entries"] == 2
+
+
+def test_invalidate_user_drops_every_entry_of_the_user(clock: Clock) -> None:
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    cache.put("t.t.ada1", ADA, token_exp=None)
+    cache.put("t.t.ada2", ADA, token_exp=None)
+    cache.put("t.t.grace", GRACE, token_exp=None)
+
+    cache.invalidate_user(ADA.id)
+
+    assert cache.get_by_token("t.t.ada1") is None
+    assert cache.get_by_token("t.t.ada2") is None
+    assert cache.get_by_user(ADA.id) is None
+    assert cache.get_by_token("t.t.grace") == GRACE
+
+
+async def test_profile_update_is_seen_by_the_next_request(user: httpx.AsyncClient) -> None:
+    assert (await user.get("/api/auth/me")).json()["full_name"] == "F"  # now cached
+
+    response = await user.patch("/api/auth/me", json={"full_name": "Ada Lovelace"})
+    assert response.status_code == 200, response.text
+
+    assert (await user.get("/api/auth/me")).json()["full_name"] == "Ada Lovelace"
+
+
+async def test_deleted_account_is_signed_out_everywhere(user: httpx.AsyncClient) -> None:
+    token = user.cookies["access_token"]
+    assert (await user.post("/api/clients", json={"name": "Ada"})).status_code == 201
+    me = (await user.get("/api/auth/me")).json()
+
+    assert (await user.delete("/api/auth/me")).status_code == 204
+
+    assert principal_cache.get_by_user(me["id"]) is None
+    user.cookies.set("access_token", token)  # a copy of the token held by another device
+    assert (await user.get("/api/auth/me")).status_code == 401
+    assert await app.state.container.client_repository.collection.count_documents({"user_id": me["id"]}) == 0
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from app.core.ranking import initial_rank, rank_between
+
+
+def test_rank_between_sorts_strictly_between_neighbours() -> None:
+    keys = ["1", "a", "a1", "az", "b", "zz"]
+    for low, high in zip(keys, keys[1:]):
+        key = rank_between(low, high)
+        assert low < key < high
+        assert not key.endswith("0")
+
+
+def test_rank_between_open_ends() -> None:
+    assert rank_between(None, "a") < "a"
+    assert rank_between("a", None) > "a"
+    assert rank_between(None, None)
+
+
+def test_repeated_inserts_stay_ordered() -> None:
+    # Always dropping into the same gap is the worst case for key length.
+    low, high = "a", "b"
+    for _ in range(200):
+        key = rank_between(low, high)
+        assert low < key < high
+        high = key
+    assert len(high) < 210
+
+
+@pytest.mark.parametrize("low, high", [("a", "a"), ("b", "a")])
+def test_rank_between_rejects_neighbours_without_a_gap(low: str, high: str) -> None:
+    with pytest.raises(ValueError):
+        rank_between(low, high)
+
+
+def test_initial_rank_puts_newer_cards_first() -> None:
+    now = datetime(2025, 3, 1, 12, 0, 0)
+    older, newer = initial_rank(now), initial_rank(now + timedelta(milliseconds=1))
+    assert newer < older
+    assert initial_rank(now + timedelta(milliseconds=1), ObjectId()) < initial_rank(now, ObjectId())
+
+
+def test_initial_rank_is_unique_within_a_millisecond() -> None:
+    now = datetime(2025, 3, 1, 12, 0, 0)
+    keys = [initial_rank(now, ObjectId()) for _ in range(100)]
+    assert len(set(keys)) == 100
+    # Keys from before the tiebreak existed still sort consistently with the new ones.
+    assert initial_rank(now) < min(keys)
+    assert max(keys) < initial_rank(now - timedelta(milliseconds=1), ObjectId())
+    for low, high in zip(sorted(keys), sorted(keys)[1:]):
+        assert low < rank_between(low, high) < high
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.core import rate_limit
+from app.core.rate_limit import Limit, MemoryRateLimitStore, RateLimiter
+from app.main import app
+from app.services.auth_service import EMAIL_LIMIT
+
+pytestmark = pytest.mark.anyio
+
+LIMIT = Limit(burst=3, per_minute=6)  # one token every 10 seconds
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    # Only the limiter's clock: the event loop keeps reading the real time.monotonic.
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+async def test_burst_then_denial_with_the_wait_for_the_next_token(clock: Clock) -> None:
+    store = MemoryRateLimitStore(max_keys=10)
+    assert [await store.take("ip", LIMIT) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert await store.take("ip", LIMIT) == pytest.approx(10.0)
+    clock.now += 4
+    assert await store.take("ip", LIMIT) == pytest.approx(6.0)
+
+
+async def test_tokens_refill_over_time_up_to_the_burst(clock: Clock) -> None:
+    store = MemoryRateLimitStore(max_keys=10)
+    for _ in range(3):
+        await store.take("ip", LIMIT)
+    clock.now += 10
+    assert await store.take("ip", LIMIT) == 0.0
+    assert await store.take("ip", LIMIT) > 0
+
+    clock.now += 3600
+    assert [await store.take("ip", LIMIT) for _ in range(4)][-1] > 0
+
+
+async def test_least_recently_hit_bucket_is_evicted(clock: Clock) -> None:
+    store = MemoryRateLimitStore(max_keys=2)
+    for _ in range(3):
+        await store.take("a", LIMIT)
+    await store.take("b", LIMIT)
+    await store.take("c", LIMIT)
+    assert len(store) == 2
+    assert await store.take("a", LIMIT) == 0.0  # dropped, so it starts full again
+
+
+async def test_first_rejection_leaves_later_buckets_untouched(clock: Clock) -> None:
+    store = MemoryRateLimitStore(max_keys=10)
+    limiter = RateLimiter(store)
+    tight = Limit(burst=1, per_minute=6)
+    assert await limiter.hit(("ip", tight), ("email", LIMIT)) == 0.0
+    assert await limiter.hit(("ip", tight), ("email", LIMIT)) > 0
+    assert [await store.take("email", LIMIT) for _ in range(2)] == [0.0, 0.0]
+    assert limiter.stats() == {"allowed": 1, "rejected": 1, "buckets": 2}
+
+
+async def test_login_is_throttled_per_email(api: httpx.AsyncClient, clock: Clock) -> None:
+    app.state.container.rate_limiter.enabled = True
+    body = {"email": "someone@example.com", "password": "wrong-password"}
+    statuses = [(await api.post("/api/auth/login", json=body)).status_code for _ in range(EMAIL_LIMIT.burst + 1)]
+    assert statuses == [401] * EMAIL_LIMIT.burst + [429]
+
+    response = await api.post("/api/auth/login", json=body)
+    assert int(response.headers["retry-after"]) >= 1
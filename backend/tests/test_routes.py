@@ -0,0 +1,26 @@
+import httpx
+import pytest
+from fastapi import APIRouter
+from fastapi.routing import APIRoute
+
+from app.routes import admin, auth, client, dashboard, events, project
+
+
+ROUTERS = [admin.router, auth.router, client.router, dashboard.router, events.router, project.router]
+
+
+@pytest.mark.parametrize("router", ROUTERS)
+def test_routes_register_controllers(router: APIRouter) -> None:
+    """Routers register controller functions as they are, so parameters are declared once."""
+    routes = [route for route in router.routes if isinstance(route, APIRoute)]
+    assert routes
+    for route in routes:
+        assert route.endpoint.__module__.startswith("app.controllers."), route.path
+
+
+@pytest.mark.anyio
+async def test_delete_returns_no_content(user: httpx.AsyncClient) -> None:
+    created = await user.post("/api/clients", json={"name": "Ada Lovelace", "email": "ada@example.com"})
+    response = await user.delete(f"/api/clients/{created.json()['id']}")
+    assert response.status_code == 204
+    assert response.content == b""
@@ -0,0 +1,95 @@
+from itertools import count
+from types import SimpleNamespace
+from typing import Any
+
+import httpx
+import pytest
+
+from app.db.slow_queries import SlowQueryRecorder, slow_queries
+
+pytestmark = pytest.mark.anyio
+
+request_ids = count()
+
+
+def run(
+    recorder: SlowQueryRecorder, command: dict[str, Any], millis: float, reply: dict[str, Any] | None = None
+) -> None:
+    """Feed the recorder the started/succeeded events the driver sends for ``command``."""
+    name = next(iter(command))
+    ids = {"request_id": next(request_ids), "connection_id": ("localhost", 27017), "command_name": name}
+    recorder.started(SimpleNamespace(**ids, database_name="app", command=command))
+    recorder.succeeded(SimpleNamespace(**ids, duration_micros=int(millis * 1000), reply=reply or {}))
+
+
+def recorder(size: int = 10) -> SlowQueryRecorder:
+    return SlowQueryRecorder(threshold_ms=100, size=size, explain_interval_seconds=0)
+
+
+def find(collection: str = "clients") -> dict[str, Any]:
+    return {"find": collection, "filter": {"user_id": "u1"}, "lsid": {"id": "session"}}
+
+
+def test_only_commands_over_the_threshold_are_kept() -> None:
+    slow = recorder()
+    run(slow, find("fast"), 99.9)
+    run(slow, find("slow"), 100, {"cursor": {"firstBatch": [{}, {}]}})
+    run(slow, {"ping": 1}, 500)  # not a query
+
+    (entry,) = slow.recent()
+    assert (entry["collection"], entry["command"], entry["duration_ms"], entry["documents"]) == ("slow", "find", 100, 2)
+
+
+def test_failed_commands_are_kept_with_their_error() -> None:
+    slow = recorder()
+    ids = {"request_id": next(request_ids), "connection_id": ("localhost", 27017), "command_name": "find"}
+    slow.started(SimpleNamespace(**ids, database_name="app", command=find()))
+    slow.failed(SimpleNamespace(**ids, duration_micros=250_000, failure={"errmsg": "operation exceeded time limit"}))
+
+    (entry,) = slow.recent()
+    assert entry["error"] == "operation exceeded time limit"
+
+
+def test_literals_are_redacted_from_the_shape() -> None:
+    slow = recorder()
+    command = {
+        "find": "clients",
+        "filter": {"user_id": "u1", "email": {"$in": ["ada@example.com", "bob@example.com"]}, "$or": [{"name": "x"}]},
+        "sort": {"created_at": -1, "_id": -1},
+        "projection": {"name": 1},
+        "limit": 51,
+    }
+    run(slow, command, 150)
+    run(slow, {"aggregate": "projects", "pipeline": [{"$match": {"user_id": "u1"}}, {"$limit": 20}]}, 150)
+
+    found, aggregated = reversed(slow.recent())
+    assert found["shape"] == {
+        "filter": {"user_id": "?", "email": {"$in": ["?"]}, "$or": [{"name": "?"}]},
+        "sort": {"created_at": -1, "_id": -1},
+        "projection": {"name": 1},
+        "limit": 51,
+    }
+    assert aggregated["shape"] == {"pipeline": [{"$match": {"user_id": "?"}}, {"$limit": 20}]}
+    assert "ada@example.com" not in str(slow.recent())
+
+
+def test_the_log_keeps_only_the_newest_entries() -> None:
+    slow = recorder(size=3)
+    for index in range(5):
+        run(slow, find(f"c{index}"), 200)
+
+    assert [entry["collection"] for entry in slow.recent()] == ["c4", "c3", "c2"]
+    assert [entry["collection"] for entry in slow.recent(limit=2)] == ["c4", "c3"]
+
+
+async def test_slow_queries_require_an_admin(user: httpx.AsyncClient) -> None:
+    assert (await user.get("/api/admin/slow-queries")).status_code == 403
+
+
+async def test_slow_queries_for_an_admin(admin: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(slow_queries, "entries", recorder().entries)
+    run(slow_queries, find(), slow_queries.threshold_micros / 1000)
+
+    response = await admin.get("/api/admin/slow-queries?limit=5")
+    assert response.status_code == 200, response.text
+    assert [item["collection"] for item in response.json()["items"]] == ["clients"]
@@ -1,22 +1,34 @@
 const API_BASE = "http://localhost:8000/api";
+const PAGE_SIZE = 50;
+
+// The table never shows notes, so list pages leave them out; editClient loads the full record.
+const LIST_FIELDS = "id,name,email,phone,company,updated_at";
 
 let clients = [];
+// Cursor for the next page of the current list or search; null once everything is shown.
+let nextCursor = null;
 let searchTimeout = null;
+let refetchTimeout = null;
+let eventsConnected = false;
+
+async function fetchPage(search, cursor) {
+  const query = search ? `&search=${encodeURIComponent(search)}` : "";
+  const after = cursor ? `&cursor=${encodeURIComponent(cursor)}` : "";
+  const response = await fetch(`${API_BASE}/clients?fields=${LIST_FIELDS}&limit=${PAGE_SIZE}${query}${after}`, {
+    credentials: "include",
+  });
+  if (!response.ok) {
+    if (response.status === 401) window.location.href = "login.html";
+    throw new Error(`HTTP ${response.status}`);
+  }
+  return response.json();
+}
 
 async function fetchClients(search = null) {
   try {
-    const url = search ? `${API_BASE}/clients?search=${encodeURIComponent(search)}` : `${API_BASE}/clients`;
-    const response = await fetch(url, {
-      credentials: "include",
-    });
-    if (!response.ok) {
-      if (response.status === 401) {
-        window.location.href = "login.html";
-        return;
-      }
-      throw new Error(`HTTP ${response.status}`);
-    }
-    clients = await response.json();
+    const page = await fetchPage(search, null);
+    clients = page.items;
+    nextCursor = page.next_cursor;
     renderClients();
   } catch (error) {
     console.error("Failed to fetch clients:", error);
@@ -25,8 +37,75 @@ async function fetchClients(search = null) {
   }
 }
 
+async function loadMoreClients() {
+  if (!nextCursor) return;
+  const button = document.getElementById("loadMoreClientsBtn");
+  button.disabled = true;
+  try {
+    const page = await fetchPage(currentSearch(), nextCursor);
+    const known = new Set(clients.map((c) => c.id));
+    clients.push(...page.items.filter((c) => !known.has(c.id)));
+    nextCursor = page.next_cursor;
+    renderClients();
+  } catch (error) {
+    console.error("Failed to load more clients:", error);
+    alert("Failed to load more clients. Please try again.");
+  } finally {
+    button.disabled = false;
+  }
+}
+
+function currentSearch() {
+  return document.getElementById("searchInput").value.trim() || null;
+}
+
+function upsertClient(client) {
+  const index = clients.findIndex((c) => c.id === client.id);
+  if (index === -1) clients.unshift(client);
+  else clients[index] = { ...clients[index], ...client };
+  renderClients();
+}
+
+function removeClient(id) {
+  clients = clients.filter((c) => c.id !== id);
+  renderClients();
+}
+
+function scheduleRefetch() {
+  clearTimeout(refetchTimeout);
+  refetchTimeout = setTimeout(() => fetchClients(currentSearch()), 300);
+}
+
+function applyChange(change) {
+  if (change.collection !== "clients") return;
+  // Search results are matched and ranked by the server, so changes while searching refetch instead.
+  if (change.op === "reset" || currentSearch()) {
+    scheduleRefetch();
+  } else if (change.op === "deleted") {
+    removeClient(change.id);
+  } else {
+    upsertClient(change.data);
+  }
+}
+
+function connectEvents() {
+  const events = new EventSource(`${API_BASE}/events`, { withCredentials: true });
+  // "ready" opens every connection; after a reconnect, changes made while disconnected were missed.
+  events.addEventListener("ready", () => {
+    if (eventsConnected) scheduleRefetch();
+    eventsConnected = true;
+  });
+  events.addEventListener("change", (event) => applyChange(JSON.parse(event.data)));
+  events.addEventListener("error", async () => {
+    // The browser retries dropped streams itself; it gives up only when the server refuses one.
+    if (events.readyState !== EventSource.CLOSED) return;
+    if (await checkAuth()) setTimeout(connectEvents, 3000);
+  });
+}
+
 function renderClients() {
   const tbody = document.getElementById("clientsTableBody");
+  document.getElementById("loadMoreClientsBtn").classList.toggle("hidden", !nextCursor);
   if (clients.length === 0) {
     tbody.innerHTML =
       '<tr><td colspan="5" class="px-4 py-8 text-center text-slate-500">No clients found. Click "Add Client" to get started.</td></tr>';
@@ -90,6 +169,8 @@ async function saveClient(e) {
     company: document.getElementById("clientCompany").value.trim() || null,
     notes: document.getElementById("clientNotes").value.trim() || null,
   };
+  const existing = id ? clients.find((c) => c.id === id) : null;
+  if (existing) payload.expected_updated_at = existing.updated_at;
   try {
     const url = id ? `${API_BASE}/clients/${id}` : `${API_BASE}/clients`;
     const method = id ? "PUT" : "POST";
@@ -120,7 +201,9 @@ async function saveClient(e) {
       return;
     }
     closeModal();
-    await fetchClients(document.getElementById("searchInput").value || null);
+    const saved = await response.json();
+    if (currentSearch()) await fetchClients(currentSearch());
+    else upsertClient(saved);
   } catch (error) {
     console.error("Failed to save client:", error);
     alert("Failed to save client. Please try again.");
@@ -128,9 +211,21 @@ async function saveClient(e) {
 }
 
 async function editClient(id) {
-  const client = clients.find((c) => c.id === id);
-  if (client) {
+  try {
+    const response = await fetch(`${API_BASE}/clients/${id}`, { credentials: "include" });
+    if (!response.ok) {
+      if (response.status === 401) {
+        window.location.href = "login.html";
+        return;
+      }
+      throw new Error(`HTTP ${response.status}`);
+    }
+    const client = await response.json();
+    clients = clients.map((c) => (c.id === id ? { ...c, ...client } : c));
     openModal(client);
+  } catch (error) {
+    console.error("Failed to load client:", error);
+    alert("Failed to load client. Please try again.");
   }
 }
 
@@ -148,7 +243,7 @@ async function deleteClient(id) {
       }
       throw new Error(`HTTP ${response.status}`);
     }
-    await fetchClients(document.getElementById("searchInput").value || null);
+    removeClient(id);
   } catch (error) {
     console.error("Failed to delete client:", error);
     alert("Failed to delete client. Please try again.");
@@ -182,6 +277,7 @@ document.addEventListener("DOMContentLoaded", async () => {
   document.getElementById("closeModalBtn").addEventListener("click", closeModal);
   document.getElementById("cancelBtn").addEventListener("click", closeModal);
   document.getElementById("clientForm").addEventListener("submit", saveClient);
+  document.getElementById("loadMoreClientsBtn").addEventListener("click", loadMoreClients);
   document.getElementById("searchInput").addEventListener("input", (e) => {
     clearTimeout(searchTimeout);
     searchTimeout = setTimeout(() => {
@@ -189,5 +285,6 @@ document.addEventListener("DOMContentLoaded", async () => {
     }, 300);
   });
   fetchClients();
+  connectEvents();
 });
 
@@ -1,4 +1,6 @@
 const API_BASE = "http://localhost:8000/api";
+const CLIENT_PICKER_SIZE = 20;
+const BOARD_COLUMN_SIZE = 50;
 const STATUS_ORDER = ["idea", "talks", "in-progress", "review", "completed"];
 const STATUS_LABELS = {
   idea: "Idea",
@@ -8,7 +10,10 @@ const STATUS_LABELS = {
   completed: "Completed",
 };
 let projects = [];
+// Options in the project modal's client picker: the latest /clients search, not the whole collection.
 let clients = [];
+// Per-status totals and next-page cursors from /projects/board.
+let columnState = {};
 let toastEl;
 let filters = {
   search: "",
@@ -16,6 +21,15 @@ let filters = {
   statuses: new Set(STATUS_ORDER),
 };
 let searchDebounce;
+let clientSearchDebounce;
+let pendingMoves = [];
+let moveDebounce;
+let refetchDebounce;
+let statsDebounce;
+let eventsConnected = false;
+// Deleted here or already announced, so the matching event is not mistaken for a card beyond the loaded pages.
+const removedIds = new Set();
+const pendingRefetch = new Set();
 
 async function checkAuth() {
   try {
@@ -48,9 +62,12 @@ function showToast(message, type = "success") {
   setTimeout(() => toastEl.classList.add("hidden"), 2500);
 }
 
-async function fetchClients() {
+async function searchClients(search = "") {
   try {
-    const response = await fetch(`${API_BASE}/clients`, { credentials: "include" });
+    const query = search ? `&search=${encodeURIComponent(search)}` : "";
+    const response = await fetch(`${API_BASE}/clients?fields=id,name&limit=${CLIENT_PICKER_SIZE}${query}`, {
+      credentials: "include",
+    });
     if (!response.ok) {
       if (response.status === 401) {
         window.location.href = "login.html";
@@ -58,44 +75,53 @@ async function fetchClients() {
       }
       throw new Error(`HTTP ${response.status}`);
     }
-    clients = await response.json();
-    populateClientSelects();
+    clients = (await response.json()).items;
+    populateClientPicker();
   } catch (error) {
-    console.error("Failed to fetch clients:", error);
+    console.error("Failed to search clients:", error);
   }
 }
 
-function populateClientSelects() {
+function addOption(select, value, label) {
+  const option = document.createElement("option");
+  option.value = value;
+  option.textContent = label;
+  select.appendChild(option);
+}
+
+function populateClientPicker(selected = null) {
   const projectSelect = document.getElementById("projectClientId");
-  const filterSelect = document.getElementById("boardClientFilter");
-  if (projectSelect) {
-    const current = projectSelect.value;
-    projectSelect.innerHTML = '<option value="">Select a client...</option>';
-    clients.forEach((client) => {
-      const option = document.createElement("option");
-      option.value = client.id;
-      option.textContent = client.name;
-      projectSelect.appendChild(option);
-    });
-    if (current) projectSelect.value = current;
-  }
-  if (filterSelect) {
-    const currentFilter = filters.clientId;
-    filterSelect.innerHTML = '<option value="">All clients</option>';
-    clients.forEach((client) => {
-      const option = document.createElement("option");
-      option.value = client.id;
-      option.textContent = client.name;
-      filterSelect.appendChild(option);
-    });
-    filterSelect.value = currentFilter;
+  const current = selected || projectSelect.value;
+  const currentLabel = selected ? null : projectSelect.selectedOptions[0]?.textContent;
+  projectSelect.innerHTML = '<option value="">Select a client...</option>';
+  clients.forEach((client) => addOption(projectSelect, client.id, client.name));
+  // Keep the chosen client selectable even when the latest search no longer returns it.
+  if (current && !clients.some((c) => c.id === current)) {
+    const project = projects.find((p) => p.client_id === current);
+    addOption(projectSelect, current, (project && project.client_name) || currentLabel || current);
   }
+  projectSelect.value = current || "";
+}
+
+function populateClientFilter() {
+  // Filtering only narrows the loaded cards, so the options are the clients those cards belong to.
+  const filterSelect = document.getElementById("boardClientFilter");
+  const names = new Map();
+  projects.forEach((project) => {
+    if (!names.has(project.client_id)) names.set(project.client_id, getClientName(project) || project.client_id);
+  });
+  if (filters.clientId && !names.has(filters.clientId)) names.set(filters.clientId, filters.clientId);
+  filterSelect.innerHTML = '<option value="">All clients</option>';
+  [...names]
+    .sort((a, b) => a[1].localeCompare(b[1]))
+    .forEach(([id, name]) => addOption(filterSelect, id, name));
+  filterSelect.value = filters.clientId;
 }
 
 async function fetchProjects() {
   setBoardLoading(true);
   try {
-    const response = await fetch(`${API_BASE}/projects`, { credentials: "include" });
+    const response = await fetch(`${API_BASE}/projects/board?limit=${BOARD_COLUMN_SIZE}`, { credentials: "include" });
     if (!response.ok) {
       if (response.status === 401) {
         window.location.href = "login.html";
@@ -103,7 +129,12 @@ async function fetchProjects() {
       }
       throw new Error(`HTTP ${response.status}`);
     }
-    projects = await response.json();
+    const board = await response.json();
+    projects = board.columns.flatMap((column) => column.items);
+    columnState = {};
+    board.columns.forEach((column) => {
+      columnState[column.status] = { count: column.count, nextCursor: column.next_cursor };
+    });
     renderStats();
     renderKanban();
   } catch (error) {
@@ -114,40 +145,146 @@ async function fetchProjects() {
   }
 }
 
+async function loadMoreColumn(status) {
+  const state = columnState[status];
+  if (!state || !state.nextCursor) return;
+  try {
+    const query = `status=${status}&limit=${BOARD_COLUMN_SIZE}&cursor=${encodeURIComponent(state.nextCursor)}`;
+    const response = await fetch(`${API_BASE}/projects/board?${query}`, { credentials: "include" });
+    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+    const [column] = (await response.json()).columns;
+    const known = new Set(projects.map((p) => p.id));
+    projects.push(...column.items.filter((p) => !known.has(p.id)));
+    columnState[status] = { count: column.count, nextCursor: column.next_cursor };
+    renderKanban();
+  } catch (error) {
+    console.error("Failed to load more projects:", error);
+    showToast("Failed to load more projects", "error");
+  }
+}
+
+function adjustCount(status, delta) {
+  if (columnState[status]) columnState[status].count += delta;
+}
+
+function scheduleStats() {
+  clearTimeout(statsDebounce);
+  statsDebounce = setTimeout(renderStats, 500);
+}
+
+function scheduleRefetch(...collections) {
+  collections.forEach((collection) => pendingRefetch.add(collection));
+  clearTimeout(refetchDebounce);
+  refetchDebounce = setTimeout(() => {
+    // Cards embed their client's name, so missed client changes refetch the board too.
+    if (pendingRefetch.has("clients") || pendingRefetch.has("projects")) fetchProjects();
+    if (pendingRefetch.has("clients") && modalOpen()) {
+      searchClients(document.getElementById("projectClientSearch").value.trim());
+    }
+    pendingRefetch.clear();
+  }, 300);
+}
+
+function applyProject(project, op) {
+  const index = projects.findIndex((p) => p.id === project.id);
+  if (index === -1) {
+    // An update to a card beyond the loaded pages: its old column is unknown, so the counts would drift.
+    if (op !== "created") return scheduleRefetch("projects");
+    projects.push(project);
+    adjustCount(project.status, 1);
+  } else {
+    const previous = projects[index];
+    if (previous.status !== project.status) {
+      adjustCount(previous.status, -1);
+      adjustCount(project.status, 1);
+    }
+    projects[index] = { ...previous, ...project };
+  }
+  renderKanban();
+  scheduleStats();
+}
+
+function removeProject(id) {
+  const project = projects.find((p) => p.id === id);
+  if (!project) {
+    if (!removedIds.has(id)) scheduleRefetch("projects");
+    return;
+  }
+  removedIds.add(id);
+  projects = projects.filter((p) => p.id !== id);
+  adjustCount(project.status, -1);
+  renderKanban();
+  scheduleStats();
+}
+
+function applyClient(client, op) {
+  if (op === "deleted") {
+    clients = clients.filter((c) => c.id !== client.id);
+  } else {
+    // New clients show up in the picker through its next search.
+    const index = clients.findIndex((c) => c.id === client.id);
+    if (index !== -1) clients[index] = { ...clients[index], name: client.name };
+    // Board cards carry the client's name and company as they were when the board loaded.
+    projects.forEach((project) => {
+      if (project.client_id !== client.id) return;
+      project.client_name = client.name;
+      project.client_company = client.company;
+    });
+  }
+  populateClientPicker();
+  renderKanban();
+}
+
+function applyChange(change) {
+  if (change.op === "reset") return scheduleRefetch(change.collection);
+  if (change.collection === "clients") return applyClient(change.data || { id: change.id }, change.op);
+  if (change.op === "deleted") return removeProject(change.id);
+  applyProject(change.data, change.op);
+}
+
+function connectEvents() {
+  const events = new EventSource(`${API_BASE}/events`, { withCredentials: true });
+  // "ready" opens every connection; after a reconnect, changes made while disconnected were missed.
+  events.addEventListener("ready", () => {
+    if (eventsConnected) scheduleRefetch("clients", "projects");
+    eventsConnected = true;
+  });
+  events.addEventListener("change", (event) => applyChange(JSON.parse(event.data)));
+  events.addEventListener("error", async () => {
+    // The browser retries dropped streams itself; it gives up only when the server refuses one.
+    if (events.readyState !== EventSource.CLOSED) return;
+    if (await checkAuth()) setTimeout(connectEvents, 3000);
+  });
+}
+
 function applyFilters(list) {
   return list.filter((project) => {
     if (!filters.statuses.has(project.status)) return false;
     if (filters.clientId && project.client_id !== filters.clientId) return false;
     if (filters.search) {
-      const target = `${project.title} ${project.description || ""} ${getClientName(project.client_id)}`.toLowerCase();
+      const target = `${project.title} ${project.description || ""} ${getClientName(project)}`.toLowerCase();
       if (!target.includes(filters.search.toLowerCase())) return false;
     }
     return true;
   });
 }
 
-function renderStats() {
-  const total = projects.length;
-  const active = projects.filter((p) => ["talks", "in-progress", "review"].includes(p.status)).length;
-  const dueSoon = projects.filter((p) => {
-    if (!p.deadline) return false;
-    const deadline = new Date(p.deadline);
-    const now = new Date();
-    const diffDays = (deadline - now) / (1000 * 60 * 60 * 24);
-    return diffDays >= 0 && diffDays <= 7 && p.status !== "completed";
-  }).length;
-  const activeRates = projects.filter((p) => p.hourly_rate && p.status !== "completed");
-  const avgRate = activeRates.length
-    ? activeRates.reduce((sum, p) => sum + (p.hourly_rate || 0), 0) / activeRates.length
-    : 0;
-
-  document.getElementById("statTotalProjects").textContent = total;
-  document.getElementById("statActiveProjects").textContent = active;
-  document.getElementById("statDueSoon").textContent = dueSoon;
-  document.getElementById("statAverageRate").textContent = `$${avgRate.toFixed(0)}`;
+async function renderStats() {
+  try {
+    const response = await fetch(`${API_BASE}/dashboard`, { credentials: "include" });
+    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+    const { totals } = await response.json();
+    document.getElementById("statTotalProjects").textContent = totals.projects;
+    document.getElementById("statActiveProjects").textContent = totals.active;
+    document.getElementById("statDueSoon").textContent = totals.due_soon;
+    document.getElementById("statAverageRate").textContent = `$${totals.average_rate.toFixed(0)}`;
+  } catch (error) {
+    console.error("Failed to load dashboard:", error);
+  }
 }
 
 function renderKanban() {
+  populateClientFilter();
   const filteredProjects = applyFilters(projects);
   const emptyState = document.getElementById("boardEmptyState");
   emptyState.classList.toggle("hidden", filteredProjects.length > 0);
@@ -155,20 +292,34 @@ function renderKanban() {
   STATUS_ORDER.forEach((status) => {
     const column = document.getElementById(`column-${status}`);
     const countEl = document.querySelector(`[data-column-count="${status}"]`);
-    const statusProjects = filteredProjects.filter((p) => p.status === status);
-    if (countEl) countEl.textContent = statusProjects.length;
+    const statusProjects = filteredProjects.filter((p) => p.status === status).sort(byPosition);
+    const state = columnState[status];
+    const unfiltered = !filters.search && !filters.clientId;
+    if (countEl) countEl.textContent = unfiltered && state ? state.count : statusProjects.length;
+    const loadMore =
+      state && state.nextCursor
+        ? `<button onclick="loadMoreColumn('${status}')" class="w-full mt-2 text-xs text-brand-accent hover:underline">Load more</button>`
+        : "";
     if (statusProjects.length === 0) {
-      column.innerHTML = '<p class="text-sm text-slate-400 text-center py-4">No projects</p>';
+      column.innerHTML = '<p class="text-sm text-slate-400 text-center py-4">No projects</p>' + loadMore;
       return;
     }
-    column.innerHTML = statusProjects
-      .map((project) => renderCard(project))
-      .join("");
+    column.innerHTML =
+      statusProjects
+        .map((project) => renderCard(project))
+        .join("") + loadMore;
   });
 }
 
+function byPosition(a, b) {
+  if (a.position === b.position) return (b.created_at || "").localeCompare(a.created_at || "");
+  if (a.position == null) return 1;
+  if (b.position == null) return -1;
+  return a.position < b.position ? -1 : 1;
+}
+
 function renderCard(project) {
-  const clientName = getClientName(project.client_id);
+  const clientName = getClientName(project);
   const deadline = project.deadline ? new Date(project.deadline) : null;
   const deadlineLabel = deadline ? deadline.toLocaleDateString() : null;
   const rate = project.hourly_rate ? `$${project.hourly_rate}/hr` : "—";
@@ -209,8 +360,9 @@ function renderCard(project) {
   `;
 }
 
-function getClientName(clientId) {
-  const client = clients.find((c) => c.id === clientId);
+function getClientName(project) {
+  if (project.client_name) return project.client_name;
+  const client = clients.find((c) => c.id === project.client_id);
   return client ? client.name : "";
 }
 
@@ -228,7 +380,8 @@ function openModal(project = null) {
   modal.classList.remove("hidden");
   form.reset();
   document.getElementById("projectId").value = "";
-  populateClientSelects();
+  populateClientPicker(project ? project.client_id : null);
+  searchClients();
   if (project) {
     title.textContent = "Edit Project";
     document.getElementById("projectId").value = project.id;
@@ -249,6 +402,10 @@ function openModal(project = null) {
   }
 }
 
+function modalOpen() {
+  return !document.getElementById("projectModal").classList.contains("hidden");
+}
+
 function closeModal() {
   document.getElementById("projectModal").classList.add("hidden");
 }
@@ -267,6 +424,8 @@ async function saveProject(e) {
       : null,
     deadline: deadlineInput ? new Date(deadlineInput).toISOString() : null,
   };
+  const existing = id ? projects.find((p) => p.id === id) : null;
+  if (existing) payload.expected_updated_at = existing.updated_at;
 
   try {
     const url = id ? `${API_BASE}/projects/${id}` : `${API_BASE}/projects`;
@@ -287,7 +446,7 @@ async function saveProject(e) {
     }
     closeModal();
     showToast(id ? "Project updated" : "Project created");
-    await fetchProjects();
+    applyProject(await response.json(), id ? "updated" : "created");
   } catch (error) {
     console.error("Failed to save project:", error);
     showToast(error.message || "Failed to save project", "error");
@@ -299,26 +458,62 @@ async function editProject(id) {
   if (project) openModal(project);
 }
 
-async function updateStatus(projectId, newStatus) {
+function updateStatus(projectId, newStatus) {
+  const project = projects.find((p) => p.id === projectId);
+  if (!project) return;
+  const top = projects.filter((p) => p.status === newStatus && p.id !== projectId).sort(byPosition)[0];
+  pendingMoves.push({
+    id: projectId,
+    status: newStatus,
+    before_id: null,
+    after_id: top ? top.id : null,
+    expected_updated_at: project.updated_at,
+  });
+  // Optimistically show the card at the top of its new column until the batch is saved.
+  if (columnState[project.status]) columnState[project.status].count -= 1;
+  if (columnState[newStatus]) columnState[newStatus].count += 1;
+  project.status = newStatus;
+  project.position = "";
+  renderKanban();
+  clearTimeout(moveDebounce);
+  moveDebounce = setTimeout(flushMoves, 150);
+}
+
+async function flushMoves() {
+  const moves = pendingMoves;
+  pendingMoves = [];
+  if (moves.length === 0) return;
   try {
-    const response = await fetch(`${API_BASE}/projects/${projectId}/status`, {
+    const response = await fetch(`${API_BASE}/projects/board`, {
       method: "PATCH",
       headers: { "Content-Type": "application/json" },
       credentials: "include",
-      body: JSON.stringify({ status: newStatus }),
+      body: JSON.stringify({ moves }),
     });
     if (!response.ok) {
       if (response.status === 401) {
         window.location.href = "login.html";
         return;
       }
+      if (response.status === 409) {
+        showToast("A project changed elsewhere; the board has been refreshed", "error");
+        await fetchProjects();
+        return;
+      }
       throw new Error(`HTTP ${response.status}`);
     }
-    showToast(`Moved to ${STATUS_LABELS[newStatus]}`);
-    await fetchProjects();
+    const updated = await response.json();
+    updated.forEach((saved) => {
+      const index = projects.findIndex((p) => p.id === saved.id);
+      if (index !== -1) projects[index] = { ...projects[index], ...saved };
+    });
+    renderKanban();
+    renderStats();
+    showToast(moves.length === 1 ? `Moved to ${STATUS_LABELS[moves[0].status]}` : `Moved ${updated.length} projects`);
   } catch (error) {
     console.error("Failed to update status:", error);
     showToast("Failed to update project status", "error");
+    await fetchProjects();
   }
 }
 
@@ -337,7 +532,7 @@ async function deleteProject(id) {
       throw new Error(`HTTP ${response.status}`);
     }
     showToast("Project deleted");
-    await fetchProjects();
+    removeProject(id);
   } catch (error) {
     console.error("Failed to delete project:", error);
     showToast("Failed to delete project", "error");
@@ -401,6 +596,10 @@ function bindModalControls() {
   document.getElementById("closeModalBtn").addEventListener("click", closeModal);
   document.getElementById("cancelBtn").addEventListener("click", closeModal);
   document.getElementById("projectForm").addEventListener("submit", saveProject);
+  document.getElementById("projectClientSearch").addEventListener("input", (event) => {
+    clearTimeout(clientSearchDebounce);
+    clientSearchDebounce = setTimeout(() => searchClients(event.target.value.trim()), 250);
+  });
 }
 
 function bindActions() {
@@ -412,9 +611,10 @@ document.addEventListener("DOMContentLoaded", async () => {
   const authed = await checkAuth();
   if (!authed) return;
 
-  await fetchClients();
   attachFilters();
   bindModalControls();
   bindActions();
+  // The board embeds client names; the client picker searches the API when the project modal opens.
   fetchProjects();
+  connectEvents();
 });